@@ -1,16 +1,29 @@
 import streamlit as st
 import datetime
-import json
 import requests
 from dotenv import load_dotenv
 import os
 from sentiment import Sentiment
+from community_store import CommunityIndex, get_community_store
+from risk import LIQUIDITY_MAP, RiskPipeline, attach_risk, classify_strategy_type
+from volatility import VolatilityEngine
+from price_store import get_price_store
+from monte_carlo import annual_volatility, simulate_strategy
+from liquidity_pool import DEFAULT_FEE_APR, strategy_impermanent_loss, strategy_price_range
+from indicators import get_indicator_store
+from fng_history import get_fng_history
+from liquidity import get_liquidity_index
+from santiment_cache import get_santiment_cache
 
 # Load environment variables from .env
 load_dotenv()
 
 # Constants
 COMMUNITY_FILE = "community/community_strategies.json"
+COMMUNITY_PAGE_SIZE = 5
+REQUEST_TIMEOUT = 10  # Seconds before a price request is given up
+LLM_TIMEOUT = 120  # Completions take much longer than data requests
+STALE_NOTICE = "The source is currently unavailable; showing its last known value."
 CRYPTO_MAP = {
     "BTC": "bitcoin",
     "Ethereum": "ethereum",
@@ -88,6 +101,36 @@ CRYPTO_MAP = {
 def get_sentiment_agent():
     return Sentiment()
 
+# Volatility of every supported asset, computed in one vectorized pass and cached for an hour.
+# Price histories come from the local price store, which only fetches the days it is missing.
+@st.cache_data(ttl=3600)
+def get_volatility_ranking(coin_ids):
+    return VolatilityEngine(get_price_store().fetch_history).ranking(list(coin_ids))
+
+# Precomputed risk scores shared by all sessions
+@st.cache_resource
+def get_risk_pipeline():
+    pipeline = RiskPipeline()
+    pipeline.refresh_in_background(list(LIQUIDITY_MAP))  # Score the listed assets before their first analysis
+    return pipeline
+
+# Simulated outcomes of a strategy type on an asset, recomputed at most once an hour
+@st.cache_data(ttl=3600)
+def get_strategy_outcomes(crypto, strategy_type):
+    return simulate_strategy(annual_volatility(crypto), strategy_type, workers=1)
+
+# Fear & Greed trend from the local history, which only fetches the days it is missing
+@st.cache_data(ttl=3600)
+def get_fear_and_greed_trend():
+    history = get_fng_history()
+    history.refresh()
+    _, averages = history.moving_average(30)
+    average = float(averages[-1]) if len(averages) else float("nan")
+    return {
+        "average_30d": None if average != average else average,
+        "percentile_1y": history.percentile(lookback_days=365),
+    }
+
 # Initialize and run the app
 @st.cache_resource
 def get_crypto_app():
@@ -100,39 +143,31 @@ class CryptoDeFiYieldFarmingAgent:
         Include a link to a website or a YouTube video explaining the strategy. 
         Do not include deep dives if it's irrelevant, not helpful, or missing content.
         """
-        self.community_strategies = self._load_community_strategies()
+        self.community_store = get_community_store(COMMUNITY_FILE)
         self.deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
         self.deepseek_api_url = os.getenv("DEEPSEEK_API_URL")
         self.coinmarketcap_api_key = os.getenv("COINMARKETCAP_API_KEY")
         self.sentiment_agent = get_sentiment_agent()
+        self.risk_pipeline = get_risk_pipeline()
+        get_liquidity_index()  # Starts fetching the liquidity scores in the background before the first analysis
 
-    def _load_community_strategies(self):
-        """Load community strategies from a JSON file."""
+    @property
+    def community_strategies(self):
+        """Community strategies from the shared in-memory snapshot (reloaded only when the file changes)."""
         try:
-            os.makedirs("community", exist_ok=True)
-            if not os.path.exists(COMMUNITY_FILE):
-                with open(COMMUNITY_FILE, "w") as file:
-                    json.dump([], file)
-                return []
-
-            with open(COMMUNITY_FILE, "r") as file:
-                data = json.load(file)
-                if isinstance(data, list):
-                    return data
-                else:
-                    st.error("Invalid data format in community strategies file. Expected a list.")
-                    return []
+            return self.community_store.strategies
         except Exception as e:
             st.error(f"Error loading community strategies: {e}")
             return []
 
-    def _save_community_strategies(self):
-        """Save community strategies to a JSON file."""
+    @property
+    def community_index(self):
+        """Per-(crypto, market condition) index over the community strategies."""
         try:
-            with open(COMMUNITY_FILE, "w") as file:
-                json.dump(self.community_strategies, file, indent=4)
+            return self.community_store.index
         except Exception as e:
-            st.error(f"Error saving community strategies: {e}")
+            st.error(f"Error loading community strategies: {e}")
+            return CommunityIndex()
 
     def call_deepseek_api(self, prompt):
         """Call the DeepSeek API to generate insights or analyze data."""
@@ -151,7 +186,8 @@ class CryptoDeFiYieldFarmingAgent:
         response = requests.post(
             f"{self.deepseek_api_url}/chat/completions",
             headers=headers,
-            json=data
+            json=data,
+            timeout=LLM_TIMEOUT
         )
         if response.status_code == 200:
             return response.json()["choices"][0]["message"]["content"].strip()
@@ -169,36 +205,32 @@ class CryptoDeFiYieldFarmingAgent:
             st.error("Invalid characters detected in the strategy. Please avoid using special characters.")
             return
 
-        for existing_strategy in self.community_strategies:
-            if (
-                existing_strategy["crypto"].lower() == crypto.lower()
-                and existing_strategy["strategy"].lower() == strategy.lower()
-                and existing_strategy["market_condition"].lower() == market_condition.lower()
-            ):
-                st.error("This strategy already exists in the community. Please provide a unique strategy.")
-                return
-
-        self.community_strategies.append({
+        new_strategy = {
             "crypto": crypto,
             "strategy": strategy,
             "market_condition": market_condition,
             "date_added": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
-
-        self._save_community_strategies()
+        }
+        try:
+            # The duplicate check loads the community file, which may be corrupt or mid-edit
+            if self.community_store.is_duplicate(crypto, strategy, market_condition):
+                st.error("This strategy already exists in the community. Please provide a unique strategy.")
+                return
+            # Score the strategy once here so listings and rankings never recompute it
+            self.community_store.add(attach_risk(new_strategy))
+        except Exception as e:
+            st.error(f"Error saving community strategies: {e}")
+            return
         st.success("Your strategy has been shared with the community!")
 
     def get_crypto_price_coingecko(self, crypto: str) -> float:
         """Fetch the current price of a cryptocurrency using CoinGecko API."""
         try:
             crypto_slug = CRYPTO_MAP.get(crypto.lower(), crypto.lower())
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_slug}&vs_currencies=usd"
-            response = requests.get(url)
-            response.raise_for_status()
-
-            price_data = response.json()
-            if crypto_slug in price_data and "usd" in price_data[crypto_slug]:
-                return price_data[crypto_slug]["usd"]
+            # Shared with the CLI agent: snapshot, HTTP cache and circuit breaker
+            price = self.sentiment_agent.market_data.price(crypto_slug)
+            if price is not None:
+                return price
             else:
                 st.error(f"Price data not found for {crypto} (slug: {crypto_slug})")
                 return None
@@ -327,19 +359,6 @@ class CryptoDeFiYieldFarmingAgent:
 
     def view_community_strategies(self, crypto, market_condition):
         """Display community strategies and handle the 'Share Your Strategy' form."""
-        # Ensure the community file exists
-        if not os.path.exists(COMMUNITY_FILE):
-            with open(COMMUNITY_FILE, "w") as file:
-                json.dump([], file)
-
-        # Load existing strategies from the community file
-        try:
-            with open(COMMUNITY_FILE, "r") as file:
-                self.community_strategies = json.load(file)
-        except json.JSONDecodeError:
-            st.error(f"Error: The {COMMUNITY_FILE} file is corrupted. Starting with an empty list.")
-            self.community_strategies = []
-
         # Initialize session state for selected strategy index and analysis result
         if "selected_strategy_index" not in st.session_state:
             st.session_state.selected_strategy_index = None
@@ -350,40 +369,50 @@ class CryptoDeFiYieldFarmingAgent:
         #if "debug_logs" not in st.session_state:
             #st.session_state.debug_logs = []
 
-        # Cache the filtered strategies to avoid recomputation on every reload
-        @st.cache_data
-        def get_filtered_strategies(community_strategies, crypto, market_condition):
-            return [
-                strategy for strategy in community_strategies
-                if strategy["crypto"].lower() == crypto.lower() and strategy["market_condition"] == market_condition
-            ]
-
-        # Display top 5 strategies
-        st.subheader(f"Top 5 {market_condition} Strategies for {crypto} from the community")
-        if not self.community_strategies:
+        # Pages already shown for this crypto and market condition ("Load more" keeps appending)
+        # The pages are rebuilt when the shared store changed (e.g. another session shared a strategy)
+        page_state_key = f"community_page_{crypto.lower()}_{market_condition.lower()}"
+        community_index = self.community_index
+        generation = self.community_store.generation
+        page_state = st.session_state.get(page_state_key)
+        if page_state is None or page_state["generation"] != generation:
+            page, cursor = community_index.top_k(crypto, market_condition, k=COMMUNITY_PAGE_SIZE)
+            page_state = {"strategies": page, "cursor": cursor, "generation": generation}
+            st.session_state[page_state_key] = page_state
+
+        # Display the newest strategies
+        st.subheader(f"Top {len(page_state['strategies'])} {market_condition} Strategies for {crypto} from the community")
+        if not len(community_index):
             st.warning("No strategies have been shared yet.")
         else:
-            # Filter strategies for the current crypto and market condition
-            filtered_strategies = get_filtered_strategies(self.community_strategies, crypto, market_condition)
+            shown_strategies = page_state["strategies"]
 
-            if not filtered_strategies:
+            if not shown_strategies:
                 st.warning(f"No {market_condition} strategies found for {crypto}.")
             else:
-                # Sort strategies by date (newest first) and take the top 5
-                filtered_strategies.sort(key=lambda x: x["date_added"], reverse=True)
-                top_5_strategies = filtered_strategies[:5]
-
                 # Display strategies
-                for i, strategy in enumerate(top_5_strategies, 1):
+                for i, strategy in enumerate(shown_strategies, 1):
                     st.write(f"### Strategy #{i}")
                     st.write(f"**Date Added:** {strategy['date_added']}")
+                    if strategy.get("risk"):
+                        st.write(f"**Risk Score:** {strategy['risk']['overall']}/10")
                     st.write(f"**Strategy:**\n{strategy['strategy']}")
+                    self._display_impermanent_loss(strategy["strategy"])
                     st.write("---")  # Add a separator between strategies
 
+                # Fetch the next (older) page from the index using the stored cursor
+                if page_state["cursor"] and st.button("Load more", key=f"{page_state_key}_load_more"):
+                    page, cursor = community_index.top_k(
+                        crypto, market_condition, k=COMMUNITY_PAGE_SIZE, cursor=page_state["cursor"]
+                    )
+                    page_state["strategies"] = shown_strategies + page
+                    page_state["cursor"] = cursor
+                    st.rerun()
+
                 # Create a form for strategy selection
                 with st.form("strategy_selection_form"):
                     # Display strategies with a selection option
-                    strategy_options = [f"Strategy #{i}" for i in range(1, len(top_5_strategies) + 1)]
+                    strategy_options = [f"Strategy #{i}" for i in range(1, len(shown_strategies) + 1)]
                     selected_strategy = st.selectbox(
                         "Select a community strategy to analyze:",
                         strategy_options,
@@ -402,7 +431,7 @@ class CryptoDeFiYieldFarmingAgent:
                             st.session_state.debug_logs.append(f"Valid strategy selected: {selected_strategy}")  # Debug message 2
 
                             selected_index = int(selected_strategy.split("#")[1]) - 1
-                            selected_strategy_data = top_5_strategies[selected_index]
+                            selected_strategy_data = shown_strategies[selected_index]
 
                             # Store the selected strategy in session state
                             st.session_state.selected_strategy = selected_strategy_data
@@ -444,13 +473,12 @@ class CryptoDeFiYieldFarmingAgent:
                         "strategy": strategy,
                         "date_added": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     }
-                    self.community_strategies.append(new_strategy)
-
                     # Save the updated strategies to the community file
                     try:
-                        with open(COMMUNITY_FILE, "w") as file:
-                            json.dump(self.community_strategies, file, indent=4)
-                        st.success("Your strategy has been shared successfully!")
+                        if self.community_store.add(attach_risk(new_strategy)):
+                            st.success("Your strategy has been shared successfully!")
+                        else:
+                            st.error("This strategy already exists in the community. Please provide a unique strategy.")
                     except Exception as e:
                         st.error(f"Failed to save strategy: {e}")
 
@@ -474,7 +502,7 @@ class CryptoDeFiYieldFarmingAgent:
                 "symbol": crypto_symbol.upper(),
                 "convert": "USD"
             }
-            response = requests.get(url, headers=headers, params=params)
+            response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             price = data["data"][crypto_symbol.upper()]["quote"]["USD"]["price"]
@@ -514,6 +542,9 @@ class CryptoDeFiYieldFarmingAgent:
         if st.sidebar.button("Analyze"):
             self._analyze_crypto(crypto)
 
+        if st.sidebar.button("Volatility Ranking"):
+            self._display_volatility_ranking()
+
         # Add the link at the bottom of the menu panel
         st.sidebar.markdown("---")  # Add a separator
         st.sidebar.markdown("[Agent YieldDeFi now available on Virtuals Protocol!](https://app.virtuals.io/prototypes/0x76D73d17Bd821203EF6Df82FD156D08E675026C7)")
@@ -590,13 +621,24 @@ class CryptoDeFiYieldFarmingAgent:
         st.write("**My Recommendation for what to do with your " + crypto + " in a " + market_condition + " market:**")
         st.markdown(recommendation.replace("\n", "  \n"))
 
-        # Display risk score with red line and indicator
-        risk_score = 5  # Example risk score (you can calculate this dynamically)
+        # Display the precomputed risk score for this crypto and the type of strategy recommended
+        strategy_type = classify_strategy_type(recommendation)
+        risk = self.risk_pipeline.lookup(crypto, strategy_type)
+        risk_score = risk["overall"] if risk else 5  # Medium risk if no score could be computed
         self._display_risk_score(risk_score)
+        self._display_strategy_outcomes(crypto, strategy_type)
+        self._display_impermanent_loss(recommendation)
 
         # Analyze risk factors and display community strategies
         with st.spinner("**Analyzing the risk factors contributing to this score...**"):
             with st.expander("**Here's a breakdown of the factors contributing to this score:**"):
+                if risk:
+                    st.write(f"Volatility: {risk['factors']['volatility']:.2f} (annualized, capped at 1.0)")
+                    st.write(f"Liquidity: {risk['factors']['liquidity']:.2f} (lower liquidity increases risk)")
+                    st.write(f"Smart Contract Risk: {risk['factors']['smart_contract']:.2f}")
+                    if risk["inputs_as_of"]:
+                        st.write(f"Inputs as of: {risk['inputs_as_of']} UTC")
+                self._display_streaming_indicators(crypto)
                 risk_explanation = self.explain_risk_score(crypto, risk_score)
                 st.write(risk_explanation)
             #self.view_community_strategies(crypto, market_condition)
@@ -620,6 +662,9 @@ class CryptoDeFiYieldFarmingAgent:
         if santiment is not None:
             st.write("Source: https://santiment.net/")
             st.write(f"Daily Active Addresses: {santiment} for {crypto}")
+            average = get_santiment_cache().aggregate(crypto, "daily_active_addresses", 30)
+            if average is not None:
+                st.write(f"30-Day Average: {average:,.0f}")
         else:
             st.warning(f"No data found for {crypto} on Santiment.")
             santiment = self.sentiment_agent.get_santiment_data(crypto_slug="ethereum", metric="daily_active_addresses")
@@ -635,6 +680,8 @@ class CryptoDeFiYieldFarmingAgent:
         if altcoin_season_index:
             st.write(f"Altcoin Season Index: {altcoin_season_index['value']}")
             st.write(f"Season: {altcoin_season_index['season']}")
+            if altcoin_season_index.get("stale"):
+                st.caption(STALE_NOTICE)
             with st.expander("**Explanation and why it matters?**"):
                 explanation = self.explain_altcoin_season_index(altcoin_season_index)
                 st.write(explanation)
@@ -652,6 +699,8 @@ class CryptoDeFiYieldFarmingAgent:
             st.write(f"VIX Percent Change: {vix['change_percent']}")
             st.write(f"Analysis: {vix['analysis']}")
             st.write(f"Source: {vix['source']}")
+            if vix.get("stale"):
+                st.caption(STALE_NOTICE)
         else:
             st.warning("Failed to fetch TradFi Sentiment data.")
 
@@ -664,6 +713,15 @@ class CryptoDeFiYieldFarmingAgent:
             st.write(f"Value: {fear_and_greed_index['value']}")
             st.write(f"Classification: {fear_and_greed_index['classification']}")
             st.write(f"Date Fetched: {fear_and_greed_index['date_fetched']}")
+            if fear_and_greed_index.get("stale"):
+                st.caption(STALE_NOTICE)
+            try:
+                trend = get_fear_and_greed_trend()
+                if trend["average_30d"] is not None and trend["percentile_1y"] is not None:
+                    st.write(f"30-Day Average: {trend['average_30d']:.1f}")
+                    st.write(f"1-Year Percentile: {trend['percentile_1y']:.0f}")
+            except Exception as e:
+                st.warning(f"Failed to load Fear & Greed history: {e}")
         else:
             st.warning("Failed to fetch Fear & Greed Index data.")
 
@@ -673,9 +731,34 @@ class CryptoDeFiYieldFarmingAgent:
         reddit_sentiment = self.sentiment_agent.get_reddit_sentiment(subreddit="cryptocurrency", limit=5)
         if reddit_sentiment:
             st.write(f"Average Sentiment: {reddit_sentiment['average_sentiment']} (A positive number is bullish and negative is bearish)")
+            if reddit_sentiment.get("stale"):
+                st.caption(STALE_NOTICE)
         else:
             st.warning("Failed to fetch Reddit sentiment.")
 
+    def _display_volatility_ranking(self):
+        """Display realized, EWMA volatility and max drawdown for every supported cryptocurrency."""
+        st.subheader("Volatility Ranking")
+        with st.spinner("**Computing volatility for all supported cryptocurrencies...**"):
+            rows = get_volatility_ranking(tuple(dict.fromkeys(CRYPTO_MAP.values())))
+        if not rows:
+            st.warning("Failed to fetch price histories.")
+            return
+        st.dataframe(
+            [
+                {
+                    "Asset": row["asset"],
+                    "7d Volatility (ann.)": row["realized_7d"],
+                    "30d Volatility (ann.)": row["realized_30d"],
+                    "EWMA Volatility (ann.)": row["ewma"],
+                    "Max Drawdown (90d)": row["max_drawdown"],
+                }
+                for row in rows
+            ],
+            use_container_width=True,
+        )
+        st.caption("Annualized volatility of daily log returns over the last 90 days. Source: CoinGecko")
+
     def _display_risk_score(self, risk_score):
         """Display the risk score with a visual indicator."""
         st.write(f"**Risk Score:** {risk_score}/10")
@@ -705,6 +788,56 @@ class CryptoDeFiYieldFarmingAgent:
             unsafe_allow_html=True
         )
 
+    def _display_streaming_indicators(self, crypto):
+        """Display the incrementally updated volatility, z-score and momentum of a cryptocurrency."""
+        try:
+            indicators = get_indicator_store().get(crypto)
+        except Exception as e:
+            print(f"Error reading streaming indicators for {crypto}: {e}")
+            return
+        if not indicators:
+            return
+        if indicators["ewma_volatility"] is not None:
+            st.write(f"EWMA Volatility: {indicators['ewma_volatility']:.1%} (annualized)")
+        if indicators["zscore"] is not None:
+            st.write(f"Latest Daily Move: {indicators['zscore']:+.2f} standard deviations from the 30-day mean")
+        if indicators["momentum"] is not None:
+            st.write(f"30-Day Momentum: {indicators['momentum']:+.1%}")
+
+    def _display_strategy_outcomes(self, crypto, strategy_type):
+        """Display the simulated one-year outcome distribution of the recommended strategy type."""
+        try:
+            with st.spinner("**Simulating one-year outcomes...**"):
+                outcomes = get_strategy_outcomes(crypto, strategy_type)
+        except Exception as e:
+            st.warning(f"Could not simulate strategy outcomes: {e}")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Expected Return (1y)", f"{outcomes['expected_return']:+.1%}")
+        col2.metric("95% Value at Risk", f"{outcomes['var']:.1%}")
+        col3.metric("Liquidation Probability", f"{outcomes['liquidation_probability']:.1%}")
+        st.caption(
+            f"{outcomes['paths']:,} simulated price paths at {outcomes['volatility']:.0%} annualized volatility for a "
+            f"typical {strategy_type} strategy. Expected yield over holding: {outcomes['expected_yield']:+.1%}."
+        )
+
+    def _display_impermanent_loss(self, strategy):
+        """Display impermanent loss and net return versus holding if a strategy provides liquidity."""
+        rows = strategy_impermanent_loss(strategy)
+        if not rows:
+            return
+        price_range = strategy_price_range(strategy)
+        if price_range is None:
+            range_description = "at full range"
+        else:
+            range_description = f"in a concentrated range of {price_range[0] - 1:+.0%} to {price_range[1] - 1:+.0%} around the entry price"
+        with st.expander("**Impermanent loss estimate for the liquidity pool part of this strategy**"):
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            st.caption(
+                f"Versus holding the deposited tokens, for a pool against a stablecoin with a {DEFAULT_FEE_APR:.0%} "
+                f"full-range fee APR, {range_description}."
+            )
+
     def explain_altcoin_season_index(self, altcoin_season_data):
         """
         Generate an explanation of the Altcoin Season Index using DeepSeek API.
@@ -0,0 +1,225 @@
+import argparse
+import csv
+import datetime
+import json
+import time
+
+import numpy as np
+
+from market_condition import (
+    INDICATORS,
+    MARKET_CONDITION_THRESHOLDS,
+    REGIMES,
+    classify_scores,
+    normalize_indicators,
+    weight_vector,
+    weighted_scores,
+)
+from price_store import get_price_store
+from volatility import MS_PER_DAY
+
+DEFAULT_HORIZONS = (1, 7, 30)  # Forward return horizons in days
+
+
+def load_indicator_csv(path):
+    """
+    Read historical indicator values from a CSV file.
+
+    The file has a "date" column (YYYY-MM-DD) and one column per indicator
+    (santiment, fear_and_greed, tradfi, reddit). Blank cells are missing values.
+
+    Returns:
+        dict: Indicator name -> list of [timestamp_ms, value] pairs.
+    """
+    series = {name: [] for name in INDICATORS}
+    with open(path, "r", newline="") as file:
+        for row in csv.DictReader(file):
+            date = datetime.datetime.strptime(row["date"], "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+            timestamp = int(date.timestamp() * 1000)
+            for name in INDICATORS:
+                value = (row.get(name) or "").strip()
+                if value:
+                    series[name].append([timestamp, float(value)])
+    return series
+
+
+def align_indicators(series, days):
+    """
+    As-of join of indicator series onto a daily grid.
+
+    Each day gets the latest value observed on or before it, so indicators published on a
+    different calendar (e.g. the VIX, which has no weekend closes) carry forward.
+
+    Args:
+        series (dict): Indicator name -> [timestamp_ms, value] pairs. Missing indicators are all NaN.
+        days (np.ndarray): Day numbers since the epoch, ascending.
+
+    Returns:
+        np.ndarray: Raw values of shape (days, 4), columns in INDICATORS order; NaN before the first value.
+    """
+    values = np.full((len(days), len(INDICATORS)), np.nan)
+    for column, name in enumerate(INDICATORS):
+        points = np.asarray(series.get(name) or [], dtype=float).reshape(-1, 2)
+        if not len(points):
+            continue
+        points = points[np.argsort(points[:, 0], kind="stable")]
+        point_days = (points[:, 0] // MS_PER_DAY).astype(np.int64)
+        index = np.searchsorted(point_days, days, side="right") - 1
+        known = index >= 0
+        values[known, column] = points[index[known], 1]
+    return values
+
+
+def forward_returns(prices, horizon):
+    """Log return from each day to `horizon` days later (NaN where the future price is unknown)."""
+    prices = np.asarray(prices, dtype=float)
+    returns = np.full(len(prices), np.nan)
+    if horizon < len(prices):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns[:-horizon] = np.log(prices[horizon:] / prices[:-horizon])
+    return returns
+
+
+class Backtest:
+    """
+    Replays historical indicator values through the market-condition scoring.
+
+    The indicators are normalized once when the backtest is built; each evaluation is a single
+    matrix product over the whole history, so many weight and threshold sets can be compared
+    cheaply (see evaluate_many).
+    """
+
+    def __init__(self, days, prices, indicators, horizons=DEFAULT_HORIZONS):
+        """
+        Args:
+            days (np.ndarray): Day numbers since the epoch, one per row.
+            prices (np.ndarray): Daily closes of the asset the signals are tested against.
+            indicators (np.ndarray): Raw indicator values of shape (days, 4), see align_indicators.
+            horizons (tuple): Forward return horizons in days.
+        """
+        self.days = np.asarray(days, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=float)
+        indicators = np.asarray(indicators, dtype=float)
+        self.features = normalize_indicators(*indicators.T)
+        self.horizons = tuple(horizons)
+        self.returns = {horizon: forward_returns(self.prices, horizon) for horizon in self.horizons}
+
+    @classmethod
+    def from_price_store(cls, coin_id, series, horizons=DEFAULT_HORIZONS, store=None):
+        """Build a backtest against the stored daily closes of an asset."""
+        store = store or get_price_store()
+        records = store.history(coin_id)
+        if not len(records):
+            raise ValueError(f"No stored price history for {coin_id}.")
+        days = (records["t"] // MS_PER_DAY).astype(np.int64)
+        return cls(days, records["p"], align_indicators(series, days), horizons)
+
+    def scores(self, weights=None):
+        """Overall market-condition score of every day."""
+        return weighted_scores(self.features, weight_vector(weights))
+
+    def signals(self, weights=None, thresholds=None):
+        """Regime code of every day: 1 bullish, 0 neutral, -1 bearish."""
+        return classify_scores(self.scores(weights), thresholds)
+
+    def evaluate_many(self, weight_matrix, threshold_matrix, horizon):
+        """
+        Evaluate many scoring configurations at once.
+
+        Args:
+            weight_matrix (np.ndarray): Shape (configs, 4), weights in INDICATORS order.
+            threshold_matrix (np.ndarray): Shape (configs, 2), (bullish, bearish) thresholds.
+            horizon (int): Forward return horizon in days.
+
+        Returns:
+            dict: Arrays of shape (configs,):
+                - "hit_rate": share of bullish/bearish calls whose forward return had the same sign
+                - "signal_return": mean forward return of going long on bullish and short on bearish days
+                - "coverage": share of days with a bullish or bearish call
+        """
+        returns = self.returns[horizon]
+        valid = ~np.isnan(returns)
+        returns = returns[valid]
+        scores = weighted_scores(self.features[valid], weight_matrix)
+        thresholds = np.asarray(threshold_matrix, dtype=float)
+        codes = (scores > thresholds[:, 0]).astype(np.int8) - (scores < thresholds[:, 1]).astype(np.int8)
+
+        signed = codes * returns[:, None]
+        calls = np.count_nonzero(codes, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hit_rate = np.count_nonzero(signed > 0, axis=0) / calls
+        return {
+            "hit_rate": hit_rate,
+            "signal_return": signed.mean(axis=0) if len(returns) else np.full(len(thresholds), np.nan),
+            "coverage": calls / len(returns) if len(returns) else np.zeros(len(thresholds)),
+        }
+
+    def evaluate(self, weights=None, thresholds=None):
+        """
+        Report hit rate and forward returns per regime for one scoring configuration.
+
+        Returns:
+            dict: {"days", "regime_days", "horizons": {horizon: {"hit_rate", "signal_return", regime: {...}}}}
+                Each regime reports its days, mean and median forward return and hit rate
+                (bullish: return > 0, bearish: return < 0; None for neutral).
+        """
+        thresholds = thresholds or MARKET_CONDITION_THRESHOLDS
+        codes = self.signals(weights, thresholds)
+        report = {
+            "days": len(self.days),
+            "regime_days": {label: int(np.count_nonzero(codes == code)) for code, label in REGIMES.items()},
+            "horizons": {},
+        }
+        for horizon in self.horizons:
+            returns = self.returns[horizon]
+            overall = self.evaluate_many(
+                weight_vector(weights)[None, :], [[thresholds["bullish"], thresholds["bearish"]]], horizon
+            )
+            result = {
+                "hit_rate": _as_float(overall["hit_rate"][0]),
+                "signal_return": _as_float(overall["signal_return"][0]),
+            }
+            for code, label in REGIMES.items():
+                regime_returns = returns[(codes == code) & ~np.isnan(returns)]
+                hits = regime_returns * code > 0 if code else None
+                result[label] = {
+                    "days": len(regime_returns),
+                    "mean_return": _as_float(regime_returns.mean()) if len(regime_returns) else None,
+                    "median_return": _as_float(np.median(regime_returns)) if len(regime_returns) else None,
+                    "hit_rate": _as_float(hits.mean()) if hits is not None and len(regime_returns) else None,
+                }
+            report["horizons"][horizon] = result
+        return report
+
+
+def _as_float(value):
+    value = float(value)
+    return None if np.isnan(value) else round(value, 6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest market-condition signals against forward returns.")
+    parser.add_argument("indicators", help="CSV file with date, santiment, fear_and_greed, tradfi and reddit columns.")
+    parser.add_argument("--asset", default="bitcoin", help="CoinGecko id whose stored prices the signals are tested against.")
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS), help="Forward return horizons in days.")
+    parser.add_argument("--fng-history", action="store_true", help="Take fear_and_greed from the local Fear & Greed history instead of the CSV.")
+    args = parser.parse_args()
+
+    series = load_indicator_csv(args.indicators)
+    if args.fng_history:
+        from fng_history import get_fng_history
+        history = get_fng_history()
+        history.refresh()
+        series["fear_and_greed"] = history.as_indicator_series()
+    store = get_price_store()
+    store.refresh(args.asset)
+    backtest = Backtest.from_price_store(args.asset, series, args.horizons, store=store)
+
+    started = time.perf_counter()
+    report = backtest.evaluate()
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
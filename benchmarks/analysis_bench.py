@@ -0,0 +1,285 @@
+"""
+End-to-end latency benchmark of a full analysis, replayed from recorded HTTP responses.
+
+Runs the data path of an analysis against a cassette (see cassettes.Cassette) with injected
+network latency, and reports the p50/p90/p99 latency of each stage and of the whole analysis:
+- "app": what CryptoDeFiYieldFarmingAgent._analyze_crypto fetches, in its order (price, Santiment,
+  Altcoin Season, VIX, Fear & Greed and its history, Reddit, then the market condition score)
+- "cli": what CryptoFinanceAgent.analyze_market and get_crypto_price fetch (needs openai installed)
+
+The LLM calls (recommendation, explanations) are not part of it. Each run starts from an empty
+working directory and fresh caches, breakers and stores (cold); --warm reuses them across runs.
+Without --cassette a synthetic cassette shaped like the real APIs is generated; record a real one
+(needs the API keys and network access) to benchmark against real payloads:
+
+    python -m benchmarks.analysis_bench --runs 20 --latency 0.15 --jitter 0.1
+    python -m benchmarks.analysis_bench --record benchmarks/cassettes/analysis.json --crypto ethereum
+    python -m benchmarks.analysis_bench --cassette benchmarks/cassettes/analysis.json --warm
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import fng_history
+import health
+import http_cache
+import market_data
+import santiment_cache
+import snapshot
+from benchmarks.parse_bench import ALTCOIN_SEASON_FIXTURE, FIXTURES_DIR, VIX_FIXTURE, generate_fixtures
+from cassettes import Cassette
+from santiment_cache import SANTIMENT_URL
+from volatility import MS_PER_DAY
+
+PERCENTILES = [50, 90, 99]
+REDDIT_POSTS = 10  # Posts in the synthetic subreddit listing (the indicator reads 10, the app shows 5)
+CLI_NAMES = {"bitcoin": "BTC", "ethereum": "Ethereum", "solana": "Solana", "sui": "Sui"}
+# Placeholders so the clients can be built when replaying; recording uses the real keys from .env
+REPLAY_ENVIRONMENT = {
+    "REDDIT_CLIENT_ID": "benchmark",
+    "REDDIT_CLIENT_SECRET": "benchmark",
+    "REDDIT_USER_AGENT": "analysis-bench",
+    "DEEPSEEK_API_KEY": "benchmark",
+}
+
+
+def generate_cassette(path, crypto, now=None, seed=7):
+    """Write a synthetic cassette with a response for every request of an analysis of `crypto`."""
+    rng = random.Random(seed)
+    now = time.time() if now is None else now
+    today = int(now * 1000) // MS_PER_DAY
+    if not os.path.exists(os.path.join(FIXTURES_DIR, VIX_FIXTURE)):
+        generate_fixtures(FIXTURES_DIR)
+    cassette = Cassette(path, mode="record")
+    json_headers = {"Content-Type": "application/json"}
+    html_headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def fng_record(day):
+        value = rng.randint(10, 90)
+        return {"value": str(value), "value_classification": fng_history.classify_fear_and_greed(value),
+                "timestamp": str(day * 86400)}
+
+    cassette.add("GET", market_data.FEAR_GREED_URL, body=json.dumps({"data": [fng_record(today)]}), headers=json_headers)
+    cassette.add("GET", market_data.FEAR_GREED_URL, params={"limit": 0, "format": "json"}, headers=json_headers,
+                 body=json.dumps({"data": [fng_record(day) for day in range(today, today - 400, -1)]}))
+    for url, fixture in ((market_data.VIX_URL, VIX_FIXTURE), (market_data.ALTCOIN_SEASON_URL, ALTCOIN_SEASON_FIXTURE)):
+        with open(os.path.join(FIXTURES_DIR, fixture), "r") as file:
+            cassette.add("GET", url, body=file.read(), headers=html_headers)
+    cassette.add("GET", market_data.COINGECKO_PRICE_URL, params={"ids": crypto, "vs_currencies": "usd"},
+                 body=json.dumps({crypto: {"usd": round(rng.uniform(1, 100000), 2)}}), headers=json_headers)
+
+    # The Santiment query embeds its time range, so one response serves every range
+    points = [
+        {"datetime": datetime.datetime.fromtimestamp(day * 86400, tz=datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+         "value": rng.randint(200000, 600000)}
+        for day in range(today - santiment_cache.INITIAL_DAYS, today + 1)
+    ]
+    cassette.add("POST", SANTIMENT_URL, body=json.dumps({"data": {"getMetric": {"timeseriesData": points}}}),
+                 headers=json_headers)
+
+    # Reddit through praw: an OAuth token, the subreddit listing, then one comments request per post
+    cassette.add("POST", "https://www.reddit.com/api/v1/access_token", headers=json_headers, body=json.dumps(
+        {"access_token": "benchmark", "expires_in": 3600, "scope": "*", "token_type": "bearer"}))
+    words = ["bullish", "bearish", "great", "terrible", "moon", "crash", "steady", "good", "bad", "news"]
+    posts = [{"kind": "t3", "data": {"id": f"p{n}", "name": f"t3_p{n}", "subreddit": "cryptocurrency",
+                                     "title": " ".join(rng.choices(words, k=8)), "score": rng.randint(0, 500)}}
+             for n in range(REDDIT_POSTS)]
+    for limit in (5, REDDIT_POSTS):
+        listing = {"kind": "Listing", "data": {"after": None, "before": None, "dist": limit, "children": posts[:limit]}}
+        cassette.add("GET", "https://oauth.reddit.com/r/cryptocurrency/new", params={"limit": limit, "raw_json": 1},
+                     body=json.dumps(listing), headers=json_headers)
+    for post in posts:
+        comments = [{"kind": "t1", "data": {"id": f"{post['data']['id']}c{n}", "name": f"t1_{post['data']['id']}c{n}",
+                                            "body": " ".join(rng.choices(words, k=20)), "replies": ""}}
+                    for n in range(5)]
+        cassette.add("GET", f"https://oauth.reddit.com/comments/{post['data']['id']}/",
+                     params={"limit": 2048, "sort": "confidence", "raw_json": 1}, headers=json_headers,
+                     body=json.dumps([{"kind": "Listing", "data": {"children": [post]}},
+                                      {"kind": "Listing", "data": {"children": comments}}]))
+    cassette.save()
+
+
+def _reset_singletons():
+    """Drop the process-wide caches, breakers and stores so the next run builds them afresh."""
+    http_cache._http_cache = None
+    health._health_registry = None
+    snapshot._snapshot_reader = None
+    market_data._market_data = None
+    santiment_cache._santiment_cache = None
+    fng_history._fng_history = None
+
+
+def _fear_and_greed_trend():
+    """What app.get_fear_and_greed_trend computes."""
+    history = fng_history.get_fng_history()
+    history.refresh()
+    _, averages = history.moving_average(30)
+    return {"average_30d": float(averages[-1]) if len(averages) else None,
+            "percentile_1y": history.percentile(lookback_days=365)}
+
+
+def app_stages(crypto):
+    """The stages of the Streamlit app's analysis, as (name, callable) pairs."""
+    from sentiment import Sentiment  # Imported here so --help works without praw/streamlit
+
+    agent = Sentiment()
+    return [
+        ("price", lambda: agent.market_data.price(crypto)),
+        ("santiment", lambda: agent.get_santiment_data(crypto_slug=crypto, metric="daily_active_addresses")),
+        ("altcoin_season", agent.get_altcoin_season_index),
+        ("tradfi", agent.get_tradfi_sentiment),
+        ("fear_and_greed", agent.get_fear_and_greed_index),
+        ("fear_and_greed_history", _fear_and_greed_trend),
+        ("reddit", lambda: agent.get_reddit_sentiment(subreddit="cryptocurrency", limit=5)),
+        ("market_condition", lambda: agent.determine_market_condition(crypto)),
+    ]
+
+
+def cli_stages(crypto):
+    """The stages of the CLI agent's analysis, as (name, callable) pairs."""
+    from main import CryptoFinanceAgent  # Needs openai
+
+    agent = CryptoFinanceAgent()
+    return [
+        ("fear_and_greed", agent.get_fear_and_greed_index),
+        ("tradfi", agent.get_vix_index),
+        ("altcoin_season", agent.get_altcoin_season_index),
+        ("price", lambda: agent.get_crypto_price(CLI_NAMES.get(crypto, crypto))),
+    ]
+
+
+PIPELINES = {"app": app_stages, "cli": cli_stages}
+
+
+def run_analysis(stages):
+    """Run the stages in order. Returns ({stage: seconds}, end-to-end seconds, failed stage names)."""
+    timings, failed = {}, []
+    started = time.perf_counter()
+    for name, stage in stages:
+        stage_started = time.perf_counter()
+        try:
+            result = stage()
+        except Exception as e:
+            print(f"{name} raised {e!r}")
+            result = None
+        timings[name] = time.perf_counter() - stage_started
+        if result is None:
+            failed.append(name)
+    return timings, time.perf_counter() - started, failed
+
+
+def benchmark(pipeline, crypto, cassette, runs, warm=False):
+    """
+    Replay `runs` analyses.
+
+    Cold runs each get an empty working directory (the stores and caches use relative paths),
+    fresh singletons and a new agent; warm runs share them, after an untimed first run.
+
+    Returns:
+        tuple: ({stage: [seconds]}, [end-to-end seconds], {stage: failures}, [requests per run]).
+    """
+    original_dir = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="analysis-bench-")
+    stage_times, totals, failures, request_counts = {}, [], {}, []
+    try:
+        with cassette:
+            for run in range(runs + int(warm)):
+                if not warm or run == 0:
+                    run_dir = os.path.join(work_dir, f"run-{run}")
+                    os.makedirs(run_dir)
+                    os.chdir(run_dir)
+                    _reset_singletons()
+                    stages = PIPELINES[pipeline](crypto)
+                requests_before = len(cassette.requests)
+                timings, total, failed = run_analysis(stages)
+                if warm and run == 0:
+                    continue
+                request_counts.append(len(cassette.requests) - requests_before)
+                for name, seconds in timings.items():
+                    stage_times.setdefault(name, []).append(seconds)
+                    failures.setdefault(name, 0)
+                for name in failed:
+                    failures[name] += 1
+                totals.append(total)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        _reset_singletons()
+    return stage_times, totals, failures, request_counts
+
+
+def _percentiles_ms(samples):
+    return {f"p{p}_ms": float(value) * 1000 for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the latency of a full analysis against recorded responses.")
+    parser.add_argument("--pipeline", choices=sorted(PIPELINES), default="app")
+    parser.add_argument("--crypto", default="ethereum", help="CoinGecko id (Santiment slug) to analyze.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cassette", help="Cassette to replay (a synthetic one is generated if omitted).")
+    parser.add_argument("--record", metavar="PATH", help="Record a cassette from the live APIs first, then replay it.")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds added to every replayed response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response.")
+    parser.add_argument("--warm", action="store_true", help="Reuse caches and stores across runs.")
+    parser.add_argument("--output", default="bench_results/analysis.jsonl", help="JSON lines file to append results to.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("praw_check_for_updates", "False")  # praw's PyPI check is not part of an analysis
+    cassette_dir = None
+    if args.record:
+        args.record = os.path.abspath(args.record)
+        benchmark(args.pipeline, args.crypto, Cassette(args.record, mode="record"), runs=1)
+        cassette_path = args.record
+    elif args.cassette:
+        cassette_path = os.path.abspath(args.cassette)
+    else:
+        cassette_dir = tempfile.mkdtemp(prefix="analysis-cassette-")
+        cassette_path = os.path.join(cassette_dir, "analysis.json")
+        generate_cassette(cassette_path, args.crypto)
+    for name, value in REPLAY_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+    cassette = Cassette(cassette_path, mode="replay", latency=args.latency, jitter=args.jitter)
+    stage_times, totals, failures, request_counts = benchmark(args.pipeline, args.crypto, cassette, args.runs, args.warm)
+    if cassette_dir:
+        shutil.rmtree(cassette_dir, ignore_errors=True)
+
+    result = {
+        "benchmark": "analysis",
+        "pipeline": args.pipeline,
+        "crypto": args.crypto,
+        "runs": args.runs,
+        "warm": args.warm,
+        "latency_s": args.latency,
+        "jitter_s": args.jitter,
+        "cassette": "synthetic" if cassette_dir else cassette_path,
+        "requests_per_run": float(np.mean(request_counts)),
+        "stages": {name: dict(_percentiles_ms(times), failures=failures[name]) for name, times in stage_times.items()},
+        "end_to_end": _percentiles_ms(totals),
+        "run_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "a") as file:
+        file.write(json.dumps(result) + "\n")
+
+    print(f"{args.pipeline} analysis of {args.crypto}, {args.runs} {'warm' if args.warm else 'cold'} runs, "
+          f"{args.latency * 1000:.0f} ms (+{args.jitter * 1000:.0f} ms jitter) per request, "
+          f"{result['requests_per_run']:.1f} requests per run")
+    print(f"  {'stage':<24}{'p50':>10}{'p90':>10}{'p99':>10}  failures")
+    for name, stats in list(result["stages"].items()) + [("end-to-end", dict(result["end_to_end"], failures=""))]:
+        print(f"  {name:<24}{stats['p50_ms']:>8.1f}ms{stats['p90_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms  {stats['failures']}")
+
+
+if __name__ == "__main__":
+    main()
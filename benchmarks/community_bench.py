@@ -0,0 +1,242 @@
+"""
+Scale benchmark for the community strategy path.
+
+Generates synthetic corpora shaped like community/community_strategies.json and measures,
+for each storage backend:
+- load time and peak memory of loading the corpus
+- filter/top-k latency for one (crypto, market condition) pair
+- duplicate-check latency
+- submission latency (append + persist)
+
+Backends:
+- "json": the original approach (json.load, filter + sort, linear duplicate scan, json.dump).
+- "store": community_store.CommunityStore (indexed snapshot, atomic writes).
+
+Results are appended as one JSON object per line, so runs can be compared over time:
+
+    python -m benchmarks.community_bench --sizes 1000 100000 1000000 --output bench_results/community.jsonl
+    python -m benchmarks.community_bench --sizes 1000 --baseline bench_results/community.jsonl
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from community_store import CommunityStore
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+CRYPTOS = ["bitcoin", "ethereum", "solana", "sui", "binancecoin", "ripple", "cardano", "dogecoin",
+           "avalanche-2", "polkadot", "chainlink", "uniswap", "aave", "near", "optimism", "arbitrum"]
+MARKET_CONDITIONS = ["bullish", "bearish", "neutral"]
+STRATEGY_TEMPLATES = [
+    "Stake {crypto} in native validators to earn staking rewards, variant {n}.",
+    "Provide liquidity in the {crypto}/USDC pool on a DEX for high APY returns, variant {n}.",
+    "Lend {crypto} on Aave and borrow stablecoins for additional yield farming, variant {n}.",
+    "Convert {crypto} to USDC and lend it on Compound for stable yields, variant {n}.",
+]
+QUERY = ("ethereum", "bullish")
+
+
+def generate_corpus(size, seed=42):
+    """Generate a synthetic list of community strategies."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2023, 1, 1)
+    corpus = []
+    for n in range(size):
+        crypto = rng.choice(CRYPTOS)
+        corpus.append({
+            "crypto": crypto,
+            "strategy": rng.choice(STRATEGY_TEMPLATES).format(crypto=crypto, n=n),
+            "market_condition": rng.choice(MARKET_CONDITIONS),
+            "date_added": (start + datetime.timedelta(seconds=rng.randrange(2 * 365 * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return corpus
+
+
+def _timed(fn, repeat):
+    """Run fn repeat times and return (median ms, p95 ms)."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return round(statistics.median(samples), 4), round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4)
+
+
+def _peak_memory_mb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def _new_strategy(n):
+    return {
+        "crypto": QUERY[0],
+        "strategy": f"Benchmark submission {n}.",
+        "market_condition": QUERY[1],
+        "date_added": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+class JsonBackend:
+    """The original approach: parse the whole file and scan the list on every call."""
+
+    name = "json"
+
+    def __init__(self, path):
+        self.path = path
+        self.strategies = None
+        self._submissions = 0
+
+    def load(self):
+        with open(self.path, "r") as file:
+            self.strategies = json.load(file)
+
+    def top_k(self, k=5):
+        crypto, market_condition = QUERY
+        filtered = [s for s in self.strategies if s["crypto"].lower() == crypto and s["market_condition"] == market_condition]
+        filtered.sort(key=lambda x: x["date_added"], reverse=True)
+        return filtered[:k]
+
+    def is_duplicate(self, strategy):
+        for existing in self.strategies:
+            if (existing["crypto"].lower() == strategy["crypto"].lower()
+                    and existing["strategy"].lower() == strategy["strategy"].lower()
+                    and existing["market_condition"].lower() == strategy["market_condition"].lower()):
+                return True
+        return False
+
+    def submit(self):
+        self._submissions += 1
+        self.strategies.append(_new_strategy(self._submissions))
+        with open(self.path, "w") as file:
+            json.dump(self.strategies, file, indent=4)
+
+
+class StoreBackend:
+    """community_store.CommunityStore."""
+
+    name = "store"
+
+    def __init__(self, path):
+        self.path = path
+        self.store = None
+        self._submissions = 0
+
+    def load(self):
+        self.store = CommunityStore(self.path)
+        self.store.strategies
+
+    def top_k(self, k=5):
+        return self.store.index.top_k(*QUERY, k=k)
+
+    def is_duplicate(self, strategy):
+        return self.store.is_duplicate(strategy["crypto"], strategy["strategy"], strategy["market_condition"])
+
+    def submit(self):
+        self._submissions += 1
+        self.store.add(_new_strategy(self._submissions))
+
+
+BACKENDS = {"json": JsonBackend, "store": StoreBackend}
+
+
+def run_backend(backend_cls, corpus_path, size, repeat):
+    """Measure one backend against one corpus file. Returns a result dict."""
+    # Each backend gets its own copy since submissions modify the file
+    work_dir = tempfile.mkdtemp(prefix="community-bench-")
+    path = os.path.join(work_dir, "community_strategies.json")
+    with open(corpus_path, "rb") as source, open(path, "wb") as target:
+        target.write(source.read())
+
+    backend = backend_cls(path)
+    peak_memory = _peak_memory_mb(backend.load)
+    load_ms, _ = _timed(backend.load, max(1, repeat // 10))
+    top_k_ms, top_k_p95 = _timed(backend.top_k, repeat)
+    probe = dict(backend.strategies[-1] if isinstance(backend, JsonBackend) else backend.store.strategies[-1])
+    duplicate_ms, duplicate_p95 = _timed(lambda: backend.is_duplicate(probe), repeat)
+    submit_ms, submit_p95 = _timed(backend.submit, max(1, repeat // 10))
+
+    os.remove(path)
+    os.rmdir(work_dir)
+    return {
+        "benchmark": "community",
+        "backend": backend.name,
+        "size": size,
+        "load_ms": load_ms,
+        "load_peak_memory_mb": peak_memory,
+        "top_k_ms": top_k_ms,
+        "top_k_p95_ms": top_k_p95,
+        "duplicate_check_ms": duplicate_ms,
+        "duplicate_check_p95_ms": duplicate_p95,
+        "submit_ms": submit_ms,
+        "submit_p95_ms": submit_p95,
+    }
+
+
+def _load_baseline(path):
+    """Return the latest baseline result per (backend, size) from a results file."""
+    baseline = {}
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                result = json.loads(line)
+                if result.get("benchmark") == "community":
+                    baseline[(result["backend"], result["size"])] = result
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the community strategy path at scale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions for the query benchmarks.")
+    parser.add_argument("--output", default="bench_results/community.jsonl", help="JSON lines file to append results to.")
+    parser.add_argument("--baseline", help="Results file to compare against (latest entry per backend and size).")
+    args = parser.parse_args()
+
+    baseline = _load_baseline(args.baseline) if args.baseline else {}
+    run_info = {
+        "run_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+
+    for size in args.sizes:
+        corpus_dir = tempfile.mkdtemp(prefix="community-corpus-")
+        corpus_path = os.path.join(corpus_dir, "community_strategies.json")
+        with open(corpus_path, "w") as file:
+            json.dump(generate_corpus(size), file, indent=4)
+
+        for name in args.backends:
+            result = {**run_backend(BACKENDS[name], corpus_path, size, args.repeat), **run_info}
+            with open(args.output, "a") as file:
+                file.write(json.dumps(result) + "\n")
+
+            print(f"[{name:>5} n={size:>8}] load {result['load_ms']:.1f}ms ({result['load_peak_memory_mb']}MB peak), "
+                  f"top-k {result['top_k_ms']:.4f}ms, duplicate check {result['duplicate_check_ms']:.4f}ms, "
+                  f"submit {result['submit_ms']:.1f}ms")
+            previous = baseline.get((name, size))
+            if previous:
+                for metric in ("load_ms", "top_k_ms", "duplicate_check_ms", "submit_ms", "load_peak_memory_mb"):
+                    if previous.get(metric):
+                        print(f"    {metric}: {result[metric] / previous[metric]:.2f}x baseline")
+
+        os.remove(corpus_path)
+        os.rmdir(corpus_dir)
+
+
+if __name__ == "__main__":
+    main()
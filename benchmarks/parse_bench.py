@@ -0,0 +1,130 @@
+"""
+Parse-time benchmark for the VIX and Altcoin Season Index scrapers.
+
+Compares, on saved pages in benchmarks/fixtures:
+- "soup": the original approach (BeautifulSoup(html, "html.parser") over the whole page, then find)
+- "targeted": parsers.extract_vix / parsers.extract_altcoin_season_index (precompiled patterns,
+  SoupStrainer fallback)
+
+and reports the median parse time and the peak memory (tracemalloc) of each. The fixtures shipped
+with the repo are synthetic pages shaped like the real ones (large head, scripts, many quote
+elements); save real pages over them to benchmark those instead:
+
+    python -m benchmarks.parse_bench
+    python -m benchmarks.parse_bench --repeat 20 --generate   # rewrite the synthetic fixtures
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from parsers import ALTCOIN_SEASON_BUTTON_CLASS, ALTCOIN_SEASON_DIV_STYLE, extract_altcoin_season_index, extract_vix
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+VIX_FIXTURE = "yahoo_vix.html"
+ALTCOIN_SEASON_FIXTURE = "blockchaincenter_altcoin_season.html"
+
+
+def _filler(rng, blocks):
+    """Nested markup and inline scripts, roughly the mix of a real quote page."""
+    parts = []
+    for n in range(blocks):
+        parts.append(
+            f'<div class="container c{n}"><section data-test="block-{n}"><ul>'
+            + "".join(f'<li><a href="/quote/T{n}{i}" title="Ticker {n}{i}">T{n}{i}</a> '
+                      f'<span class="price">{rng.uniform(1, 500):.2f}</span></li>' for i in range(8))
+            + "</ul></section></div>"
+        )
+        if n % 10 == 0:
+            parts.append("<script>window.__data_%d = %s;</script>" % (n, ",".join(str(rng.random()) for _ in range(200))))
+    return "\n".join(parts)
+
+
+def generate_fixtures(directory=FIXTURES_DIR, seed=7):
+    """Write synthetic Yahoo Finance and blockchaincenter.net pages."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    quote = (
+        '<fin-streamer class="livePrice" data-symbol="^VIX" data-field="regularMarketPrice" data-trend="none" '
+        'active=""><span>18.42</span></fin-streamer>'
+        '<fin-streamer class="priceChange" data-symbol="^VIX" data-field="regularMarketChange" data-trend="txt">'
+        '<span>-0.35</span></fin-streamer>'
+        '<fin-streamer class="priceChange" data-symbol="^VIX" data-field="regularMarketChangePercent" data-trend="txt">'
+        '<span>(-1.87%)</span></fin-streamer>'
+    )
+    others = "".join(
+        f'<fin-streamer data-symbol="T{i}" data-field="regularMarketPrice">{rng.uniform(1, 500):.2f}</fin-streamer>'
+        for i in range(300)
+    )
+    with open(os.path.join(directory, VIX_FIXTURE), "w") as file:
+        file.write(f"<!DOCTYPE html><html><head><title>VIX</title></head><body>{_filler(rng, 60)}"
+                   f"<div id=\"quote-header\">{quote}</div>{others}{_filler(rng, 120)}</body></html>")
+
+    buttons = "".join(f'<button class="nav-link timeselect">{period} ({rng.randint(0, 100)})</button>'
+                      for period in ("30 Days", "90 Days", "365 Days"))
+    with open(os.path.join(directory, ALTCOIN_SEASON_FIXTURE), "w") as file:
+        file.write(f"<!DOCTYPE html><html><head><title>Altcoin Season Index</title></head><body>{_filler(rng, 80)}"
+                   f'<div class="nav">{buttons}<button class="{ALTCOIN_SEASON_BUTTON_CLASS}">Altcoin Season (51)</button></div>'
+                   f'<div style="{ALTCOIN_SEASON_DIV_STYLE}">51</div>{_filler(rng, 80)}</body></html>')
+
+
+def soup_vix(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "value": float(soup.find("fin-streamer", {"data-field": "regularMarketPrice"}).text.replace(",", "")),
+        "change": float(soup.find("fin-streamer", {"data-field": "regularMarketChange"}).text),
+        "change_percent": float(soup.find("fin-streamer", {"data-field": "regularMarketChangePercent"}).text.strip("()%")),
+    }
+
+
+def soup_altcoin_season(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return int(soup.find("button", class_=ALTCOIN_SEASON_BUTTON_CLASS).text.strip().rsplit("(", 1)[1].rstrip(")"))
+
+
+def measure(parse, html, repeat):
+    """Return (median seconds, peak bytes, result) of parsing a page."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parse(html)
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction of the VIX and Altcoin Season Index.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--generate", action="store_true", help="Rewrite the synthetic fixtures first.")
+    args = parser.parse_args()
+
+    if args.generate or not os.path.exists(os.path.join(args.fixtures, VIX_FIXTURE)):
+        generate_fixtures(args.fixtures)
+
+    cases = [
+        (VIX_FIXTURE, soup_vix, extract_vix),
+        (ALTCOIN_SEASON_FIXTURE, soup_altcoin_season, extract_altcoin_season_index),
+    ]
+    for fixture, baseline, targeted in cases:
+        with open(os.path.join(args.fixtures, fixture), "r") as file:
+            html = file.read()
+        soup_time, soup_peak, expected = measure(baseline, html, args.repeat)
+        fast_time, fast_peak, result = measure(targeted, html, args.repeat)
+        assert result == expected, f"{fixture}: {result} != {expected}"
+        print(f"{fixture} ({len(html) / 1024:.0f} KiB)")
+        print(f"  soup      {soup_time * 1000:8.2f} ms  {soup_peak / 1024:8.0f} KiB peak")
+        print(f"  targeted  {fast_time * 1000:8.2f} ms  {fast_peak / 1024:8.0f} KiB peak"
+              f"  ({soup_time / fast_time:.0f}x faster, {soup_peak / max(fast_peak, 1):.0f}x less memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import base64
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Hop-by-hop and encoding headers that no longer describe the stored (decoded) body
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A request in replay mode that the cassette has no recorded response for."""
+
+
+def _normalize_url(method, url, params):
+    """The URL a request goes to, with its query parameters sorted."""
+    prepared = requests.Request(method.upper(), url, params=params).prepare().url
+    parts = urlsplit(prepared)
+    return urlunsplit(parts._replace(query=urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))))
+
+
+def _key(method, url):
+    return f"{method.upper()} {url}"
+
+
+class Cassette:
+    """
+    Records HTTP responses to a JSON file and replays them, for reproducible offline runs.
+
+    While active, requests.Session.request is patched, which covers requests.get/post, the HTTP
+    cache's session and praw. Responses are matched by method and URL (query sorted), not by body,
+    so requests whose body embeds the current time (the Santiment GraphQL query) still match.
+    Several responses to the same request are replayed in recorded order, the last one repeating.
+
+    Args:
+        path (str): The cassette file.
+        mode (str): "record" (go to the network and save every response), "replay" (only serve
+            recorded responses, raising CassetteMiss otherwise) or "once" (replay if the file
+            exists, else record).
+        latency (float): Seconds added to every replayed response.
+        jitter (float): Up to this many extra seconds, drawn uniformly per response.
+        latency_by_host (dict): Per-host latency overriding `latency`.
+        seed (int): Seed of the jitter draws.
+    """
+
+    def __init__(self, path, mode="replay", latency=0.0, jitter=0.0, latency_by_host=None, seed=0):
+        if mode == "once":
+            mode = "replay" if os.path.exists(path) else "record"
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_by_host = latency_by_host or {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._interactions = {}  # key -> [response dicts]
+        self._played = {}  # key -> responses replayed so far
+        self._original = None
+        self.requests = []  # Keys of the requests made while active, in order
+        if mode == "replay":
+            self.load()
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            self._interactions = json.load(file)["interactions"]
+
+    def save(self):
+        """Write the recorded responses atomically."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cassette-")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"interactions": self._interactions}, file, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def add(self, method, url, status_code=200, body="", headers=None, params=None):
+        """Add a response for a request, as if it had been recorded."""
+        content = body.encode("utf-8") if isinstance(body, str) else body
+        key = _key(method, _normalize_url(method, url, params))
+        self._interactions.setdefault(key, []).append(self._serialize(status_code, headers or {}, content))
+
+    @staticmethod
+    def _serialize(status_code, headers, content):
+        entry = {
+            "status_code": status_code,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(content).decode("ascii")
+        return entry
+
+    def _response(self, entry, method, url):
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        if "body" in entry:
+            response._content = entry["body"].encode("utf-8")
+            response.encoding = "utf-8"
+        else:
+            response._content = base64.b64decode(entry["body_base64"])
+        response.url = url
+        response.request = requests.Request(method.upper(), url).prepare()
+        return response
+
+    def _request(self, session, method, url, params=None, **kwargs):
+        full_url = _normalize_url(method, url, params)
+        key = _key(method, full_url)
+        with self._lock:
+            self.requests.append(key)
+        if self.mode == "record":
+            response = self._original(session, method, url, params=params, **kwargs)
+            with self._lock:
+                self._interactions.setdefault(key, []).append(
+                    self._serialize(response.status_code, response.headers, response.content)
+                )
+            return response
+
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                raise CassetteMiss(f"No recorded response for {key}")
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+            entry = responses[min(played, len(responses) - 1)]
+            delay = self.latency_by_host.get(urlsplit(full_url).netloc, self.latency)
+            delay += self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return self._response(entry, method, full_url)
+
+    def __enter__(self):
+        self._original = requests.Session.request
+        cassette = self
+
+        def request(session, method, url, *args, **kwargs):
+            return cassette._request(session, method, url, *args, **kwargs)
+
+        requests.Session.request = request
+        return self
+
+    def __exit__(self, *exc_info):
+        requests.Session.request = self._original
+        self._original = None
+        if self.mode == "record":
+            self.save()
+        return False
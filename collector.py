@@ -0,0 +1,114 @@
+import argparse
+import math
+import time
+
+from health import SourceUnavailable, get_health_registry
+from market_data import get_market_data
+from snapshot import SNAPSHOT_FILE, write_snapshot
+
+DEFAULT_ASSETS = ["bitcoin", "ethereum", "solana", "sui"]  # CoinGecko ids, also the Santiment slugs
+COLLECT_INTERVAL = 60  # Seconds between snapshots; each source is still only fetched once per its TTL
+
+
+def _entry(value, now):
+    return {"raw": value["raw"], "fetched_at": now - value["age"], "stale": value["stale"]}
+
+
+class Collector:
+    """
+    Refreshes the indicator sources and prices on schedule and publishes them as one snapshot.
+
+    Run as a single process (python collector.py), it makes every Streamlit session and CLI agent
+    read the same values from data/snapshot.json (see snapshot.SnapshotReader), so the number of
+    external requests no longer grows with the number of users.
+    """
+
+    def __init__(self, registry, assets=DEFAULT_ASSETS, thresholds=None, path=SNAPSHOT_FILE, fetch_prices=None):
+        """
+        Args:
+            registry (SourceRegistry): The indicator sources (e.g. Sentiment().indicator_registry).
+            assets (list): Assets to score and price.
+            thresholds (dict): Market condition thresholds.
+            path (str): Where the snapshot is published.
+            fetch_prices (callable): Returns {asset: USD price} for a list of assets (MarketData.fetch_prices by default).
+        """
+        self.registry = registry
+        self.assets = list(assets)
+        self.thresholds = thresholds
+        self.path = path
+        self.fetch_prices = fetch_prices or get_market_data().fetch_prices
+        self.registry.track(*self.assets)
+
+    def collect(self):
+        """
+        Refresh what is due and build a snapshot.
+
+        Returns:
+            dict: {"generated_at", "indicators": {name: entry}, "assets": {asset: {"score",
+                "condition", "indicators"}}, "prices": {asset: usd}}, entries being {"raw",
+                "fetched_at", "stale"}.
+        """
+        self.registry.refresh_due()
+        try:
+            prices = get_health_registry().call("coingecko/prices", self.fetch_prices, self.assets).value
+        except SourceUnavailable as e:
+            print(f"Prices unavailable: {e}")
+            prices = {}
+
+        now = time.time()
+        per_asset = {source.name for source in self.registry.sources if source.per_asset}
+        snapshot = {
+            "generated_at": now,
+            "indicators": {
+                name: _entry(value, now) for name, value in self.registry.values().items() if name not in per_asset
+            },
+            "assets": {},
+            "prices": prices,
+        }
+        for asset in self.assets:
+            score, condition, values = self.registry.score(asset, thresholds=self.thresholds, refresh=False)
+            snapshot["assets"][asset] = {
+                "score": None if math.isnan(score) else score,
+                "condition": condition,
+                # Only the asset's own values; a fallback asset's value is not published as this asset's
+                "indicators": {
+                    name: _entry(value, now) for name, value in values.items()
+                    if name in per_asset and value["asset"] == asset
+                },
+            }
+        return snapshot
+
+    def publish(self):
+        """Collect and atomically replace the snapshot file."""
+        write_snapshot(self.collect(), self.path)
+
+    def run(self, interval=COLLECT_INTERVAL):
+        """Publish a snapshot every `interval` seconds until interrupted."""
+        while True:
+            started = time.time()
+            try:
+                self.publish()
+            except Exception as e:
+                print(f"Error publishing snapshot: {e}")
+            time.sleep(max(interval - (time.time() - started), 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect market indicators and prices into a shared snapshot.")
+    parser.add_argument("--assets", nargs="+", default=DEFAULT_ASSETS, help="CoinGecko ids (Santiment slugs) to score and price.")
+    parser.add_argument("--interval", type=int, default=COLLECT_INTERVAL, help="Seconds between snapshots.")
+    parser.add_argument("--once", action="store_true", help="Publish one snapshot and exit.")
+    args = parser.parse_args()
+
+    from sentiment import Sentiment  # Imported here so the snapshot format can be used without praw/streamlit
+
+    sentiment = Sentiment()
+    collector = Collector(sentiment.indicator_registry, args.assets, sentiment.market_condition_thresholds)
+    if args.once:
+        collector.publish()
+    else:
+        collector.run(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import csv
+import datetime
+import json
+import math
+import time
+
+from community_store import get_community_store
+from risk import attach_risk
+
+# Defaults
+COMMUNITY_FILE = "community/community_strategies.json"
+CSV_FIELDS = ["crypto", "strategy", "market_condition", "date_added"]
+MARKET_CONDITIONS = {"bullish", "bearish", "neutral"}
+INVALID_STRATEGY_CHARS = ['<', '>', '&', '{', '}', ';', '(', ')', '`']
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+def detect_format(path):
+    """Infer the bulk file format ("ndjson" or "csv") from its extension."""
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    raise ValueError(f"Cannot infer format of {path}. Use a .ndjson, .jsonl or .csv file, or pass the format.")
+
+
+def validate_strategy(record):
+    """
+    Validate and normalize a strategy record for the community store.
+
+    Applies the same rules as the share form in app.py.
+
+    Returns:
+        tuple: (normalized record, None) or (None, error message).
+    """
+    if not isinstance(record, dict):
+        return None, "record is not an object"
+    crypto = (record.get("crypto") or "").strip()
+    strategy = (record.get("strategy") or "").strip()
+    market_condition = (record.get("market_condition") or "").strip().lower()
+    date_added = (record.get("date_added") or "").strip()
+
+    if not crypto or not strategy:
+        return None, "missing crypto or strategy"
+    if market_condition not in MARKET_CONDITIONS:
+        return None, f"invalid market condition {market_condition!r}"
+    if any(char in strategy for char in INVALID_STRATEGY_CHARS):
+        return None, "invalid characters in strategy"
+    if date_added:
+        try:
+            datetime.datetime.strptime(date_added, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None, f"invalid date_added {date_added!r}"
+    else:
+        date_added = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    normalized = {
+        "crypto": crypto.lower(),
+        "strategy": strategy,
+        "market_condition": market_condition,
+        "date_added": date_added,
+    }
+    # Keep well-formed risk scores carried over from an NDJSON export; others are dropped and re-scored
+    if _is_valid_risk(record.get("risk")):
+        normalized["risk"] = record["risk"]
+    return normalized, None
+
+
+def _is_valid_risk(risk):
+    """Whether a stored risk has the shape risk.score_strategy produces (a numeric overall, factors, inputs_as_of)."""
+    return (
+        isinstance(risk, dict)
+        and isinstance(risk.get("overall"), (int, float)) and not isinstance(risk["overall"], bool)
+        and math.isfinite(risk["overall"])
+        and isinstance(risk.get("factors"), dict)
+        and "inputs_as_of" in risk
+    )
+
+
+def _read_records(file, file_format):
+    """Yield (record or None, error) from an open NDJSON or CSV file, one row at a time."""
+    if file_format == "csv":
+        for row in csv.DictReader(file):
+            yield row, None
+        return
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield None, f"invalid JSON: {e}"
+
+
+def import_strategies(path, file_format=None, store_path=COMMUNITY_FILE, batch_size=DEFAULT_BATCH_SIZE,
+                      score_risk=True, volatility_lookup=None):
+    """
+    Stream strategies from an NDJSON or CSV file into the community store.
+
+    Records are read one at a time and added in batches; only the current batch is held
+    besides the store itself. Duplicates are checked against the store's index (including
+    earlier records of the same file) and the store is written once at the end.
+    Unless score_risk is False, each record gets its risk score at ingest (see risk.attach_risk),
+    with volatility looked up once per cryptocurrency.
+
+    Returns:
+        dict: Counts of read/imported/duplicate/invalid records, errors and throughput.
+    """
+    file_format = file_format or detect_format(path)
+    store = get_community_store(store_path)
+    report = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    started = time.perf_counter()
+
+    def add_batch(batch):
+        added = store.add_many(batch, persist=False)
+        report["imported"] += added
+        report["duplicates"] += len(batch) - added
+
+    batch = []
+    try:
+        with open(path, "r", newline="", encoding="utf-8") as file:
+            for record_number, (record, error) in enumerate(_read_records(file, file_format), 1):
+                report["read"] += 1
+                if error is None:
+                    record, error = validate_strategy(record)
+                if error is not None:
+                    report["invalid"] += 1
+                    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                        report["errors"].append(f"record {record_number}: {error}")
+                    continue
+                if score_risk and not record.get("risk"):
+                    attach_risk(record, volatility_lookup)
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    add_batch(batch)
+                    batch = []
+        if batch:
+            add_batch(batch)
+    finally:
+        # Persist the batches already added even if the file fails mid-way, so the shared store
+        # is not left dirty (a dirty store stops reloading external edits)
+        store.flush()
+
+    _add_throughput(report, started)
+    return report
+
+
+def export_strategies(path, file_format=None, store_path=COMMUNITY_FILE):
+    """
+    Stream the community store to an NDJSON or CSV file, one record per line.
+
+    Returns:
+        dict: The number of exported records and throughput.
+    """
+    file_format = file_format or detect_format(path)
+    store = get_community_store(store_path)
+    report = {"exported": 0}
+    started = time.perf_counter()
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for strategy in store.strategies:
+                writer.writerow(strategy)
+                report["exported"] += 1
+        else:
+            for strategy in store.strategies:
+                file.write(json.dumps(strategy))
+                file.write("\n")
+                report["exported"] += 1
+
+    _add_throughput(report, started)
+    return report
+
+
+def _add_throughput(report, started):
+    elapsed = time.perf_counter() - started
+    records = report.get("read", report.get("exported", 0))
+    report["seconds"] = round(elapsed, 3)
+    report["records_per_second"] = round(records / elapsed) if elapsed > 0 else records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export community strategies (NDJSON or CSV).")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="File to import from or export to (.ndjson, .jsonl or .csv).")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Override the format inferred from the extension.")
+    parser.add_argument("--store", default=COMMUNITY_FILE, help="Community strategies file.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-risk", action="store_true", help="Skip risk scoring of imported strategies.")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        report = import_strategies(args.path, args.format, args.store, args.batch_size, score_risk=not args.no_risk)
+        print(f"Read {report['read']} records: {report['imported']} imported, "
+              f"{report['duplicates']} duplicates, {report['invalid']} invalid.")
+        for error in report["errors"]:
+            print(f"  {error}")
+    else:
+        report = export_strategies(args.path, args.format, args.store)
+        print(f"Exported {report['exported']} records to {args.path}.")
+    print(f"Took {report['seconds']}s ({report['records_per_second']} records/s).")
+
+
+if __name__ == "__main__":
+    main()
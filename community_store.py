@@ -0,0 +1,328 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+
+# Separator used when encoding pagination cursors as strings
+CURSOR_SEPARATOR = "|"
+
+
+def _bucket_key(crypto, market_condition):
+    """Normalize a (crypto, market condition) pair into an index key."""
+    return (crypto.lower(), market_condition.lower())
+
+
+def _date_added(strategy):
+    """Return the sortable date of a strategy (the CLI stores it as "timestamp")."""
+    return strategy.get("date_added") or strategy.get("timestamp", "")
+
+
+def _dedupe_key(crypto, strategy, market_condition):
+    """Case-insensitive identity of a strategy, used for duplicate checks."""
+    return (crypto.lower(), strategy.lower(), (market_condition or "").lower())
+
+
+class CommunityIndex:
+    """
+    Per-(crypto, market condition) index over the community strategies.
+
+    Each bucket keeps its strategies sorted by (date_added, insertion order), oldest first,
+    so the newest entries sit at the end and the newest-k can be sliced off in O(k).
+    Entries are stored by reference; the index never copies the corpus.
+    """
+
+    def __init__(self, strategies=()):
+        self._sort_keys = {}  # bucket key -> sorted list of (date_added, seq)
+        self._entries = {}  # bucket key -> strategies, in the same order as _sort_keys
+        self._risk_rankings = {}  # bucket key -> strategies sorted by stored risk, built on first use
+        self._seq = 0
+        self._size = 0
+
+        # Group first, then sort each bucket once instead of inserting one by one
+        grouped = {}
+        for strategy in strategies:
+            grouped.setdefault(self._key_for(strategy), []).append(((_date_added(strategy), self._next_seq()), strategy))
+        for key, rows in grouped.items():
+            rows.sort(key=lambda row: row[0])
+            self._sort_keys[key] = [row[0] for row in rows]
+            self._entries[key] = [row[1] for row in rows]
+            self._size += len(rows)
+
+    def _next_seq(self):
+        self._seq += 1
+        return self._seq
+
+    @staticmethod
+    def _key_for(strategy):
+        # Strategies shared from the CLI have no market condition
+        return _bucket_key(strategy["crypto"], strategy.get("market_condition", ""))
+
+    def __len__(self):
+        return self._size
+
+    def add(self, strategy):
+        """Index a new strategy. Appending a strategy newer than the bucket's newest is O(1)."""
+        key = self._key_for(strategy)
+        sort_key = (_date_added(strategy), self._next_seq())
+        sort_keys = self._sort_keys.setdefault(key, [])
+        entries = self._entries.setdefault(key, [])
+        if not sort_keys or sort_key >= sort_keys[-1]:
+            sort_keys.append(sort_key)
+            entries.append(strategy)
+        else:
+            position = bisect.bisect_right(sort_keys, sort_key)
+            sort_keys.insert(position, sort_key)
+            entries.insert(position, strategy)
+        self._risk_rankings.pop(key, None)
+        self._size += 1
+
+    def invalidate_rankings(self):
+        """Drop the cached risk rankings after stored risk scores changed."""
+        self._risk_rankings.clear()
+
+    def count(self, crypto, market_condition):
+        """Return the number of strategies indexed for a (crypto, market condition) pair."""
+        return len(self._entries.get(_bucket_key(crypto, market_condition), ()))
+
+    def top_k(self, crypto, market_condition, k=5, cursor=None):
+        """
+        Return the newest strategies for a (crypto, market condition) pair.
+
+        Args:
+            crypto (str): The cryptocurrency slug (e.g., "bitcoin").
+            market_condition (str): "bullish", "bearish" or "neutral".
+            k (int): Maximum number of strategies to return.
+            cursor (str): Cursor returned by a previous call, to fetch the next (older) page.
+
+        Returns:
+            tuple: (strategies newest first, cursor for the next page or None if exhausted).
+        """
+        key = _bucket_key(crypto, market_condition)
+        sort_keys = self._sort_keys.get(key)
+        if not sort_keys or k <= 0:
+            return [], None
+
+        # Keyset pagination: resume strictly before the last item of the previous page,
+        # so strategies added in the meantime do not shift the pages
+        end = len(sort_keys) if cursor is None else bisect.bisect_left(sort_keys, self._decode_cursor(cursor))
+        start = max(0, end - k)
+        page = self._entries[key][start:end]
+        page.reverse()
+        next_cursor = self._encode_cursor(sort_keys[start]) if start > 0 else None
+        return page, next_cursor
+
+    def rank_by_risk(self, crypto, market_condition, k=5, highest_first=False):
+        """
+        Return the k lowest (or highest) risk strategies for a (crypto, market condition) pair.
+
+        Uses the risk scores stored with each strategy at ingest (see risk.attach_risk); strategies
+        without a stored score are not ranked. The ranking is cached per bucket until it changes.
+        """
+        key = _bucket_key(crypto, market_condition)
+        ranking = self._risk_rankings.get(key)
+        if ranking is None:
+            scored = [strategy for strategy in self._entries.get(key, ()) if strategy.get("risk")]
+            ranking = sorted(scored, key=lambda strategy: strategy["risk"]["overall"])
+            self._risk_rankings[key] = ranking
+        if k <= 0:
+            return []
+        return ranking[-k:][::-1] if highest_first else ranking[:k]
+
+    @staticmethod
+    def _encode_cursor(sort_key):
+        date_added, seq = sort_key
+        return f"{date_added}{CURSOR_SEPARATOR}{seq}"
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            date_added, seq = cursor.rsplit(CURSOR_SEPARATOR, 1)
+            return (date_added, int(seq))
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+
+
+class CommunityStore:
+    """
+    Process-wide, read-mostly snapshot of a community strategies file.
+
+    The file is parsed once and kept in memory together with its CommunityIndex and a
+    duplicate-check set. Readers only pay for an os.stat() of the file: the snapshot is
+    reloaded when the file's (inode, mtime, size) signature changes, i.e. when another
+    process edits it. Writes made through the store update the in-memory snapshot in place,
+    are written atomically, and bump the write generation.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._loaded = False
+        self._generation = 0
+        self._strategies = []
+        self._index = CommunityIndex()
+        self._dedupe_keys = set()
+        self._dirty = False
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _refresh_locked(self):
+        """Reload the snapshot if the file changed since it was last read. Caller holds the lock."""
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+        if self._dirty:
+            # Keep unflushed bulk additions rather than dropping them for the external edit
+            return
+
+        strategies = []
+        if signature is not None:
+            with open(self.path, "r") as file:
+                strategies = json.load(file)
+            if not isinstance(strategies, list):
+                raise ValueError(f"Invalid data format in {self.path}. Expected a list.")
+
+        self._strategies = strategies
+        self._index = CommunityIndex(strategies)
+        self._dedupe_keys = {
+            _dedupe_key(s["crypto"], s["strategy"], s.get("market_condition")) for s in strategies
+        }
+        self._signature = signature
+        self._loaded = True
+        self._generation += 1
+
+    def _ensure_fresh(self):
+        # Lock-free fast path: a single stat() when nothing changed
+        if self._loaded and self._file_signature() == self._signature:
+            return
+        with self._lock:
+            self._refresh_locked()
+
+    @property
+    def strategies(self):
+        """All strategies, in file order. Shared with other readers: do not mutate."""
+        self._ensure_fresh()
+        return self._strategies
+
+    @property
+    def index(self):
+        """The CommunityIndex over the current snapshot."""
+        self._ensure_fresh()
+        return self._index
+
+    @property
+    def generation(self):
+        """
+        Counter bumped on every reload or write of the snapshot, for callers caching derived views.
+        Read it after strategies/index so it reflects the snapshot they returned.
+        """
+        return self._generation
+
+    def is_duplicate(self, crypto, strategy, market_condition=None):
+        """Check whether the same strategy text was already shared for this crypto and market condition."""
+        self._ensure_fresh()
+        return _dedupe_key(crypto, strategy, market_condition) in self._dedupe_keys
+
+    def add(self, strategy):
+        """Append a strategy and persist the store. Returns False if it is a duplicate."""
+        return self.add_many([strategy]) == 1
+
+    def add_many(self, strategies, persist=True):
+        """
+        Append several strategies with a single write. Duplicates are skipped.
+
+        Args:
+            strategies (iterable): Strategy dicts to add.
+            persist (bool): Write the file now. Bulk loaders pass False and call flush() once at the end.
+
+        Returns:
+            int: The number of strategies added.
+        """
+        with self._lock:
+            self._refresh_locked()
+            new, keys = [], set()
+            for strategy in strategies:
+                key = _dedupe_key(strategy["crypto"], strategy["strategy"], strategy.get("market_condition"))
+                if key in self._dedupe_keys or key in keys:
+                    continue
+                keys.add(key)
+                new.append(strategy)
+            if not new:
+                return 0
+            if persist:
+                # Only take the strategies in once they are on disk, so a failed write leaves no trace
+                self._write_locked(self._strategies + new)
+            else:
+                self._dirty = True
+            self._dedupe_keys |= keys
+            self._strategies.extend(new)
+            for strategy in new:
+                self._index.add(strategy)
+            return len(new)
+
+    def update(self, mutate, persist=True):
+        """
+        Modify stored strategies in place, e.g. to refresh derived fields in batch.
+
+        Args:
+            mutate (callable): Called with the list of strategies under the store lock;
+                returns the number of strategies it changed.
+            persist (bool): Write the file now if anything changed.
+
+        Returns:
+            int: The value returned by mutate.
+        """
+        with self._lock:
+            self._refresh_locked()
+            changed = mutate(self._strategies)
+            if changed:
+                self._dirty = True
+                self._index.invalidate_rankings()
+                if persist:
+                    self._write_locked()
+            return changed
+
+    def flush(self):
+        """Persist strategies added with persist=False."""
+        with self._lock:
+            if self._dirty:
+                self._write_locked()
+
+    def _write_locked(self, strategies=None):
+        """
+        Write the snapshot (or `strategies`, the snapshot about to be) to a temporary file and
+        atomically swap it in. Caller holds the lock.
+        """
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".community-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self._strategies if strategies is None else strategies, file, indent=4)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._signature = self._file_signature()
+        self._dirty = False
+        self._generation += 1
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_community_store(path):
+    """Return the process-wide CommunityStore for a file, shared by every session."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = CommunityStore(path)
+        return _stores[key]
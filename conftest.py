@@ -0,0 +1,10 @@
+import pytest
+
+import liquidity
+from liquidity import LiquidityIndex
+
+
+@pytest.fixture(autouse=True)
+def _offline_liquidity(monkeypatch):
+    """Score liquidity from the fallback map rather than the process-wide CoinGecko index."""
+    monkeypatch.setattr(liquidity, "_liquidity_index", LiquidityIndex(fetch_page=lambda page: []))
@@ -0,0 +1,193 @@
+import datetime
+import os
+import threading
+import time
+
+import numpy as np
+
+from http_cache import get_http_cache
+from record_files import append_records
+
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
+FEAR_GREED_HISTORY_FILE = "data/fear_and_greed.bin"
+SECONDS_PER_DAY = 86400
+# One record per day: day number since the epoch and the index value (0-100), 5 bytes per day
+FNG_DTYPE = np.dtype([("day", "<i4"), ("value", "u1")])
+
+
+def fetch_fear_and_greed(limit):
+    """
+    Fetch the last `limit` daily Fear & Greed values from alternative.me (0 for the full history).
+
+    Returns:
+        list: (day number, value) pairs, in any order.
+    """
+    response = get_http_cache().get(FEAR_GREED_URL, params={"limit": limit, "format": "json"}, source="alternative.me")
+    response.raise_for_status()
+    return [(int(point["timestamp"]) // SECONDS_PER_DAY, int(point["value"])) for point in response.json()["data"]]
+
+
+def classify_fear_and_greed(value):
+    """alternative.me's classification of an index value."""
+    if value <= 24:
+        return "Extreme Fear"
+    if value <= 46:
+        return "Fear"
+    if value <= 54:
+        return "Neutral"
+    if value <= 75:
+        return "Greed"
+    return "Extreme Greed"
+
+
+def _day(date):
+    """Day number of a date, datetime or day number."""
+    if date is None or isinstance(date, (int, np.integer)):
+        return date
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    return (date - datetime.date(1970, 1, 1)).days
+
+
+class FearGreedHistory:
+    """
+    Local daily history of the Crypto Fear & Greed Index.
+
+    The full series is loaded once with limit=0 and then only the missing days are appended, to an
+    append-only file of FNG_DTYPE records (the whole history since 2018 is a few KiB). Range,
+    moving-average and percentile queries are answered from the file without network calls.
+    """
+
+    def __init__(self, path=FEAR_GREED_HISTORY_FILE, fetch=fetch_fear_and_greed):
+        self.path = path
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._cache = (None, np.empty(0, dtype=FNG_DTYPE))  # (file size, records)
+
+    def _records(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=FNG_DTYPE)
+        if self._cache[0] != size:
+            records = np.fromfile(self.path, dtype=FNG_DTYPE, count=size // FNG_DTYPE.itemsize)
+            self._cache = (size, records)
+        return self._cache[1]
+
+    def refresh(self, now=None):
+        """
+        Append the days missing since the last stored one (the full history on first use).
+
+        Returns:
+            int: The number of days appended.
+        """
+        today = int((time.time() if now is None else now) // SECONDS_PER_DAY)
+        with self._lock:
+            records = self._records()
+            last = int(records["day"][-1]) if len(records) else None
+            if last is not None and last >= today:
+                return 0
+            points = self.fetch(0 if last is None else today - last)
+            new = np.array(sorted(dict(points).items()), dtype=FNG_DTYPE) if points else np.empty(0, dtype=FNG_DTYPE)
+            if last is not None:
+                new = new[new["day"] > last]
+            new = new[new["day"] <= today]
+            # Another process may have appended the same days since the records were read
+            return len(append_records(self.path, new, key=lambda records: records["day"]))
+
+    def series(self, start=None, end=None):
+        """
+        Stored records between two dates (inclusive), oldest first.
+
+        Args:
+            start, end: datetime.date, "YYYY-MM-DD" strings or day numbers; None for unbounded.
+
+        Returns:
+            np.ndarray: FNG_DTYPE records.
+        """
+        records = self._records()
+        start, end = _day(start), _day(end)
+        lo = 0 if start is None else np.searchsorted(records["day"], start, side="left")
+        hi = len(records) if end is None else np.searchsorted(records["day"], end, side="right")
+        return records[lo:hi]
+
+    def range(self, start=None, end=None):
+        """Values between two dates as [{"date", "value", "classification"}], oldest first."""
+        return [
+            {
+                "date": (datetime.date(1970, 1, 1) + datetime.timedelta(days=int(day))).isoformat(),
+                "value": int(value),
+                "classification": classify_fear_and_greed(int(value)),
+            }
+            for day, value in self.series(start, end)
+        ]
+
+    def latest(self):
+        """The newest stored value as {"date", "value", "classification"}, or None."""
+        records = self._records()
+        return self.range(int(records["day"][-1]))[0] if len(records) else None
+
+    def moving_average(self, window, start=None, end=None):
+        """
+        Trailing moving average over `window` stored days, for each day between start and end.
+
+        Returns:
+            tuple: (day numbers, averages); days with fewer than `window` earlier values are NaN.
+        """
+        records = self._records()
+        values = records["value"].astype(float)
+        sums = np.concatenate([[0.0], np.cumsum(values)])
+        averages = np.full(len(values), np.nan)
+        if len(values) >= window:
+            averages[window - 1:] = (sums[window:] - sums[:-window]) / window
+        start, end = _day(start), _day(end)
+        lo = 0 if start is None else np.searchsorted(records["day"], start, side="left")
+        hi = len(records) if end is None else np.searchsorted(records["day"], end, side="right")
+        return records["day"][lo:hi], averages[lo:hi]
+
+    def percentile(self, value=None, lookback_days=None):
+        """
+        Percentile rank (0-100) of a value among the stored values.
+
+        Args:
+            value (int): The value to rank; defaults to the latest value.
+            lookback_days (int): Only rank against the last `lookback_days` days.
+        """
+        records = self._records()
+        if not len(records):
+            return None
+        if lookback_days is not None:
+            records = records[records["day"] > records["day"][-1] - lookback_days]
+        value = int(records["value"][-1]) if value is None else value
+        values = records["value"]
+        # Mean of the strict and weak ranks, so ties count half
+        return float(100 * (np.count_nonzero(values < value) + np.count_nonzero(values <= value)) / (2 * len(values)))
+
+    def as_indicator_series(self):
+        """The history as [timestamp_ms, value] pairs, the input format of backtest.align_indicators."""
+        records = self._records()
+        return np.column_stack((records["day"].astype(np.int64) * SECONDS_PER_DAY * 1000, records["value"])).tolist()
+
+
+_fng_history = None
+_fng_history_lock = threading.Lock()
+
+
+def get_fng_history():
+    """Return the process-wide FearGreedHistory."""
+    global _fng_history
+    with _fng_history_lock:
+        if _fng_history is None:
+            _fng_history = FearGreedHistory()
+        return _fng_history
+
+
+if __name__ == "__main__":
+    history = get_fng_history()
+    print(f"Appended {history.refresh()} days of Fear & Greed history.")
+    latest = history.latest()
+    if latest:
+        print(f"Latest: {latest['value']} ({latest['classification']}) on {latest['date']}, "
+              f"percentile {history.percentile():.0f} of {len(history.series())} days.")
@@ -0,0 +1,143 @@
+import threading
+import time
+
+FAILURE_THRESHOLD = 3  # Consecutive failures that open a breaker
+COOLDOWN = 300  # Seconds an open breaker skips its source before one trial call
+MAX_STALENESS = 86400  # Oldest last-known-good value served when a source fails
+
+
+class SourceUnavailable(Exception):
+    """A source failed (or its breaker is open) and has no recent last-known-good value."""
+
+
+class Reading:
+    """A value from a data source, possibly the last known good one."""
+
+    def __init__(self, value, as_of, stale, error=None):
+        self.value = value
+        self.as_of = as_of  # Time the value was fetched
+        self.stale = stale  # True when the source failed or was skipped and this is an older value
+        self.error = error  # Why the source is not fresh, when stale
+
+    @property
+    def age(self):
+        return time.time() - self.as_of
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around one data source.
+
+    Closed: every call goes to the source. After `failure_threshold` consecutive failures (an
+    exception or None) the breaker opens and calls are skipped for `cooldown` seconds; then one
+    trial call is let through (half-open), closing the breaker on success and reopening it on
+    failure. Whenever the source is not called or fails, the last good value is returned as a
+    stale Reading, if it is at most `max_staleness` seconds old.
+    """
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_staleness=MAX_STALENESS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_staleness = max_staleness
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._last_good = None  # (value, fetched at)
+        self._trial_running = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.time() - self.opened_at >= self.cooldown else "open"
+
+    def _fallback(self, error):
+        if self._last_good is not None and time.time() - self._last_good[1] <= self.max_staleness:
+            return Reading(self._last_good[0], self._last_good[1], True, error)
+        raise SourceUnavailable(f"{self.name} unavailable: {error}")
+
+    def call(self, fetch, *args, **kwargs):
+        """
+        Call fetch(*args, **kwargs) unless the breaker is open.
+
+        Returns:
+            Reading: The fresh value, or the last good one marked stale.
+
+        Raises:
+            SourceUnavailable: If there is no fresh value and no recent last good one.
+        """
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial_running):
+                return self._fallback(self.last_error or "circuit open")
+            self._trial_running = state == "half-open"
+
+        try:
+            value = fetch(*args, **kwargs)
+            error = None if value is not None else "no data"
+        except Exception as e:
+            value, error = None, f"{type(e).__name__}: {e}"
+
+        with self._lock:
+            self._trial_running = False
+            if error is None:
+                self.failures = 0
+                self.opened_at = None
+                self.last_error = None
+                self._last_good = (value, time.time())
+                return Reading(value, self._last_good[1], False)
+            self.failures += 1
+            self.last_error = error
+            if state == "half-open" or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+            return self._fallback(error)
+
+    def status(self):
+        """State, consecutive failures, last error and age of the last good value."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_good_age": None if self._last_good is None else round(time.time() - self._last_good[1], 1),
+            }
+
+
+class HealthRegistry:
+    """One CircuitBreaker per data source, created on first use."""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def breaker(self, source):
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = CircuitBreaker(source, **self.breaker_options)
+            return self._breakers[source]
+
+    def call(self, source, fetch, *args, **kwargs):
+        """Call fetch through the breaker of a source, see CircuitBreaker.call."""
+        return self.breaker(source).call(fetch, *args, **kwargs)
+
+    def status(self):
+        """Status of every source's breaker."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {source: breaker.status() for source, breaker in sorted(breakers.items())}
+
+
+_health_registry = None
+_health_registry_lock = threading.Lock()
+
+
+def get_health_registry():
+    """Return the process-wide HealthRegistry."""
+    global _health_registry
+    with _health_registry_lock:
+        if _health_registry is None:
+            _health_registry = HealthRegistry()
+        return _health_registry
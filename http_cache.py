@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: stats updates are only serialized within a process
+    fcntl = None
+
+HTTP_CACHE_DIR = "data/http_cache"
+DEFAULT_FRESHNESS = 300  # Seconds a response is served without contacting the server
+DEFAULT_TIMEOUT = 10
+STATS_FILE = "stats.json"
+STAT_FIELDS = ["requests", "not_modified", "fresh_hits", "bytes_downloaded", "bytes_saved"]
+
+
+class CachedResponse:
+    """The subset of requests.Response the scrapers use, backed by a cache entry."""
+
+    def __init__(self, url, text, status_code, from_cache, not_modified):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.from_cache = from_cache  # Served without downloading the body
+        self.not_modified = not_modified  # The server answered 304
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for {self.url}")
+
+
+class ConditionalCache:
+    """
+    HTTP GET cache that revalidates with ETag and Last-Modified.
+
+    Bodies and validators are stored on disk per URL. Within the freshness window a response is
+    served without a request; after it, the request carries If-None-Match/If-Modified-Since and a
+    304 only extends the freshness of the stored body. Results of a parse function are kept with
+    the body, so an unchanged page is not parsed again either. Requests, 304s, fresh hits and
+    bytes downloaded/saved are counted per source and persisted with the cache.
+    """
+
+    def __init__(self, root=HTTP_CACHE_DIR, session=None):
+        self.root = root
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> entry dict (with "body" and parsed results in memory)
+        self._stats = self._load_stats()
+        self._unsaved = {}  # source -> counts not yet added to the stats file
+
+    def _key(self, url, params):
+        full_url = f"{url}?{urlencode(sorted((params or {}).items()))}" if params else url
+        return hashlib.sha1(full_url.encode()).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.root, f"{key}.json"), os.path.join(self.root, f"{key}.body")
+
+    def _load_stats(self):
+        try:
+            with open(os.path.join(self.root, STATS_FILE), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, path, data):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".http-")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def _entry(self, key):
+        """Return the cached entry of a key, loading it from disk on first use."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as file:
+                entry = json.load(file)
+            with open(body_path, "r", encoding="utf-8") as file:
+                entry["body"] = file.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        entry["parsed"] = {}
+        self._entries[key] = entry
+        return entry
+
+    def _save_entry(self, key, entry, body=True):
+        meta_path, body_path = self._paths(key)
+        if body:
+            self._write(body_path, entry["body"])
+        meta = {name: value for name, value in entry.items() if name not in ("body", "parsed")}
+        self._write(meta_path, json.dumps(meta))
+
+    def _count(self, source, **increments):
+        for counters in (self._stats, self._unsaved):
+            stats = counters.setdefault(source, dict.fromkeys(STAT_FIELDS, 0))
+            for name, value in increments.items():
+                stats[name] += value
+
+    def _save_stats(self):
+        """Add the counts since the last save to the stats file, which other processes update too."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, f"{STATS_FILE}.lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+            stats = self._load_stats()
+            for source, counts in self._unsaved.items():
+                saved = stats.setdefault(source, dict.fromkeys(STAT_FIELDS, 0))
+                for name, value in counts.items():
+                    saved[name] = saved.get(name, 0) + value
+            self._write(os.path.join(self.root, STATS_FILE), json.dumps(stats, indent=4))
+        self._stats = stats
+        self._unsaved = {}
+
+    def get(self, url, params=None, headers=None, freshness=DEFAULT_FRESHNESS, source=None, timeout=DEFAULT_TIMEOUT):
+        """
+        GET a URL through the cache.
+
+        Args:
+            url (str): The URL.
+            params (dict): Query parameters.
+            headers (dict): Request headers (validators are added).
+            freshness (int): Seconds a stored response is served without revalidation.
+            source (str): Name the savings are reported under (defaults to the host).
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            CachedResponse: Error responses are returned as-is and not cached.
+        """
+        source = source or urlparse(url).netloc
+        key = self._key(url, params)
+        with self._lock:
+            entry = self._entry(key)
+            if entry and time.time() - entry["fetched_at"] < freshness:
+                self._count(source, fresh_hits=1)
+                return CachedResponse(url, entry["body"], entry["status_code"], True, False)
+
+        request_headers = dict(headers or {})
+        if entry and entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+        response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        with self._lock:
+            self._count(source, requests=1)
+            if response.status_code == 304 and entry:
+                entry["fetched_at"] = time.time()
+                self._count(source, not_modified=1, bytes_saved=len(entry["body"].encode("utf-8")))
+                self._save_entry(key, entry, body=False)
+                self._save_stats()
+                return CachedResponse(url, entry["body"], entry["status_code"], True, True)
+
+            self._count(source, bytes_downloaded=len(response.content))
+            self._save_stats()
+            if response.status_code >= 400:
+                return CachedResponse(url, response.text, response.status_code, False, False)
+            entry = {
+                "url": url,
+                "status_code": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "body": response.text,
+                "parsed": {},
+            }
+            self._entries[key] = entry
+            self._save_entry(key, entry)
+            return CachedResponse(url, entry["body"], entry["status_code"], False, False)
+
+    def get_parsed(self, url, parse, **kwargs):
+        """
+        GET a URL and return parse(body text), reusing the last result while the body is unchanged.
+
+        parse should be a module-level function (results are keyed by it), e.g. json.loads. The
+        result is shared between callers and must be treated as read-only.
+
+        Raises:
+            requests.HTTPError: For error responses.
+        """
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        key = self._key(url, kwargs.get("params"))
+        with self._lock:
+            entry = self._entries.get(key)
+            parsed = entry["parsed"] if entry is not None and entry["body"] is response.text else None
+            if parsed is not None and parse in parsed:
+                return parsed[parse]
+        result = parse(response.text)
+        if parsed is not None:
+            with self._lock:
+                parsed[parse] = result
+        return result
+
+    def stats(self):
+        """Counters per source: requests, not_modified, fresh_hits, bytes_downloaded, bytes_saved."""
+        with self._lock:
+            return {source: dict(stats) for source, stats in self._stats.items()}
+
+
+def format_stats(stats):
+    """Format savings per source as a text table."""
+    lines = [f"{'source':<30}{'requests':>10}{'304s':>8}{'fresh':>8}{'downloaded':>14}{'saved':>14}"]
+    for source, counts in sorted(stats.items()):
+        lines.append(
+            f"{source:<30}{counts['requests']:>10}{counts['not_modified']:>8}{counts['fresh_hits']:>8}"
+            f"{counts['bytes_downloaded'] / 1024:>11.0f} KiB{counts['bytes_saved'] / 1024:>11.0f} KiB"
+        )
+    return "\n".join(lines)
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide ConditionalCache."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = ConditionalCache()
+        return _http_cache
+
+
+if __name__ == "__main__":
+    print(format_stats(get_http_cache().stats()))
@@ -0,0 +1,233 @@
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import deque
+
+from price_store import get_price_store
+from volatility import DEFAULT_EWMA_LAMBDA, PERIODS_PER_YEAR
+
+DEFAULT_WINDOW = 30  # Returns in the rolling mean and variance
+DEFAULT_MOMENTUM_WINDOW = 30  # Days of the momentum lookback
+INDICATORS_FILE = "data/indicators.json"
+
+
+class StreamingIndicators:
+    """
+    Online indicators of one asset, updated in O(1) per daily close.
+
+    Keeps an EWMA variance of log returns (same weighting as compute_volatility), a rolling
+    mean and variance over the last `window` returns (Welford's update, with the oldest
+    return removed through a ring buffer), the z-score of the latest return and momentum
+    over `momentum_window` closes. The state is a small dict (see to_dict) that can be persisted.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, momentum_window=DEFAULT_MOMENTUM_WINDOW, ewma_lambda=DEFAULT_EWMA_LAMBDA):
+        self.window = window
+        self.momentum_window = momentum_window
+        self.ewma_lambda = ewma_lambda
+        self.last_timestamp = None
+        self.last_price = None
+        self.last_return = None
+        self.returns = deque(maxlen=window)  # Ring buffer of the last `window` log returns
+        self.prices = deque(maxlen=momentum_window + 1)  # Ring buffer of the closes for momentum
+        self.count = 0  # Returns in the rolling window
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean (Welford)
+        self.ewma_sum = 0.0  # Weighted sum of squared returns
+        self.ewma_weight = 0.0  # Sum of weights, so early estimates are renormalized
+
+    def update(self, timestamp, price):
+        """
+        Add a close. Closes at or before the last one seen are ignored, so replays are harmless.
+
+        Returns:
+            bool: True if the close was applied.
+        """
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+        if not price or price <= 0 or math.isnan(price):
+            return False
+
+        self.prices.append(price)
+        if self.last_price is not None:
+            value = math.log(price / self.last_price)
+            self._add_return(value)
+            self.ewma_sum = self.ewma_lambda * self.ewma_sum + (1 - self.ewma_lambda) * value ** 2
+            self.ewma_weight = self.ewma_lambda * self.ewma_weight + (1 - self.ewma_lambda)
+            self.last_return = value
+        self.last_timestamp = timestamp
+        self.last_price = price
+        return True
+
+    def _add_return(self, value):
+        evicted = self.returns[0] if len(self.returns) == self.window else None
+        self.returns.append(value)
+        if evicted is None:
+            # Window not full yet: standard Welford step
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        else:
+            # Replace the oldest return with the new one
+            old_mean = self.mean
+            self.mean += (value - evicted) / self.count
+            self.m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+            self.m2 = max(self.m2, 0.0)  # Guard against rounding drift
+
+    @property
+    def variance(self):
+        """Sample variance of the returns in the rolling window (None with fewer than 2)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def volatility(self):
+        """Annualized standard deviation of the rolling window returns."""
+        variance = self.variance
+        return math.sqrt(variance * PERIODS_PER_YEAR) if variance is not None else None
+
+    @property
+    def ewma_volatility(self):
+        """Annualized EWMA volatility over the whole stream."""
+        return math.sqrt(self.ewma_sum / self.ewma_weight * PERIODS_PER_YEAR) if self.ewma_weight else None
+
+    @property
+    def zscore(self):
+        """How many rolling standard deviations the latest return is from the rolling mean."""
+        variance = self.variance
+        if not variance or self.last_return is None:
+            return None
+        return (self.last_return - self.mean) / math.sqrt(variance)
+
+    @property
+    def momentum(self):
+        """Return over the last `momentum_window` closes (None until enough closes are seen)."""
+        if len(self.prices) <= self.momentum_window:
+            return None
+        return self.prices[-1] / self.prices[0] - 1
+
+    def snapshot(self):
+        """Current indicator values."""
+        return {
+            "as_of": self.last_timestamp,
+            "price": self.last_price,
+            "volatility": self.volatility,
+            "ewma_volatility": self.ewma_volatility,
+            "mean_return": self.mean if self.count else None,
+            "zscore": self.zscore,
+            "momentum": self.momentum,
+        }
+
+    def to_dict(self):
+        return {
+            "window": self.window,
+            "momentum_window": self.momentum_window,
+            "ewma_lambda": self.ewma_lambda,
+            "last_timestamp": self.last_timestamp,
+            "last_price": self.last_price,
+            "last_return": self.last_return,
+            "returns": list(self.returns),
+            "prices": list(self.prices),
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "ewma_sum": self.ewma_sum,
+            "ewma_weight": self.ewma_weight,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        indicators = cls(state["window"], state["momentum_window"], state["ewma_lambda"])
+        for key in ("last_timestamp", "last_price", "last_return", "count", "mean", "m2", "ewma_sum", "ewma_weight"):
+            setattr(indicators, key, state[key])
+        indicators.returns.extend(state["returns"])
+        indicators.prices.extend(state["prices"])
+        return indicators
+
+
+class IndicatorStore:
+    """
+    Streaming indicators for every asset, fed from the local price store.
+
+    Registers as a listener of the price store, so every close appended by a refresh is applied
+    as it arrives; sync() catches up on closes stored while the process was not running. The
+    states are persisted to one JSON file.
+    """
+
+    def __init__(self, path=INDICATORS_FILE, price_store=None, window=DEFAULT_WINDOW, momentum_window=DEFAULT_MOMENTUM_WINDOW):
+        self.path = path
+        self.price_store = price_store or get_price_store()
+        self.window = window
+        self.momentum_window = momentum_window
+        self._lock = threading.Lock()
+        self._states = self._load()
+        self._dirty = False  # States changed since the last save
+        self.price_store.add_listener(self.on_closes)
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as file:
+                return {coin_id: StreamingIndicators.from_dict(state) for coin_id, state in json.load(file).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading indicator states, rebuilding them: {e}")
+            return {}
+
+    def save(self):
+        """Persist every indicator state atomically."""
+        with self._lock:
+            states = {coin_id: indicators.to_dict() for coin_id, indicators in self._states.items()}
+            self._dirty = False
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".indicators-", suffix=".json")
+        with os.fdopen(fd, "w") as file:
+            json.dump(states, file)
+        os.replace(tmp_path, self.path)
+
+    def _indicators(self, coin_id):
+        if coin_id not in self._states:
+            self._states[coin_id] = StreamingIndicators(self.window, self.momentum_window)
+        return self._states[coin_id]
+
+    def on_closes(self, coin_id, records):
+        """Apply new PRICE_DTYPE records of an asset (price store listener). Returns the number applied."""
+        with self._lock:
+            indicators = self._indicators(coin_id)
+            applied = sum(indicators.update(int(record["t"]), float(record["p"])) for record in records)
+            self._dirty = self._dirty or applied > 0
+            return applied
+
+    def sync(self, coin_id):
+        """Apply stored closes newer than the asset's state (only the missing tail is read)."""
+        records = self.price_store.history(coin_id)
+        with self._lock:
+            last = self._indicators(coin_id).last_timestamp
+        if last is not None:
+            records = records[records["t"].searchsorted(last, side="right"):]
+        return self.on_closes(coin_id, records) if len(records) else 0
+
+    def get(self, coin_id):
+        """Return the current indicator values of an asset, catching up on stored closes first."""
+        self.sync(coin_id)
+        if self._dirty:
+            self.save()
+        with self._lock:
+            indicators = self._states.get(coin_id)
+            return indicators.snapshot() if indicators and indicators.last_timestamp is not None else None
+
+
+_indicator_store = None
+_indicator_store_lock = threading.Lock()
+
+
+def get_indicator_store():
+    """Return the process-wide IndicatorStore, listening to the process-wide price store."""
+    global _indicator_store
+    with _indicator_store_lock:
+        if _indicator_store is None:
+            _indicator_store = IndicatorStore()
+        return _indicator_store
@@ -0,0 +1,176 @@
+import threading
+import time
+
+import numpy as np
+import requests
+
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+MARKETS_PER_PAGE = 250  # Largest page the endpoint serves
+DEFAULT_MARKET_PAGES = 4  # Top 1000 assets by market cap
+LIQUIDITY_TTL = 3600
+MIN_LIQUIDITY = 0.1
+MAX_LIQUIDITY = 1.0
+
+# Weights of each component of the liquidity score. CoinGecko's markets endpoint has no order
+# book depth, so turnover (daily volume / market cap) stands in for how easily size trades.
+LIQUIDITY_COMPONENT_WEIGHTS = {
+    "volume": 0.5,  # Percentile of 24h trading volume across the universe
+    "market_cap": 0.3,  # Percentile of market cap across the universe
+    "turnover": 0.2,  # Daily volume / market cap, capped at TURNOVER_CAP
+}
+TURNOVER_CAP = 0.25
+
+
+def fetch_markets_page(page, per_page=MARKETS_PER_PAGE):
+    """Fetch one page of assets ordered by market cap from CoinGecko."""
+    params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": per_page, "page": page}
+    response = requests.get(COINGECKO_MARKETS_URL, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def _percentiles(values):
+    """Percentile rank (0-1) of each finite value among the finite values; NaN stays NaN."""
+    ranks = np.full(len(values), np.nan)
+    finite = np.flatnonzero(np.isfinite(values))
+    if len(finite) == 1:
+        ranks[finite] = 1.0
+    elif len(finite):
+        order = finite[np.argsort(values[finite], kind="stable")]
+        ranks[order] = np.arange(len(finite)) / (len(finite) - 1)
+    return ranks
+
+
+def liquidity_scores(volumes, market_caps):
+    """
+    Score the liquidity of every asset in one vectorized pass.
+
+    Args:
+        volumes (array-like): 24h trading volume in USD per asset.
+        market_caps (array-like): Market cap in USD per asset.
+
+    Returns:
+        np.ndarray: Scores from MIN_LIQUIDITY to MAX_LIQUIDITY; NaN for assets without volume or market cap.
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    market_caps = np.asarray(market_caps, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        known = (volumes > 0) & (market_caps > 0)
+        volume_rank = _percentiles(np.where(known, np.log(volumes), np.nan))
+        market_cap_rank = _percentiles(np.where(known, np.log(market_caps), np.nan))
+        turnover = np.minimum(volumes / market_caps / TURNOVER_CAP, 1.0)
+    combined = (
+        LIQUIDITY_COMPONENT_WEIGHTS["volume"] * volume_rank +
+        LIQUIDITY_COMPONENT_WEIGHTS["market_cap"] * market_cap_rank +
+        LIQUIDITY_COMPONENT_WEIGHTS["turnover"] * turnover
+    )
+    return np.where(known, MIN_LIQUIDITY + (MAX_LIQUIDITY - MIN_LIQUIDITY) * combined, np.nan)
+
+
+class LiquidityIndex:
+    """
+    Liquidity scores for the top assets by market cap, refreshed at most once per TTL.
+
+    A refresh pages through coins/markets (MARKETS_PER_PAGE assets per request) and scores the
+    whole universe at once, so every asset costs a fraction of a request. Failed refreshes keep
+    the previous scores and are not retried until the TTL passes.
+
+    With background=True a due refresh runs on a daemon thread and get() answers from the
+    previous scores meanwhile (None before the first refresh has finished), so callers never
+    wait on the paged fetch.
+    """
+
+    def __init__(self, fetch_page=fetch_markets_page, pages=DEFAULT_MARKET_PAGES, ttl=LIQUIDITY_TTL, background=False):
+        self.fetch_page = fetch_page
+        self.pages = pages
+        self.ttl = ttl
+        self.background = background
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._scores = {}  # coin id -> score
+        self._attempted_at = 0.0
+        self.as_of = None  # Time of the last successful refresh
+
+    def refresh(self):
+        """
+        Fetch the markets and recompute every score.
+
+        Returns:
+            int: The number of assets scored.
+        """
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        self._attempted_at = time.time()
+        markets = []
+        try:
+            for page in range(1, self.pages + 1):
+                rows = self.fetch_page(page)
+                markets.extend(rows)
+                if len(rows) < MARKETS_PER_PAGE:
+                    break
+        except Exception as e:
+            print(f"Error fetching market data for liquidity scores: {e}")
+            if len(self):
+                return 0  # Keep the previous full universe rather than rescore a partial one
+        if not markets:
+            return 0
+
+        volumes = [market.get("total_volume") or np.nan for market in markets]
+        market_caps = [market.get("market_cap") or np.nan for market in markets]
+        scores = liquidity_scores(volumes, market_caps)
+        fresh = {
+            market["id"]: round(float(score), 2)
+            for market, score in zip(markets, scores) if not np.isnan(score)
+        }
+        with self._lock:
+            self._scores = fresh
+            self.as_of = self._attempted_at
+        return len(fresh)
+
+    def warm(self):
+        """Start a refresh if one is due (on a background thread when background=True)."""
+        # Only one caller refreshes; the others keep reading the previous scores meanwhile
+        if time.time() - self._attempted_at > self.ttl and self._refresh_lock.acquire(blocking=False):
+            if self.background:
+                threading.Thread(target=self._refresh_if_due, daemon=True).start()
+            else:
+                self._refresh_if_due()
+
+    def wait(self):
+        """Block until a refresh in progress has finished."""
+        with self._refresh_lock:
+            pass
+
+    def _refresh_if_due(self):
+        """Refresh if still due; the caller holds _refresh_lock, which is released here."""
+        try:
+            if time.time() - self._attempted_at > self.ttl:
+                self._refresh_locked()
+        finally:
+            self._refresh_lock.release()
+
+    def get(self, coin_id):
+        """Return the liquidity score of an asset (CoinGecko id), or None if it is not in the universe."""
+        self.warm()
+        with self._lock:
+            return self._scores.get(coin_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._scores)
+
+
+_liquidity_index = None
+_liquidity_index_lock = threading.Lock()
+
+
+def get_liquidity_index():
+    """Return the process-wide LiquidityIndex, refreshed in the background."""
+    global _liquidity_index
+    with _liquidity_index_lock:
+        if _liquidity_index is None:
+            _liquidity_index = LiquidityIndex(background=True)
+            _liquidity_index.warm()
+        return _liquidity_index
@@ -0,0 +1,129 @@
+import functools
+import re
+
+import numpy as np
+
+DEFAULT_PRICE_RATIOS = (0.25, 0.5, 0.75, 0.9, 1.1, 1.25, 1.5, 2.0, 4.0)  # Price at exit / price at entry
+DEFAULT_HORIZONS_DAYS = (30, 90, 365)
+DEFAULT_FEE_APR = 0.15  # Fee APR of a full-range position
+DEFAULT_CONCENTRATED_RANGE = (0.8, 1.25)  # Price range of a concentrated position, relative to entry
+
+LIQUIDITY_STRATEGY_PATTERN = re.compile(r"liquidity pool|provid\w* liquidity|\blp\b|\bamm\b", re.IGNORECASE)
+CONCENTRATED_PATTERN = re.compile(r"concentrated|\bv3\b|\bclmm\b|price range", re.IGNORECASE)
+
+
+def _range_bounds(lower, upper):
+    """Square roots of the range bounds; None means full range (0 to infinity)."""
+    sqrt_lower = np.sqrt(lower) if lower is not None else 0.0
+    sqrt_upper = np.sqrt(upper) if upper is not None else np.inf
+    if not sqrt_lower < 1 < sqrt_upper:
+        raise ValueError("The price range must contain the entry price (lower < 1 < upper).")
+    return sqrt_lower, sqrt_upper
+
+
+def capital_efficiency(lower=None, upper=None):
+    """Liquidity per unit of capital relative to a full-range position (1 for full range)."""
+    sqrt_lower, sqrt_upper = _range_bounds(lower, upper)
+    return 2 / (2 - sqrt_lower - 1 / sqrt_upper)
+
+
+def position_value(price_ratios, lower=None, upper=None):
+    """
+    Value of a liquidity position against a stablecoin, relative to the capital deposited.
+
+    Uses the constant-product (Uniswap v2) curve for a full-range position and the
+    concentrated-liquidity (Uniswap v3) curve when a price range is given.
+
+    Args:
+        price_ratios (array-like): Price at exit divided by the price at entry.
+        lower (float): Lower bound of the price range, relative to entry (None for full range).
+        upper (float): Upper bound of the price range, relative to entry (None for full range).
+
+    Returns:
+        tuple: (position value, value of holding the deposited tokens instead), same shape as price_ratios.
+    """
+    price_ratios = np.asarray(price_ratios, dtype=float)
+    sqrt_lower, sqrt_upper = _range_bounds(lower, upper)
+    liquidity = 1 / (2 - sqrt_lower - 1 / sqrt_upper)  # Normalizes the value at entry to 1
+    # Outside the range the position is all one token: the clipped price fixes its composition
+    sqrt_price = np.clip(np.sqrt(price_ratios), sqrt_lower, sqrt_upper)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tokens = liquidity * (1 / sqrt_price - 1 / sqrt_upper)
+        stables = liquidity * (sqrt_price - sqrt_lower)
+    value = price_ratios * np.nan_to_num(tokens, posinf=0.0) + np.nan_to_num(stables, posinf=0.0)
+    hold = price_ratios * liquidity * (1 - 1 / sqrt_upper) + liquidity * (1 - sqrt_lower)
+    return value, hold
+
+
+def impermanent_loss(price_ratios, lower=None, upper=None):
+    """Loss of a liquidity position versus holding, before fees (negative values are losses)."""
+    value, hold = position_value(price_ratios, lower, upper)
+    return value / hold - 1
+
+
+def lp_returns(price_ratios=DEFAULT_PRICE_RATIOS, horizons_days=DEFAULT_HORIZONS_DAYS, fee_apr=DEFAULT_FEE_APR,
+               lower=None, upper=None):
+    """
+    Impermanent loss and fee income over a grid of price ratios and horizons, in one vectorized call.
+
+    Fees accrue (without compounding) at fee_apr scaled by the capital efficiency of the range,
+    and only when the exit price is inside the range; the price path is not modelled.
+
+    Returns:
+        dict: Arrays indexed by [price ratio] or [price ratio, horizon]:
+            - "impermanent_loss": loss versus holding before fees
+            - "fee_return": fee income relative to the capital deposited
+            - "net_vs_hold": return versus holding after fees
+            - "breakeven_fee_apr": fee APR needed to match holding (inf when out of range)
+    """
+    price_ratios = np.asarray(price_ratios, dtype=float)
+    years = np.asarray(horizons_days, dtype=float) / 365
+    value, hold = position_value(price_ratios, lower, upper)
+    in_range = (price_ratios >= (lower or 0.0)) & (price_ratios <= (upper or np.inf))
+    fee_rate = capital_efficiency(lower, upper) * in_range[:, None] * years[None, :]
+    fee_return = fee_apr * fee_rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        breakeven = np.where(fee_rate > 0, np.maximum(hold - value, 0)[:, None] / fee_rate, np.inf)
+    return {
+        "price_ratios": price_ratios,
+        "horizons_days": np.asarray(horizons_days),
+        "impermanent_loss": value / hold - 1,
+        "fee_return": fee_return,
+        "net_vs_hold": (value[:, None] + fee_return) / hold[:, None] - 1,
+        "breakeven_fee_apr": breakeven,
+    }
+
+
+def is_liquidity_strategy(strategy):
+    """Return True if a strategy text involves providing liquidity."""
+    return bool(LIQUIDITY_STRATEGY_PATTERN.search(strategy))
+
+
+@functools.lru_cache(maxsize=8)
+def impermanent_loss_table(concentrated=False, fee_apr=DEFAULT_FEE_APR):
+    """Display rows of impermanent loss and net return versus holding for each price move and horizon."""
+    lower, upper = DEFAULT_CONCENTRATED_RANGE if concentrated else (None, None)
+    grid = lp_returns(fee_apr=fee_apr, lower=lower, upper=upper)
+    rows = []
+    for i, ratio in enumerate(grid["price_ratios"]):
+        row = {"Price Move": f"{ratio - 1:+.0%}", "Impermanent Loss": f"{grid['impermanent_loss'][i]:.2%}"}
+        for j, days in enumerate(grid["horizons_days"]):
+            row[f"Net vs Hold ({days}d)"] = f"{grid['net_vs_hold'][i, j]:+.2%}"
+        rows.append(row)
+    return tuple(rows)
+
+
+def strategy_price_range(strategy):
+    """
+    Price range (lower, upper) relative to entry assumed for a liquidity strategy, or None for full range.
+
+    Strategies mentioning concentrated liquidity use DEFAULT_CONCENTRATED_RANGE.
+    """
+    return DEFAULT_CONCENTRATED_RANGE if CONCENTRATED_PATTERN.search(strategy) else None
+
+
+def strategy_impermanent_loss(strategy, fee_apr=DEFAULT_FEE_APR):
+    """Impermanent loss rows for a liquidity strategy over its strategy_price_range, or None for other strategies."""
+    if not is_liquidity_strategy(strategy):
+        return None
+    return list(impermanent_loss_table(strategy_price_range(strategy) is not None, fee_apr))
@@ -1,6 +1,4 @@
 import os
-import requests
-from bs4 import BeautifulSoup
 from openai import OpenAI
 from dotenv import load_dotenv
 import csv
@@ -8,13 +6,20 @@ from fpdf import FPDF
 import json
 import datetime
 import re
+from price_store import get_price_store
+from risk import attach_risk, get_liquidity as get_asset_liquidity
+from taxonomy import smart_contract_risk
+from market_data import ALTCOIN_SEASON_URL, FEAR_GREED_URL, VIX_URL, get_market_data
+from volatility import compute_volatility
 
 class CryptoFinanceAgent:
     def __init__(self):
         load_dotenv()
-        self.fear_greed_url = "https://api.alternative.me/fng/"
-        self.vix_url = "https://finance.yahoo.com/quote/%5EVIX/"
-        self.altcoin_season_url = "https://www.blockchaincenter.net/en/altcoin-season-index/"
+        self.fear_greed_url = FEAR_GREED_URL
+        self.vix_url = VIX_URL
+        self.altcoin_season_url = ALTCOIN_SEASON_URL
+        # Cached market data shared with the Streamlit app (sentiment.py)
+        self.market_data = get_market_data()
         self.client = OpenAI(api_key=os.getenv("DEEPSEEK_API_KEY"), base_url="https://api.deepseek.com")
         self.community_file = "community/community_strategies.json"
         self.community_strategies = self.load_community_strategies()
@@ -22,15 +27,12 @@ class CryptoFinanceAgent:
     def get_fear_and_greed_index(self):
         """Fetch Crypto Fear & Greed Index."""
         try:
-            response = requests.get(self.fear_greed_url)
-            data = response.json()
-            if response.status_code == 200:
-                latest_data = data['data'][0]
-                return {
-                    'value': int(latest_data['value']),
-                    'classification': latest_data['value_classification']
-                }
-            return None
+            fear_and_greed = self.market_data.fear_and_greed()
+            return {
+                'value': fear_and_greed['value'],
+                'classification': fear_and_greed['classification'],
+                'stale': fear_and_greed['stale']
+            }
         except Exception as e:
             print(f"Error fetching Fear & Greed Index: {e}")
             return None
@@ -38,25 +40,13 @@ class CryptoFinanceAgent:
     def get_vix_index(self):
         """Fetch CBOE Volatility Index (VIX) from Yahoo Finance."""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-            }
-            response = requests.get(self.vix_url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract VIX value
-            vix_value = float(soup.find('fin-streamer', {'data-field': 'regularMarketPrice'}).text)
-            
-            # Extract change and percent change
-            change = float(soup.find('fin-streamer', {'data-field': 'regularMarketChange'}).text)
-            change_percent = float(soup.find('fin-streamer', {'data-field': 'regularMarketChangePercent'}).text.strip('()%'))
-            
+            vix = self.market_data.vix()
             return {
-                'value': vix_value,
-                'change': change,
-                'change_percent': change_percent,
-                'analysis': self.get_vix_analysis(vix_value)
+                'value': vix['value'],
+                'change': vix['change'],
+                'change_percent': vix['change_percent'],
+                'analysis': self.get_vix_analysis(vix['value']),
+                'stale': vix['stale']
             }
         except Exception as e:
             print(f"Error fetching VIX Index: {e}")
@@ -65,29 +55,18 @@ class CryptoFinanceAgent:
     def get_altcoin_season_index(self):
         """Fetch Altcoin Season Index from BlockchainCenter and determine season."""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-            }
-            response = requests.get(self.altcoin_season_url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the Altcoin Season Index value using its unique style attributes
-            index_div = soup.find('div', style="font-size:88px;  color:#345C99;position:relative;top:56px;left:calc(47% - 46px)")
-            if index_div:
-                index_value = int(index_div.text.strip())
-                # Determine season based on index value
-                if index_value > 75:
-                    season_message = "Altcoin Season"
-                else:
-                    season_message = "Bitcoin Season"
-                return {
-                    'value': index_value,
-                    'season': season_message
-                }
+            altcoin_season = self.market_data.altcoin_season()
+            index_value = altcoin_season['value']
+            # Determine season based on index value
+            if index_value > 75:
+                season_message = "Altcoin Season"
             else:
-                print("Altcoin Season Index value not found on the page.")
-                return None
+                season_message = "Bitcoin Season"
+            return {
+                'value': index_value,
+                'season': season_message,
+                'stale': altcoin_season['stale']
+            }
         except Exception as e:
             print(f"Error fetching Altcoin Season Index: {e}")
             return None
@@ -138,10 +117,10 @@ class CryptoFinanceAgent:
         crypto_id = crypto_id_map.get(crypto, crypto.lower())
 
         try:
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={crypto_id}&vs_currencies=usd"
-            response = requests.get(url)
-            data = response.json()
-            return data[crypto_id]["usd"]
+            price = self.market_data.price(crypto_id)
+            if price is None:
+                print(f"Error fetching price for {crypto}: not listed on CoinGecko")
+            return price
         except Exception as e:
             print(f"Error fetching price for {crypto}: {e}")
             return None
@@ -292,11 +271,11 @@ class CryptoFinanceAgent:
             print("This strategy already exists in the community.")
             return
 
-        self.community_strategies.append({
+        self.community_strategies.append(attach_risk({
             "crypto": crypto,
             "strategy": strategy,
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
+        }))
         self.save_community_strategies()
         print("Your strategy has been shared with the community!")
 
@@ -306,15 +285,24 @@ class CryptoFinanceAgent:
             print("No strategies have been shared yet.")
             return
 
+        # Score entries shared before risk was stored with them, so every row uses the 0-10 scale
+        unscored = [strategy for strategy in self.community_strategies if not strategy.get("risk")]
+        for strategy in unscored:
+            attach_risk(strategy)
+        if unscored:
+            self.save_community_strategies()
+
         print("\n=== Community Strategies ===")
         for i, strategy in enumerate(self.community_strategies, 1):
             print(f"\nStrategy #{i}")
             print(f"Cryptocurrency: {strategy['crypto']}")
-            print(f"Timestamp: {strategy['timestamp']}")
+            print(f"Timestamp: {strategy.get('timestamp', strategy.get('date_added'))}")
             print(f"Strategy:\n{strategy['strategy']}")
-            # Analyze and display risks for the strategy
-            risk_analysis = self.analyze_strategy_risks(strategy["crypto"], strategy["strategy"])
-            print(f"\n{risk_analysis}")
+            risk = strategy["risk"]
+            print(f"\nOverall Risk Score: {risk['overall']:.1f}/10")
+            if risk["inputs_as_of"]:
+                print(f"Inputs as of: {risk['inputs_as_of']}")
+            print(self.explain_risk_score(strategy["crypto"], risk["overall"]))
         print("=" * 30 + "\n")
 
     def run(self):
@@ -415,11 +403,8 @@ class CryptoFinanceAgent:
         crypto_id = crypto_id_map.get(crypto, crypto.lower())
 
         try:
-            # Fetch historical price data for the last 30 days
-            url = f"https://api.coingecko.com/api/v3/coins/{crypto_id}/market_chart?vs_currency=usd&days=30"
-            response = requests.get(url)
-            data = response.json()
-            prices = [price[1] for price in data["prices"]]  # Extract prices
+            # Read the last 30 days from the local price store (only missing days are fetched)
+            prices = get_price_store().fetch_history(crypto_id, 30)[:, 1]  # Extract prices
             return self.calculate_volatility(prices)
         except Exception as e:
             print(f"Error fetching volatility for {crypto}: {e}")
@@ -427,32 +412,23 @@ class CryptoFinanceAgent:
 
     def calculate_volatility(self, prices):
         """Calculate volatility based on historical prices."""
-        import numpy as np
-        price_changes = np.diff(prices) / prices[:-1]  # Calculate daily price changes
-        return np.std(price_changes)  # Standard deviation of price changes
+        # Standard deviation of daily price changes, from the vectorized volatility engine
+        return float(compute_volatility(prices)["daily"][0])
 
     def get_liquidity(self, crypto):
-        """Fetch liquidity data for a cryptocurrency (example implementation)."""
-        # Example: Fetch liquidity from an API or use predefined values
-        liquidity_map = {
-            "BTC": 0.9,
-            "Ethereum": 0.8,
-            "Solana": 0.7,
-            "Sui": 0.6,
-            # Add more mappings as needed
+        """Fetch liquidity data for a cryptocurrency from CoinGecko market data (0.1 low to 1.0 high)."""
+        crypto_id_map = {
+            "BTC": "bitcoin",
+            "Ethereum": "ethereum",
+            "Solana": "solana",
+            "Sui": "sui",
         }
-        return liquidity_map.get(crypto, 0.5)  # Default to 0.5 if not found
+        # Scored from volume and market cap across the top assets, with static values as fallback
+        return get_asset_liquidity(crypto_id_map.get(crypto, crypto.lower()))
 
     def get_smart_contract_risk(self, strategy):
-        """Estimate smart contract risk for a strategy (example implementation)."""
-        # Example: Assign risk based on the strategy type
-        if "lending" in strategy.lower():
-            return 0.3  # Lower risk for lending
-        elif "liquidity pool" in strategy.lower():
-            return 0.5  # Medium risk for liquidity pools
-        elif "leveraging" in strategy.lower():
-            return 0.7  # Higher risk for leveraging
-        return 0.5  # Default to medium risk
+        """Estimate smart contract risk for a strategy from the protocols, chains and actions it mentions."""
+        return smart_contract_risk(strategy)
 
     def export_strategy(self, crypto, strategy, file_format):
         """Export the strategy to a PDF or CSV file."""
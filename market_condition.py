@@ -0,0 +1,124 @@
+import json
+
+import numpy as np
+
+# Order of the indicator columns in feature matrices
+INDICATORS = ["santiment", "fear_and_greed", "tradfi", "reddit"]
+
+# Weights of each data source in the overall score
+MARKET_CONDITION_WEIGHTS = {
+    "santiment": 0.3,
+    "fear_and_greed": 0.3,
+    "tradfi": 0.1,
+    "reddit": 0.3
+}
+
+# Divisors that bring each raw indicator to the scale of the score
+INDICATOR_SCALES = {
+    "santiment": 10000,  # Daily active addresses, scaled down
+    "fear_and_greed": 100,  # Fear & Greed Index (0-100)
+    "tradfi": 100,  # VIX
+    "reddit": 1,  # Reddit sentiment polarity, used directly
+}
+
+# Scores above "bullish" are bullish, below "bearish" are bearish, neutral in between
+MARKET_CONDITION_THRESHOLDS = {
+    "bullish": 0.6,
+    "bearish": 0.4
+}
+
+# Tuned weights and thresholds written by optimizer.py
+MARKET_CONDITION_CONFIG = "config/market_condition.json"
+
+# Labels of the regime codes returned by classify_scores
+REGIMES = {1: "bullish", 0: "neutral", -1: "bearish"}
+
+
+def normalize_indicators(santiment, fear_and_greed, tradfi, reddit):
+    """
+    Normalize raw indicator values into a feature matrix.
+
+    Accepts scalars or arrays. Missing values (None or NaN) stay NaN and are left out of the
+    weighting by weighted_scores.
+
+    Returns:
+        np.ndarray: Shape (observations, 4), columns in INDICATORS order.
+    """
+    def column(values, scale):
+        values = np.atleast_1d(np.asarray(values, dtype=float) if values is not None else np.nan)
+        return values / scale
+
+    raw = dict(zip(INDICATORS, (santiment, fear_and_greed, tradfi, reddit)))
+    columns = np.broadcast_arrays(*(column(raw[name], INDICATOR_SCALES[name]) for name in INDICATORS))
+    return np.column_stack(columns)
+
+
+def weighted_scores(features, weights):
+    """
+    Weighted scores with the weights renormalized over the indicators available in each row.
+
+    A missing indicator does not pull the score toward 0 (bearish); its weight is spread over the
+    others. Rows without any available indicator score NaN, which classifies as neutral.
+
+    Args:
+        features (np.ndarray): Shape (observations, 4), NaN for missing values.
+        weights (np.ndarray): Shape (4,) for one configuration or (configs, 4).
+
+    Returns:
+        np.ndarray: Shape (observations,) or (observations, configs).
+    """
+    features = np.asarray(features, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    available = ~np.isnan(features)
+    totals = np.where(available, features, 0.0) @ weights.T
+    weight_sums = available.astype(float) @ weights.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weight_sums > 0, totals / weight_sums, np.nan)
+
+
+def weight_vector(weights=None):
+    """Return a weights dict as an array in INDICATORS order."""
+    weights = weights or MARKET_CONDITION_WEIGHTS
+    return np.array([weights[name] for name in INDICATORS], dtype=float)
+
+
+def classify_scores(scores, thresholds=None):
+    """Map scores (scalar or array) to regime codes: 1 bullish, 0 neutral, -1 bearish."""
+    thresholds = thresholds or MARKET_CONDITION_THRESHOLDS
+    scores = np.asarray(scores, dtype=float)
+    return (scores > thresholds["bullish"]).astype(np.int8) - (scores < thresholds["bearish"]).astype(np.int8)
+
+
+def score_market_condition(santiment, fear_and_greed, tradfi, reddit, weights=None, thresholds=None):
+    """
+    Score a single set of indicator values.
+
+    Missing values (None or NaN) are left out and the weights renormalized over the rest; with no
+    values at all the score is NaN and the condition neutral.
+
+    Returns:
+        tuple: (overall score, "bullish", "bearish" or "neutral").
+    """
+    features = normalize_indicators(santiment, fear_and_greed, tradfi, reddit)
+    score = float(weighted_scores(features, weight_vector(weights))[0])
+    return score, REGIMES[int(classify_scores(score, thresholds))]
+
+
+def load_market_condition_config(path=MARKET_CONDITION_CONFIG):
+    """
+    Load tuned weights and thresholds (written by optimizer.py).
+
+    Returns:
+        tuple: (weights dict, thresholds dict); the defaults when the file is missing or invalid.
+    """
+    try:
+        with open(path, "r") as file:
+            config = json.load(file)
+        weights = {name: float(config["weights"][name]) for name in INDICATORS}
+        thresholds = {name: float(config["thresholds"][name]) for name in MARKET_CONDITION_THRESHOLDS}
+        return weights, thresholds
+    except FileNotFoundError:
+        return dict(MARKET_CONDITION_WEIGHTS), dict(MARKET_CONDITION_THRESHOLDS)
+    except Exception as e:
+        print(f"Error loading market condition config, using the defaults: {e}")
+        return dict(MARKET_CONDITION_WEIGHTS), dict(MARKET_CONDITION_THRESHOLDS)
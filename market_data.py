@@ -0,0 +1,127 @@
+import json
+import threading
+
+from health import get_health_registry
+from http_cache import get_http_cache
+from parsers import extract_altcoin_season_index, extract_vix
+from snapshot import get_snapshot_reader
+
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
+VIX_URL = "https://finance.yahoo.com/quote/%5EVIX/"
+ALTCOIN_SEASON_URL = "https://www.blockchaincenter.net/en/altcoin-season-index/"
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+REQUEST_TIMEOUT = 10  # Seconds before a data source request is given up
+PRICE_FRESHNESS = 60  # Seconds a price is served from the HTTP cache without a request
+USER_AGENT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+}
+
+
+class MarketData:
+    """
+    Market data shared by the Streamlit app (Sentiment) and the CLI agent (CryptoFinanceAgent).
+
+    The fetch_* methods go to the sources through one transport, the conditional HTTP cache, with
+    the shared parsers; they are what the indicator registry and the collector call. The other
+    methods are what the front ends call: they read the collector's snapshot when one is running
+    and otherwise fetch through the source's circuit breaker, so repeated analyses are served
+    from the cache and an outage costs a dict lookup rather than a timeout.
+    """
+
+    def __init__(self, http_cache=None, health_registry=None, snapshot_reader=None):
+        self.http_cache = http_cache or get_http_cache()
+        self.health_registry = health_registry or get_health_registry()
+        self.snapshot_reader = snapshot_reader or get_snapshot_reader()
+
+    def fetch_fear_and_greed(self):
+        """Latest Fear & Greed Index record: {"value", "value_classification", "timestamp"}."""
+        data = self.http_cache.get_parsed(
+            FEAR_GREED_URL, json.loads, headers=USER_AGENT_HEADERS, source="alternative.me", timeout=REQUEST_TIMEOUT
+        )
+        if "data" not in data or not data["data"]:
+            raise ValueError("No Fear & Greed Index data found in response")
+        return data["data"][0]
+
+    def fetch_vix(self):
+        """Latest VIX quote: {"value", "change", "change_percent"}."""
+        return self.http_cache.get_parsed(
+            VIX_URL, extract_vix, headers=USER_AGENT_HEADERS, source="finance.yahoo.com", timeout=REQUEST_TIMEOUT
+        )
+
+    def fetch_altcoin_season(self):
+        """Latest Altcoin Season Index value (0-100)."""
+        return self.http_cache.get_parsed(
+            ALTCOIN_SEASON_URL, extract_altcoin_season_index, headers=USER_AGENT_HEADERS,
+            source="blockchaincenter.net", timeout=REQUEST_TIMEOUT,
+        )
+
+    def fetch_prices(self, coin_ids):
+        """USD prices of several assets (CoinGecko ids) in one request."""
+        params = {"ids": ",".join(sorted(coin_ids)), "vs_currencies": "usd"}
+        quotes = self.http_cache.get_parsed(
+            COINGECKO_PRICE_URL, json.loads, params=params, freshness=PRICE_FRESHNESS,
+            source="api.coingecko.com", timeout=REQUEST_TIMEOUT,
+        )
+        return {coin_id: quote["usd"] for coin_id, quote in quotes.items() if "usd" in quote}
+
+    def collected(self, name, fetch, asset=None):
+        """
+        An indicator's raw value from the collector's snapshot, or else fetched through the circuit
+        breaker of its source (the breaker the indicator registry uses too).
+
+        Returns:
+            tuple: (raw value, stale flag).
+
+        Raises:
+            health.SourceUnavailable: If it is neither collected nor available from the source.
+        """
+        collected = self.snapshot_reader.indicator(name, asset)
+        if collected is not None:
+            return collected["raw"], collected["stale"]
+        reading = self.health_registry.call("/".join(filter(None, (name, asset))), fetch)
+        return reading.value, reading.stale
+
+    def fear_and_greed(self):
+        """Fear & Greed Index as {"value", "classification", "timestamp", "stale"}."""
+        record, stale = self.collected("fear_and_greed", self.fetch_fear_and_greed)
+        return {
+            "value": int(record["value"]),
+            "classification": record["value_classification"],
+            "timestamp": int(record["timestamp"]),
+            "stale": stale,
+        }
+
+    def vix(self):
+        """VIX as {"value", "change", "change_percent", "stale"}."""
+        quote, stale = self.collected("tradfi", self.fetch_vix)
+        return dict(quote, stale=stale)
+
+    def altcoin_season(self):
+        """Altcoin Season Index as {"value", "stale"}."""
+        value, stale = self.collected("altcoin_season", self.fetch_altcoin_season)
+        return {"value": value, "stale": stale}
+
+    def price(self, coin_id):
+        """
+        USD price of an asset (CoinGecko id), or None if CoinGecko does not list it.
+
+        Raises:
+            health.SourceUnavailable: If CoinGecko is unavailable.
+        """
+        collected = self.snapshot_reader.price(coin_id)
+        if collected is not None:
+            return collected
+        return self.health_registry.call(f"price/{coin_id}", self.fetch_prices, [coin_id]).value.get(coin_id)
+
+
+_market_data = None
+_market_data_lock = threading.Lock()
+
+
+def get_market_data():
+    """Return the process-wide MarketData."""
+    global _market_data
+    with _market_data_lock:
+        if _market_data is None:
+            _market_data = MarketData()
+        return _market_data
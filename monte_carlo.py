@@ -0,0 +1,170 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from liquidity_pool import position_value
+from price_store import get_price_store
+from volatility import PERIODS_PER_YEAR, compute_volatility
+
+DEFAULT_PATHS = 10000
+DEFAULT_HORIZON_DAYS = 365
+DEFAULT_CHUNK_PATHS = 2500  # Paths simulated per chunk (and per worker task)
+VOLATILITY_LOOKBACK_DAYS = 90
+DEFAULT_ANNUAL_VOLATILITY = 0.8  # Used when an asset has no price history
+VAR_CONFIDENCE = 0.95
+
+# Strategy mechanics by strategy type (see risk.classify_strategy_type). Rates are annual.
+#   apy: yield earned on the asset held (staking or lending supply rate)
+#   leverage: collateral value / equity; the difference is borrowed in stablecoins
+#   borrow_apr: interest on the borrowed stablecoins
+#   liquidation_threshold: loan-to-value at which the position is liquidated
+#   liquidation_penalty: share of the collateral lost on liquidation
+#   fee_apr: trading fees of a 50/50 pool against a stablecoin
+STRATEGY_MECHANICS = {
+    "leveraging": {"apy": 0.03, "leverage": 2.0, "borrow_apr": 0.06, "liquidation_threshold": 0.825, "liquidation_penalty": 0.05},
+    "liquidity pool": {"fee_apr": 0.15},
+    "lending": {"apy": 0.03},
+    "general": {"apy": 0.04},  # Staking
+}
+
+
+def annual_volatility(coin_id, store=None):
+    """Annualized EWMA volatility of an asset from the local price store."""
+    store = store or get_price_store()
+    try:
+        history = store.fetch_history(coin_id, VOLATILITY_LOOKBACK_DAYS)
+        volatility = float(compute_volatility(history[:, 1])["ewma"][0])
+    except Exception as e:
+        print(f"Error computing volatility for {coin_id}, using the default: {e}")
+        return DEFAULT_ANNUAL_VOLATILITY
+    return volatility if np.isfinite(volatility) else DEFAULT_ANNUAL_VOLATILITY
+
+
+def simulate_price_paths(volatility, days=DEFAULT_HORIZON_DAYS, paths=DEFAULT_PATHS, drift=0.0, rng=None):
+    """
+    Simulate daily prices as geometric Brownian motion.
+
+    Args:
+        volatility (float): Annualized volatility.
+        days (int): Number of daily steps.
+        paths (int): Number of paths.
+        drift (float): Annualized expected log return.
+        rng (np.random.Generator): Random source.
+
+    Returns:
+        np.ndarray: Price relative to today, shape (paths, days + 1); column 0 is 1.
+    """
+    rng = rng or np.random.default_rng()
+    dt = 1 / PERIODS_PER_YEAR
+    log_prices = np.empty((paths, days + 1))
+    log_prices[:, 0] = 0.0
+    log_prices[:, 1:] = rng.standard_normal((paths, days))
+    log_prices[:, 1:] *= volatility * np.sqrt(dt)
+    log_prices[:, 1:] += (drift - volatility ** 2 / 2) * dt
+    np.cumsum(log_prices, axis=1, out=log_prices)
+    return np.exp(log_prices, out=log_prices)
+
+
+def strategy_values(prices, mechanics):
+    """
+    Apply strategy mechanics to simulated price paths.
+
+    Args:
+        prices (np.ndarray): Price relative to today, shape (paths, days + 1).
+        mechanics (dict): See STRATEGY_MECHANICS.
+
+    Returns:
+        tuple: (final value relative to the initial capital, liquidated flags), both of shape (paths,).
+    """
+    years = np.arange(prices.shape[1]) / PERIODS_PER_YEAR
+    if "fee_apr" in mechanics:
+        # Constant-product pool against a stablecoin (the value includes the impermanent loss);
+        # fees compound on top
+        values = position_value(prices[:, -1])[0] * np.exp(mechanics["fee_apr"] * years[-1])
+        return values, np.zeros(len(prices), dtype=bool)
+
+    growth = np.exp(mechanics.get("apy", 0.0) * years)  # Units of the asset grow with the yield
+    leverage = mechanics.get("leverage", 1.0)
+    if leverage <= 1:
+        return prices[:, -1] * growth[-1], np.zeros(len(prices), dtype=bool)
+
+    collateral = leverage * prices * growth  # Collateral value per unit of initial capital
+    debt = (leverage - 1) * np.exp(mechanics["borrow_apr"] * years)
+    underwater = debt >= mechanics["liquidation_threshold"] * collateral
+    liquidated = underwater.any(axis=1)
+    values = collateral[:, -1] - debt[-1]
+    if liquidated.any():
+        # Liquidated at the first step over the threshold, losing the penalty on the collateral
+        step = underwater[liquidated].argmax(axis=1)
+        values[liquidated] = collateral[liquidated, step] * (1 - mechanics["liquidation_penalty"]) - debt[step]
+    return np.maximum(values, 0.0), liquidated
+
+
+def _simulate_chunk(volatility, days, paths, drift, mechanics, seed):
+    prices = simulate_price_paths(volatility, days, paths, drift, np.random.default_rng(seed))
+    values, liquidated = strategy_values(prices, mechanics)
+    return values, liquidated, prices[:, -1]
+
+
+def simulate_strategy(volatility, strategy_type="general", days=DEFAULT_HORIZON_DAYS, paths=DEFAULT_PATHS,
+                      drift=0.0, mechanics=None, seed=None, workers=1, chunk_paths=DEFAULT_CHUNK_PATHS):
+    """
+    Simulate the outcome distribution of a strategy.
+
+    Paths are simulated in chunks with independent seeds; with more than one worker the chunks run
+    in a process pool. The same seed gives the same result for any number of workers.
+
+    Args:
+        volatility (float): Annualized volatility of the asset (see annual_volatility).
+        strategy_type (str): Key of STRATEGY_MECHANICS.
+        days (int): Horizon in days.
+        paths (int): Number of price paths.
+        drift (float): Annualized expected log return of the asset.
+        mechanics (dict): Overrides of the strategy type's mechanics.
+        seed (int): Seed for reproducible results.
+        workers (int): Worker processes; None uses all cores.
+        chunk_paths (int): Paths per chunk.
+
+    Returns:
+        dict:
+            - "expected_return": mean return of the strategy over the horizon
+            - "median_return": median return
+            - "var": loss not exceeded with VAR_CONFIDENCE probability (positive is a loss)
+            - "cvar": mean loss beyond the VaR
+            - "liquidation_probability": share of paths liquidated
+            - "expected_yield": expected return over simply holding the asset
+            - "percentiles": 5th, 25th, 50th, 75th and 95th percentile returns
+    """
+    mechanics = {**STRATEGY_MECHANICS.get(strategy_type, STRATEGY_MECHANICS["general"]), **(mechanics or {})}
+    sizes = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    arguments = [(volatility, days, size, drift, mechanics, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(arguments) == 1:
+        chunks = [_simulate_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*arguments)))
+
+    returns = np.concatenate([chunk[0] for chunk in chunks]) - 1
+    liquidated = np.concatenate([chunk[1] for chunk in chunks])
+    hold_returns = np.concatenate([chunk[2] for chunk in chunks]) - 1
+    var = -np.quantile(returns, 1 - VAR_CONFIDENCE)
+    tail = returns[returns <= -var]
+    return {
+        "strategy_type": strategy_type,
+        "days": days,
+        "paths": paths,
+        "volatility": round(float(volatility), 4),
+        "expected_return": round(float(returns.mean()), 4),
+        "median_return": round(float(np.median(returns)), 4),
+        "var": round(float(var), 4),
+        "cvar": round(float(-tail.mean()), 4) if len(tail) else round(float(var), 4),
+        "liquidation_probability": round(float(liquidated.mean()), 4),
+        "expected_yield": round(float(returns.mean() - hold_returns.mean()), 4),
+        "percentiles": {
+            str(q): round(float(value), 4) for q, value in zip((5, 25, 50, 75, 95), np.percentile(returns, (5, 25, 50, 75, 95)))
+        },
+    }
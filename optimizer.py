@@ -0,0 +1,204 @@
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backtest import Backtest, load_indicator_csv
+from market_condition import INDICATORS, MARKET_CONDITION_CONFIG, MARKET_CONDITION_THRESHOLDS, weight_vector
+from price_store import get_price_store
+
+DEFAULT_SAMPLES = 5000
+DEFAULT_HORIZON = 7
+DEFAULT_GRID_STEP = 0.1
+DEFAULT_CHUNK_SIZE = 2000  # Configurations evaluated per matrix product (and per worker task)
+DEFAULT_MIN_COVERAGE = 0.1  # Ignore configurations that make a bullish/bearish call on fewer days
+BULLISH_THRESHOLD_RANGE = (0.5, 0.8)
+BEARISH_THRESHOLD_RANGE = (0.2, 0.5)
+OBJECTIVES = ("hit_rate", "signal_return")
+
+_worker_backtest = None
+
+
+def random_configurations(samples, seed=None):
+    """
+    Draw random weight and threshold sets.
+
+    Weights are uniform on the simplex (they sum to 1); thresholds are uniform in their ranges,
+    with the bullish threshold always above the bearish one.
+
+    Returns:
+        tuple: (weights of shape (samples, 4), thresholds of shape (samples, 2)).
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(len(INDICATORS)), size=samples)
+    bullish = rng.uniform(*BULLISH_THRESHOLD_RANGE, size=samples)
+    bearish = rng.uniform(BEARISH_THRESHOLD_RANGE[0], np.minimum(bullish, BEARISH_THRESHOLD_RANGE[1]))
+    return weights, np.column_stack([bullish, bearish])
+
+
+def grid_configurations(step=DEFAULT_GRID_STEP):
+    """
+    Enumerate every weight set on a simplex grid with every threshold pair on the same step.
+
+    Returns:
+        tuple: (weights of shape (configs, 4), thresholds of shape (configs, 2)).
+    """
+    units = int(round(1 / step))
+    weights = np.array([
+        combination + (units - sum(combination),)
+        for combination in itertools.product(range(units + 1), repeat=len(INDICATORS) - 1)
+        if sum(combination) <= units
+    ], dtype=float) / units
+    thresholds = np.array([
+        (bullish, bearish)
+        for bullish in np.arange(BULLISH_THRESHOLD_RANGE[0], BULLISH_THRESHOLD_RANGE[1] + step / 2, step)
+        for bearish in np.arange(BEARISH_THRESHOLD_RANGE[0], BEARISH_THRESHOLD_RANGE[1] + step / 2, step)
+        if bullish > bearish
+    ])
+    return np.repeat(weights, len(thresholds), axis=0), np.tile(thresholds, (len(weights), 1))
+
+
+def pareto_front(hit_rate, signal_return):
+    """
+    Return the indices of the configurations no other configuration beats on both objectives.
+
+    Sorted by hit rate (descending), a configuration is on the front when its signal return is
+    above every configuration before it.
+    """
+    order = np.lexsort((-signal_return, -hit_rate))
+    best_return = np.maximum.accumulate(signal_return[order])
+    on_front = np.append(True, signal_return[order][1:] > best_return[:-1])
+    return order[on_front]
+
+
+def _init_worker(backtest):
+    global _worker_backtest
+    _worker_backtest = backtest
+
+
+def _evaluate_chunk(weights, thresholds, horizon):
+    return _worker_backtest.evaluate_many(weights, thresholds, horizon)
+
+
+def optimize(backtest, weights, thresholds, horizon=DEFAULT_HORIZON, workers=None,
+             chunk_size=DEFAULT_CHUNK_SIZE, min_coverage=DEFAULT_MIN_COVERAGE):
+    """
+    Evaluate every configuration and return the Pareto-best ones.
+
+    Configurations are evaluated in chunks, each a single matrix product; with more than one
+    worker the chunks are spread across a process pool that receives the backtest once per process.
+
+    Args:
+        backtest (Backtest): Historical indicators and forward returns.
+        weights (np.ndarray): Shape (configs, 4).
+        thresholds (np.ndarray): Shape (configs, 2), (bullish, bearish).
+        horizon (int): Forward return horizon in days.
+        workers (int): Worker processes; defaults to all cores, 1 evaluates in this process.
+        chunk_size (int): Configurations per chunk.
+        min_coverage (float): Minimum share of days with a bullish or bearish call.
+
+    Returns:
+        list: Pareto-best configurations, highest hit rate first, each
+            {"weights", "thresholds", "hit_rate", "signal_return", "coverage"}.
+    """
+    weights = np.asarray(weights, dtype=float)
+    thresholds = np.asarray(thresholds, dtype=float)
+    starts = range(0, len(weights), chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(starts) == 1:
+        results = [backtest.evaluate_many(weights[s:s + chunk_size], thresholds[s:s + chunk_size], horizon) for s in starts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(backtest,)) as executor:
+            results = list(executor.map(
+                _evaluate_chunk,
+                [weights[s:s + chunk_size] for s in starts],
+                [thresholds[s:s + chunk_size] for s in starts],
+                itertools.repeat(horizon),
+            ))
+
+    metrics = {name: np.concatenate([result[name] for result in results]) for name in ("hit_rate", "signal_return", "coverage")}
+    eligible = np.flatnonzero((metrics["coverage"] >= min_coverage) & ~np.isnan(metrics["hit_rate"]))
+    front = eligible[pareto_front(metrics["hit_rate"][eligible], metrics["signal_return"][eligible])]
+    return [
+        {
+            "weights": {name: round(float(weight), 4) for name, weight in zip(INDICATORS, weights[i])},
+            "thresholds": {"bullish": round(float(thresholds[i, 0]), 4), "bearish": round(float(thresholds[i, 1]), 4)},
+            "hit_rate": round(float(metrics["hit_rate"][i]), 6),
+            "signal_return": round(float(metrics["signal_return"][i]), 6),
+            "coverage": round(float(metrics["coverage"][i]), 6),
+        }
+        for i in front
+    ]
+
+
+def save_config(front, path=MARKET_CONDITION_CONFIG, select="signal_return", metadata=None):
+    """
+    Write the best configuration of a Pareto front where Sentiment loads its scoring config.
+
+    Args:
+        front (list): Output of optimize().
+        path (str): Config file path.
+        select (str): Objective used to pick the configuration ("hit_rate" or "signal_return").
+        metadata (dict): Extra fields stored alongside (e.g. asset and horizon).
+
+    Returns:
+        dict: The configuration written.
+    """
+    if not front:
+        raise ValueError("No configuration meets the minimum coverage.")
+    best = max(front, key=lambda config: config[select])
+    config = {**best, "selected_by": select, "pareto_front": front, **(metadata or {})}
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".market-condition-", suffix=".json")
+    with os.fdopen(fd, "w") as file:
+        json.dump(config, file, indent=4)
+    os.replace(tmp_path, path)
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search market-condition weights and thresholds on historical data.")
+    parser.add_argument("indicators", help="CSV file with date, santiment, fear_and_greed, tradfi and reddit columns.")
+    parser.add_argument("--asset", default="bitcoin", help="CoinGecko id whose stored prices the signals are tested against.")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="Forward return horizon in days.")
+    parser.add_argument("--search", choices=["random", "grid"], default="random")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Configurations drawn by the random search.")
+    parser.add_argument("--grid-step", type=float, default=DEFAULT_GRID_STEP, help="Step of the grid search.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--min-coverage", type=float, default=DEFAULT_MIN_COVERAGE)
+    parser.add_argument("--select", choices=OBJECTIVES, default="signal_return", help="Objective of the saved configuration.")
+    parser.add_argument("--output", default=MARKET_CONDITION_CONFIG)
+    args = parser.parse_args()
+
+    store = get_price_store()
+    store.refresh(args.asset)
+    backtest = Backtest.from_price_store(args.asset, load_indicator_csv(args.indicators), (args.horizon,), store=store)
+    if args.search == "grid":
+        weights, thresholds = grid_configurations(args.grid_step)
+    else:
+        weights, thresholds = random_configurations(args.samples, args.seed)
+    # Always evaluate the current hand-picked configuration for comparison
+    weights = np.vstack([weight_vector(), weights])
+    thresholds = np.vstack([[MARKET_CONDITION_THRESHOLDS["bullish"], MARKET_CONDITION_THRESHOLDS["bearish"]], thresholds])
+
+    started = time.perf_counter()
+    front = optimize(backtest, weights, thresholds, args.horizon, args.workers, min_coverage=args.min_coverage)
+    seconds = time.perf_counter() - started
+    print(f"Evaluated {len(weights)} configurations in {seconds:.2f}s; {len(front)} on the Pareto front:")
+    for config in front:
+        print(f"  hit rate {config['hit_rate']:.3f}  signal return {config['signal_return']:+.5f}  "
+              f"coverage {config['coverage']:.2f}  {config['weights']}  {config['thresholds']}")
+    config = save_config(front, args.output, args.select, {"asset": args.asset, "horizon": args.horizon})
+    print(f"Saved the configuration with the best {args.select} to {args.output}: {config['weights']} {config['thresholds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,8 @@ class CustomStrategy:
             response = requests.post(
                 f"{self.deepseek_api_url}/chat/completions",
                 headers=headers,
-                json=data
+                json=data,
+                timeout=120
             )
             response.raise_for_status()
             return response.json()["choices"][0]["message"]["content"].strip()
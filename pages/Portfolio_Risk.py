@@ -0,0 +1,94 @@
+import streamlit as st
+from dotenv import load_dotenv
+
+from portfolio import PortfolioRiskModel
+
+# Load environment variables
+load_dotenv()
+
+# Assets that can be added to a portfolio, mapped to CoinGecko IDs
+PORTFOLIO_ASSETS = {
+    "BTC": "bitcoin",
+    "Ethereum": "ethereum",
+    "Solana": "solana",
+    "Sui": "sui",
+    "USDC": "usd-coin",
+    "BNB": "binancecoin",
+    "Avalanche": "avalanche-2",
+    "Chainlink": "chainlink",
+    "Aave": "aave",
+    "Uniswap": "uniswap",
+}
+
+
+# The covariance is built once per set of assets; weight changes only re-evaluate it
+@st.cache_resource(ttl=3600)
+def get_portfolio_model(coin_ids):
+    return PortfolioRiskModel.from_price_store(list(coin_ids))
+
+
+class PortfolioRisk:
+    def run(self):
+        """Main method to run the portfolio risk page."""
+        st.title("Portfolio Risk")
+        st.markdown(
+            "Combine your holdings (e.g. ETH in Lido, SOL in Raydium, USDC in Aerodrome) to see the volatility of the "
+            "whole basket, how much each holding contributes to it, and a combined risk score."
+        )
+
+        selected = st.multiselect("Select your holdings", list(PORTFOLIO_ASSETS), default=["Ethereum", "Solana", "USDC"])
+        if len(selected) < 2:
+            st.info("Select at least two holdings.")
+            return
+
+        coin_ids = tuple(PORTFOLIO_ASSETS[name] for name in selected)
+        try:
+            with st.spinner("Loading price histories..."):
+                model = get_portfolio_model(coin_ids)
+        except Exception as e:
+            st.error(f"Failed to build the portfolio model: {e}")
+            return
+
+        # Weights and strategies per holding (assets without price history are left out by the model)
+        names = {coin_id: name for name, coin_id in PORTFOLIO_ASSETS.items()}
+        for coin_id, reason in model.skipped.items():
+            st.warning(f"{names[coin_id]} is left out of the portfolio: {reason}.")
+        weights, strategies = [], []
+        for coin_id in model.assets:
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                weights.append(st.slider(f"{names[coin_id]} weight (%)", 0, 100, 100 // len(model.assets), key=f"weight_{coin_id}"))
+            with col2:
+                strategies.append(st.text_input(f"{names[coin_id]} strategy", placeholder="e.g. Stake in Lido", key=f"strategy_{coin_id}"))
+
+        if sum(weights) == 0:
+            st.warning("Set at least one weight above 0%.")
+            return
+
+        result = model.evaluate(weights, strategies)
+        st.write(f"**Portfolio Volatility (annualized):** {result['volatility']:.1%}")
+        st.write(f"**Diversification Ratio:** {result['diversification_ratio']:.2f}")
+        st.write(f"**Combined Risk Score:** {result['risk_score']}/10")
+        st.dataframe(
+            [
+                {
+                    "Holding": names[holding["asset"]],
+                    "Weight": f"{holding['weight']:.1%}",
+                    "Volatility": f"{holding['volatility']:.1%}",
+                    "Marginal Risk": f"{holding['marginal_risk']:.3f}",
+                    "Share of Portfolio Risk": f"{holding['risk_contribution_pct']:.1%}",
+                }
+                for holding in result["holdings"]
+            ],
+            use_container_width=True,
+        )
+        st.caption(f"Covariance of daily log returns over the last {model.observations} overlapping days. Source: CoinGecko")
+
+        if st.button("Back to Main Page"):
+            st.switch_page("app.py")
+
+
+# Run the page
+if __name__ == "__main__":
+    page = PortfolioRisk()
+    page.run()
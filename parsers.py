@@ -0,0 +1,124 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Fields of the Yahoo Finance quote header, in the order they are returned
+VIX_FIELDS = {
+    "regularMarketPrice": "value",
+    "regularMarketChange": "change",
+    "regularMarketChangePercent": "change_percent",
+}
+VIX_RANGE = (0.0, 200.0)  # Plausible VIX values; anything else means the page changed
+ALTCOIN_SEASON_RANGE = (0, 100)
+ALTCOIN_SEASON_BUTTON_CLASS = "nav-link timeselect active"
+ALTCOIN_SEASON_DIV_STYLE = "font-size:88px;  color:#345C99;position:relative;top:56px;left:calc(47% - 46px)"
+
+# Fast path: precompiled patterns over the raw HTML. Every result is validated, and the
+# SoupStrainer path (which only builds the target tags) is used when a pattern finds nothing valid.
+_FIN_STREAMER_PATTERN = re.compile(
+    r"<fin-streamer\b[^>]*?\bdata-field=[\"'](%s)[\"'][^>]*>(.*?)</fin-streamer>" % "|".join(VIX_FIELDS),
+    re.IGNORECASE | re.DOTALL,
+)
+_ALTCOIN_BUTTON_PATTERN = re.compile(
+    r"<button\b[^>]*?\bclass=[\"']\s*%s\s*[\"'][^>]*>(.*?)</button>" % re.escape(ALTCOIN_SEASON_BUTTON_CLASS),
+    re.IGNORECASE | re.DOTALL,
+)
+_ALTCOIN_DIV_PATTERN = re.compile(
+    r"<div\b[^>]*?\bstyle=[\"']%s[\"'][^>]*>(.*?)</div>" % re.escape(ALTCOIN_SEASON_DIV_STYLE),
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_INDEX_IN_PARENTHESES = re.compile(r"\((\d+)\)")
+
+
+def _text(fragment):
+    """Text of an HTML fragment (tags stripped, whitespace trimmed)."""
+    return _TAG_PATTERN.sub("", fragment).strip()
+
+
+def _parse_number(text):
+    """Parse a number as shown on quote pages, e.g. "1,234.5", "+0.35", "(-2.10%)"."""
+    return float(text.strip().strip("()%").replace(",", ""))
+
+
+def _validate_vix(fields):
+    if set(fields) != set(VIX_FIELDS.values()):
+        raise ValueError(f"VIX fields missing: {sorted(set(VIX_FIELDS.values()) - set(fields))}")
+    if not VIX_RANGE[0] < fields["value"] < VIX_RANGE[1]:
+        raise ValueError(f"Implausible VIX value: {fields['value']}")
+    return fields
+
+
+def extract_vix(html):
+    """
+    Extract the VIX value, change and percent change from a Yahoo Finance quote page.
+
+    Like soup.find, the first fin-streamer of each field on the page is used.
+
+    Returns:
+        dict: {"value", "change", "change_percent"} as floats.
+
+    Raises:
+        ValueError: If the fields cannot be found or do not parse to plausible numbers.
+    """
+    fields = {}
+    try:
+        for match in _FIN_STREAMER_PATTERN.finditer(html):
+            key = VIX_FIELDS[next(field for field in VIX_FIELDS if field.lower() == match.group(1).lower())]
+            if key not in fields:
+                fields[key] = _parse_number(_text(match.group(2)))
+                if len(fields) == len(VIX_FIELDS):
+                    break
+        return _validate_vix(fields)
+    except ValueError:
+        pass
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("fin-streamer"))
+    fields = {}
+    for field, key in VIX_FIELDS.items():
+        element = soup.find("fin-streamer", {"data-field": field})
+        if element is not None:
+            fields[key] = _parse_number(element.text)
+    return _validate_vix(fields)
+
+
+def _validate_altcoin_season(value):
+    if not ALTCOIN_SEASON_RANGE[0] <= value <= ALTCOIN_SEASON_RANGE[1]:
+        raise ValueError(f"Implausible Altcoin Season Index: {value}")
+    return value
+
+
+def _altcoin_season_from_button(text):
+    match = _INDEX_IN_PARENTHESES.search(text)
+    return int(match.group(1)) if match else None
+
+
+def extract_altcoin_season_index(html):
+    """
+    Extract the Altcoin Season Index (0-100) from the blockchaincenter.net page.
+
+    Reads the active time-select button ("... (51)"), falling back to the large index value div.
+
+    Raises:
+        ValueError: If no plausible index value is found.
+    """
+    match = _ALTCOIN_BUTTON_PATTERN.search(html)
+    value = _altcoin_season_from_button(_text(match.group(1))) if match else None
+    if value is None:
+        match = _ALTCOIN_DIV_PATTERN.search(html)
+        text = _text(match.group(1)) if match else ""
+        value = int(text) if text.isdigit() else None
+    if value is not None and ALTCOIN_SEASON_RANGE[0] <= value <= ALTCOIN_SEASON_RANGE[1]:
+        return value
+
+    # Attribute order or quoting the patterns do not cover: parse only buttons and divs
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(["button", "div"]))
+    button = soup.find("button", class_=ALTCOIN_SEASON_BUTTON_CLASS)
+    value = _altcoin_season_from_button(button.text) if button else None
+    if value is None:
+        div = soup.find("div", style=ALTCOIN_SEASON_DIV_STYLE)
+        text = div.text.strip() if div else ""
+        if not text.isdigit():
+            raise ValueError("Altcoin Season Index value not found on the page.")
+        value = int(text)
+    return _validate_altcoin_season(value)
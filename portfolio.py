@@ -0,0 +1,115 @@
+import numpy as np
+
+from price_store import get_price_store
+from risk import RISK_FACTOR_WEIGHTS, get_liquidity, get_smart_contract_risk
+from volatility import PERIODS_PER_YEAR, align_histories
+
+DEFAULT_LOOKBACK_DAYS = 90
+
+
+class PortfolioRiskModel:
+    """
+    Portfolio risk for a fixed set of assets.
+
+    The annualized covariance matrix of daily log returns is computed once when the model is
+    built; evaluate() then only does a few matrix-vector products, so it can run on every
+    weight change in the UI.
+    """
+
+    def __init__(self, assets, prices, periods_per_year=PERIODS_PER_YEAR):
+        """
+        Args:
+            assets (list): Asset ids, one per column of prices.
+            prices (np.ndarray): Aligned daily prices of shape (days, assets), oldest first.
+            periods_per_year (int): Used to annualize the covariance.
+        """
+        self.assets = list(assets)
+        self.skipped = {}  # Asset id -> reason it was left out (see from_price_store)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = np.diff(np.log(np.asarray(prices, dtype=float)), axis=0)
+        # Only days where every asset has a price, so the covariance is positive semi-definite
+        returns = returns[~np.isnan(returns).any(axis=1)]
+        if len(returns) < 2:
+            raise ValueError("Not enough overlapping price history to estimate the covariance.")
+        self.observations = len(returns)
+        self.covariance = np.atleast_2d(np.cov(returns, rowvar=False)) * periods_per_year
+        self.volatilities = np.sqrt(np.diag(self.covariance))
+
+    @classmethod
+    def from_price_store(cls, coin_ids, days=DEFAULT_LOOKBACK_DAYS, store=None):
+        """
+        Build the model from the cached price histories of the local price store.
+
+        Assets whose history cannot be loaded or has fewer than two closes are left out; they are
+        listed with the reason in the model's `skipped` dict.
+        """
+        store = store or get_price_store()
+        histories, skipped = {}, {}
+        for coin_id in dict.fromkeys(coin_ids):
+            try:
+                history = store.fetch_history(coin_id, days)
+            except Exception as e:
+                skipped[coin_id] = f"price history unavailable ({e})"
+                continue
+            if len(history) < 2:
+                skipped[coin_id] = "not enough price history"
+                continue
+            histories[coin_id] = history
+        if not histories:
+            raise ValueError("No price history available for the selected assets.")
+        assets, _, prices = align_histories(histories)
+        model = cls(assets, prices)
+        model.skipped = skipped
+        return model
+
+    def evaluate(self, weights, strategies=None):
+        """
+        Compute portfolio risk for a set of weights.
+
+        Args:
+            weights (sequence): One weight per asset (normalized to sum to 1).
+            strategies (sequence): Optional strategy text per asset (e.g., "Stake ETH in Lido"),
+                used for the smart contract factor of the combined score.
+
+        Returns:
+            dict: Portfolio volatility, per-asset risk contributions and the combined risk score.
+        """
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (len(self.assets),) or weights.sum() <= 0 or (weights < 0).any():
+            raise ValueError("Expected one non-negative weight per asset.")
+        weights = weights / weights.sum()
+
+        covariance_weights = self.covariance @ weights
+        volatility = float(np.sqrt(weights @ covariance_weights))
+        # Marginal risk: d(volatility)/d(weight); contributions sum to the portfolio volatility
+        marginal = covariance_weights / volatility if volatility > 0 else np.zeros_like(weights)
+        contributions = weights * marginal
+
+        liquidity = np.array([get_liquidity(asset) for asset in self.assets])
+        smart_contract = np.array([
+            get_smart_contract_risk(strategy) if strategy else 0.5 for strategy in (strategies or [None] * len(self.assets))
+        ])
+        # Same factors as a single-strategy score, with the portfolio volatility as the volatility
+        # factor so diversification lowers the score
+        overall = (
+            RISK_FACTOR_WEIGHTS["volatility"] * min(volatility, 1.0) +
+            RISK_FACTOR_WEIGHTS["liquidity"] * float(weights @ (1 - liquidity)) +
+            RISK_FACTOR_WEIGHTS["smart_contract"] * float(weights @ smart_contract)
+        )
+
+        return {
+            "volatility": volatility,
+            "diversification_ratio": float(weights @ self.volatilities) / volatility if volatility > 0 else 1.0,
+            "holdings": [
+                {
+                    "asset": asset,
+                    "weight": float(weights[i]),
+                    "volatility": float(self.volatilities[i]),
+                    "marginal_risk": float(marginal[i]),
+                    "risk_contribution": float(contributions[i]),
+                    "risk_contribution_pct": float(contributions[i] / volatility) if volatility > 0 else 0.0,
+                }
+                for i, asset in enumerate(self.assets)
+            ],
+            "risk_score": round(min(overall * 10, 10), 2),
+        }
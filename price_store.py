@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+
+import numpy as np
+import requests
+
+from record_files import append_records
+from volatility import MS_PER_DAY
+
+DEFAULT_PRICE_DIR = "data/prices"
+MAX_HISTORY_DAYS = 365  # The free CoinGecko API serves at most one year of history
+# One record per daily close: timestamp in milliseconds and price in USD
+PRICE_DTYPE = np.dtype([("t", "<i8"), ("p", "<f8")])
+
+
+def fetch_market_chart_range(coin_id, from_ms, to_ms):
+    """Fetch [timestamp_ms, price] pairs for a coin between two timestamps from CoinGecko."""
+    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart/range"
+    params = {"vs_currency": "usd", "from": from_ms // 1000, "to": to_ms // 1000}
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()["prices"]
+
+
+def _day_of(records):
+    return records["t"] // MS_PER_DAY
+
+
+def daily_closes(points, before_day):
+    """
+    Reduce [timestamp_ms, price] pairs to the last point of each completed day.
+
+    Args:
+        points (sequence): [timestamp_ms, price] pairs, in any granularity.
+        before_day (int): Day number (since the epoch) of the first incomplete day to drop.
+
+    Returns:
+        np.ndarray: Records of PRICE_DTYPE, sorted by time.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    points = points[np.argsort(points[:, 0], kind="stable")]
+    days = (points[:, 0] // MS_PER_DAY).astype(np.int64)
+    keep = days < before_day
+    points, days = points[keep], days[keep]
+    # The last point of each day is where the next day starts, shifted back by one
+    last_of_day = np.append(days[1:] != days[:-1], True) if len(days) else np.empty(0, dtype=bool)
+    records = np.empty(int(last_of_day.sum()), dtype=PRICE_DTYPE)
+    records["t"] = points[last_of_day, 0].astype(np.int64)
+    records["p"] = points[last_of_day, 1]
+    return records
+
+
+class PriceStore:
+    """
+    Local daily price history per asset, stored as append-only binary files.
+
+    Each asset has one file of PRICE_DTYPE records that is read through np.memmap, so
+    lookbacks are served without network or deserialization cost. refresh() only requests
+    the days after the last stored close; once an asset is up to date for the day it makes
+    no request at all.
+    """
+
+    def __init__(self, root=DEFAULT_PRICE_DIR, fetch_range=fetch_market_chart_range, max_history_days=MAX_HISTORY_DAYS):
+        self.root = root
+        self.fetch_range = fetch_range
+        self.max_history_days = max_history_days
+        self._lock = threading.Lock()
+        self._coin_locks = {}  # coin id -> lock serializing refreshes of that asset
+        self._maps = {}  # coin id -> (file size, memmap)
+        self._listeners = []  # Called with (coin id, new records) after every append
+
+    def add_listener(self, callback):
+        """Register callback(coin_id, records) to receive the closes appended by refresh()."""
+        self._listeners.append(callback)
+
+    def _coin_lock(self, coin_id):
+        with self._lock:
+            return self._coin_locks.setdefault(coin_id, threading.Lock())
+
+    def _path(self, coin_id):
+        return os.path.join(self.root, f"{coin_id}.prices")
+
+    def _records(self, coin_id):
+        """Return the memory-mapped records of an asset (empty if none are stored)."""
+        path = self._path(coin_id)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=PRICE_DTYPE)
+        cached = self._maps.get(coin_id)
+        if cached and cached[0] == size:
+            return cached[1]
+        if size < PRICE_DTYPE.itemsize:
+            return np.empty(0, dtype=PRICE_DTYPE)
+        # Ignore a trailing partial record left by an interrupted append
+        records = np.memmap(path, dtype=PRICE_DTYPE, mode="r", shape=(size // PRICE_DTYPE.itemsize,))
+        self._maps[coin_id] = (size, records)
+        return records
+
+    def last_timestamp(self, coin_id):
+        """Return the timestamp (ms) of the newest stored close, or None."""
+        records = self._records(coin_id)
+        return int(records["t"][-1]) if len(records) else None
+
+    def history(self, coin_id, days=None):
+        """
+        Return stored daily closes of an asset, oldest first.
+
+        Args:
+            coin_id (str): The CoinGecko id (e.g., "bitcoin").
+            days (int): Lookback in days from the newest close; None for the full history.
+
+        Returns:
+            np.ndarray: Read-only PRICE_DTYPE records with fields "t" (ms) and "p" (USD).
+        """
+        records = self._records(coin_id)
+        if days is None or not len(records):
+            return records
+        start = np.searchsorted(records["t"], records["t"][-1] - days * MS_PER_DAY, side="left")
+        return records[start:]
+
+    def refresh(self, coin_id, now_ms=None):
+        """
+        Append the closes missing since the last stored day.
+
+        Returns:
+            int: The number of closes appended.
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        today = now_ms // MS_PER_DAY
+        with self._coin_lock(coin_id):
+            last = self.last_timestamp(coin_id)
+            if last is not None and last // MS_PER_DAY >= today - 1:
+                return 0  # Yesterday's close is already stored
+            from_ms = now_ms - self.max_history_days * MS_PER_DAY if last is None else last + 1
+            records = daily_closes(self.fetch_range(coin_id, from_ms, now_ms), before_day=today)
+            if last is not None:
+                records = records[(records["t"] // MS_PER_DAY) > last // MS_PER_DAY]
+            # Another process may have appended the same days since last_timestamp() was read
+            records = append_records(self._path(coin_id), records, key=_day_of)
+            if not len(records):
+                return 0
+            for callback in self._listeners:
+                try:
+                    callback(coin_id, records)
+                except Exception as e:
+                    print(f"Error notifying a price listener for {coin_id}: {e}")
+            return len(records)
+
+    def fetch_history(self, coin_id, days):
+        """
+        Refresh an asset and return its last `days` closes as [timestamp_ms, price] pairs.
+
+        Matches the fetch_history signature of VolatilityEngine, so the engine reads from the store.
+        """
+        try:
+            self.refresh(coin_id)
+        except Exception as e:
+            # Serve whatever is stored if the refresh fails
+            if self.last_timestamp(coin_id) is None:
+                raise
+            print(f"Error refreshing prices for {coin_id}, using stored history: {e}")
+        records = self.history(coin_id, days)
+        return np.column_stack((records["t"], records["p"]))
+
+
+_price_store = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store():
+    """Return the process-wide PriceStore."""
+    global _price_store
+    with _price_store_lock:
+        if _price_store is None:
+            _price_store = PriceStore()
+        return _price_store
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within a process
+    fcntl = None
+
+
+def append_records(path, records, key):
+    """
+    Append records to an append-only file of fixed-size numpy records, safely across processes.
+
+    While holding an exclusive lock on the file, a trailing partial record left by an interrupted
+    append is truncated away, and the records whose key is not after the key of the last stored
+    record are dropped. Two processes that fetched the same missing days therefore append them
+    once, and every record stays aligned.
+
+    Args:
+        path (str): The file (created if missing).
+        records (np.ndarray): Structured records, sorted by key.
+        key (callable): Maps records to the increasing integer key of each (e.g. the day number).
+
+    Returns:
+        np.ndarray: The records actually appended.
+    """
+    itemsize = records.dtype.itemsize
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            size = os.fstat(file.fileno()).st_size
+            whole = size - size % itemsize
+            if whole != size:
+                file.truncate(whole)
+            if whole:
+                file.seek(whole - itemsize)
+                last = np.frombuffer(file.read(itemsize), dtype=records.dtype)
+                records = records[key(records) > key(last)[0]]
+            if len(records):
+                file.write(records.tobytes())  # Append mode writes at the (truncated) end
+                file.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    return records
@@ -0,0 +1,337 @@
+import datetime
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from liquidity import get_liquidity_index
+from price_store import get_price_store
+from taxonomy import classify_strategy, smart_contract_risk
+from volatility import compute_volatility
+
+# Weights of each factor in the overall risk score (same as CryptoFinanceAgent.calculate_risk_score)
+RISK_FACTOR_WEIGHTS = {
+    "volatility": 0.5,  # Higher volatility increases risk
+    "liquidity": 0.3,  # Lower liquidity increases risk
+    "smart_contract": 0.2,  # Smart contract risks
+}
+
+# Fallback liquidity scores by CoinGecko id, from 0.1 (low) to 1.0 (high), used when market data is unavailable
+LIQUIDITY_MAP = {
+    "bitcoin": 0.9,
+    "ethereum": 0.8,
+    "solana": 0.7,
+    "sui": 0.6,
+}
+DEFAULT_LIQUIDITY = 0.5
+DEFAULT_VOLATILITY = 0.5  # Medium risk when no price history is available
+VOLATILITY_TTL = 3600
+VOLATILITY_LOOKBACK_DAYS = 30
+
+# Strategy types scored by the risk pipeline, riskiest first (see classify_strategy_type)
+STRATEGY_TYPES = ["leveraging", "liquidity pool", "lending", "general"]
+# Taxonomy actions (see taxonomy.ACTIONS) that make a strategy of each type
+STRATEGY_TYPE_ACTIONS = {
+    "leveraging": {"leverage", "borrow"},
+    "liquidity pool": {"provide liquidity"},
+    "lending": {"lend"},
+}
+RISK_SCORES_FILE = "data/risk_scores.json"
+RISK_REFRESH_INTERVAL = 3600  # Seconds between input checks of an asset
+
+
+def get_smart_contract_risk(strategy):
+    """Estimate smart contract risk for a strategy from 0.1 (low) to 1.0 (high), see taxonomy.classify_strategy."""
+    return smart_contract_risk(strategy)
+
+
+def classify_strategy_type(strategy):
+    """Return the riskiest strategy type among the actions of a strategy or recommendation text."""
+    actions = set(classify_strategy(strategy)["actions"])
+    for strategy_type in STRATEGY_TYPES[:-1]:
+        if actions & STRATEGY_TYPE_ACTIONS[strategy_type]:
+            return strategy_type
+    return "general"
+
+
+def get_liquidity(crypto):
+    """
+    Return the liquidity score of a cryptocurrency (CoinGecko id), from market data when available.
+
+    Never waits on CoinGecko: until the first background refresh of the index has finished, the
+    score comes from LIQUIDITY_MAP.
+    """
+    crypto = crypto.lower()
+    score = get_liquidity_index().get(crypto)
+    return score if score is not None else LIQUIDITY_MAP.get(crypto, DEFAULT_LIQUIDITY)
+
+
+def normalize_volatility(daily_volatility):
+    """Map the standard deviation of daily returns to a 0-1 risk factor (annualized, capped at 100%)."""
+    return min(daily_volatility * math.sqrt(365), 1.0)
+
+
+def score_strategy(crypto, strategy, volatility, inputs_as_of, liquidity=None):
+    """
+    Score a strategy from precomputed inputs.
+
+    Args:
+        crypto (str): The CoinGecko id of the cryptocurrency (e.g., "bitcoin").
+        strategy (str): The strategy text.
+        volatility (float): Volatility risk factor from 0 to 1 (see normalize_volatility).
+        inputs_as_of (str): Timestamp of the market data the inputs were computed from.
+        liquidity (float): Liquidity from 0 to 1; defaults to get_liquidity(crypto).
+
+    Returns:
+        dict: {"factors": {...}, "overall": score out of 10, "inputs_as_of": timestamp}
+    """
+    factors = {
+        "volatility": round(volatility, 4),
+        "liquidity": round(get_liquidity(crypto) if liquidity is None else liquidity, 4),
+        "smart_contract": get_smart_contract_risk(strategy),
+    }
+    overall = (
+        RISK_FACTOR_WEIGHTS["volatility"] * factors["volatility"] +
+        RISK_FACTOR_WEIGHTS["liquidity"] * (1 - factors["liquidity"]) +  # Lower liquidity increases risk
+        RISK_FACTOR_WEIGHTS["smart_contract"] * factors["smart_contract"]
+    )
+    return {
+        "factors": factors,
+        "overall": round(min(overall * 10, 10), 2),
+        "inputs_as_of": inputs_as_of,
+    }
+
+
+class VolatilityCache:
+    """
+    Volatility risk factors per cryptocurrency, recomputed at most once per TTL.
+
+    Lookups return (volatility, as_of); as_of is None when the default was used because the
+    price history could not be fetched.
+    """
+
+    def __init__(self, ttl=VOLATILITY_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache = {}  # crypto -> (volatility, as_of, fetched_at)
+
+    def fetch(self, crypto):
+        """Read 30 days of prices from the local price store and compute the volatility risk factor."""
+        metrics = compute_volatility(get_price_store().fetch_history(crypto, 30)[:, 1])
+        return normalize_volatility(float(metrics["daily"][0]))
+
+    def get(self, crypto):
+        crypto = crypto.lower()
+        with self._lock:
+            cached = self._cache.get(crypto)
+        if cached and time.time() - cached[2] < self.ttl:
+            return cached[0], cached[1]
+        try:
+            volatility = self.fetch(crypto)
+            as_of = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        except Exception as e:
+            print(f"Error fetching volatility for {crypto}: {e}")
+            volatility, as_of = DEFAULT_VOLATILITY, None
+        with self._lock:
+            self._cache[crypto] = (volatility, as_of, time.time())
+        return volatility, as_of
+
+    def __call__(self, crypto):
+        return self.get(crypto)
+
+
+_volatility_cache = VolatilityCache()
+
+
+def attach_risk(strategy, volatility_lookup=None):
+    """Compute the risk of a community strategy dict and store it under "risk". Returns the strategy."""
+    volatility_lookup = volatility_lookup or _volatility_cache
+    volatility, as_of = volatility_lookup(strategy["crypto"])
+    strategy["risk"] = score_strategy(strategy["crypto"], strategy["strategy"], volatility, as_of)
+    return strategy
+
+
+def refresh_community_risk(store, volatility_lookup=None, force=False):
+    """
+    Batch job: recompute stored risk scores after the volatility data updates.
+
+    Volatility is looked up once per cryptocurrency. Strategies whose stored inputs are
+    already as recent as the current volatility data are left untouched, and the store
+    is written once.
+
+    Returns:
+        int: The number of strategies rescored.
+    """
+    volatility_lookup = volatility_lookup or _volatility_cache
+    volatility_by_crypto = {}
+
+    def rescore(strategies):
+        rescored = 0
+        for strategy in strategies:
+            crypto = strategy["crypto"].lower()
+            if crypto not in volatility_by_crypto:
+                volatility_by_crypto[crypto] = volatility_lookup(crypto)
+            volatility, as_of = volatility_by_crypto[crypto]
+            stored = strategy.get("risk")
+            if not force and stored and as_of is not None and (stored.get("inputs_as_of") or "") >= as_of:
+                continue
+            if not force and stored and as_of is None:
+                continue  # Keep the last real score rather than overwrite it with the default
+            strategy["risk"] = score_strategy(crypto, strategy["strategy"], volatility, as_of)
+            rescored += 1
+        return rescored
+
+    return store.update(rescore)
+
+
+class RiskPipeline:
+    """
+    Precomputed risk scores for every (asset, strategy type) pair.
+
+    refresh() recomputes, in one vectorized pass over the local price store, only the assets
+    whose inputs changed (a new daily close or a different liquidity score) and persists the
+    factor breakdowns to a JSON file. lookup() is a dict read: assets that are due for an input
+    check are refreshed on a background thread, and the stored entry is returned meanwhile.
+    """
+
+    def __init__(self, path=RISK_SCORES_FILE, price_store=None, refresh_interval=RISK_REFRESH_INTERVAL):
+        self.path = path
+        self.price_store = price_store or get_price_store()
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._background_lock = threading.Lock()  # Held while a background refresh runs
+        self._checked_at = {}  # crypto -> time of the last input check
+        self._scores = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading risk scores, recomputing them: {e}")
+            return {}
+
+    def _save(self):
+        """Persist the scores; they stay usable in memory if the file cannot be written."""
+        tmp_path = None
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".risk-", suffix=".json")
+            with os.fdopen(fd, "w") as file:
+                json.dump(self._scores, file, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving risk scores: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _inputs(self, crypto):
+        """Return the fingerprint of an asset's inputs: newest price close and liquidity."""
+        try:
+            self.price_store.refresh(crypto)
+        except Exception as e:
+            print(f"Error refreshing prices for {crypto}: {e}")
+        return {"price_as_of": self.price_store.last_timestamp(crypto), "liquidity": get_liquidity(crypto)}
+
+    def refresh(self, cryptos):
+        """
+        Recompute the scores of the assets whose inputs changed.
+
+        Returns:
+            list: The assets that were recomputed.
+        """
+        with self._lock:
+            changed = {}
+            for crypto in dict.fromkeys(c.lower() for c in cryptos):
+                inputs = self._inputs(crypto)
+                self._checked_at[crypto] = time.time()
+                if crypto not in self._scores or self._scores[crypto]["inputs"] != inputs:
+                    changed[crypto] = inputs
+            if not changed:
+                return []
+
+            # Volatility of every changed asset in one pass over the stored closes
+            assets = list(changed)
+            columns = [self.price_store.history(crypto, VOLATILITY_LOOKBACK_DAYS)["p"] for crypto in assets]
+            length = max((len(column) for column in columns), default=0)
+            prices = np.full((length, len(assets)), np.nan)
+            for i, column in enumerate(columns):
+                if len(column):
+                    prices[length - len(column):, i] = column
+            daily = compute_volatility(prices)["daily"] if length > 1 else np.full(len(assets), np.nan)
+
+            for i, crypto in enumerate(assets):
+                inputs = changed[crypto]
+                has_prices = not np.isnan(daily[i])
+                volatility = normalize_volatility(float(daily[i])) if has_prices else DEFAULT_VOLATILITY
+                as_of = (
+                    datetime.datetime.fromtimestamp(inputs["price_as_of"] / 1000, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    if has_prices else None
+                )
+                self._scores[crypto] = {
+                    "inputs": inputs,
+                    "scores": {
+                        strategy_type: score_strategy(crypto, strategy_type, volatility, as_of, liquidity=inputs["liquidity"])
+                        for strategy_type in STRATEGY_TYPES
+                    },
+                }
+            self._save()
+            return assets
+
+    def refresh_in_background(self, cryptos):
+        """
+        Run refresh(cryptos) on a daemon thread, unless a background refresh is already running.
+
+        Returns:
+            threading.Thread: The started thread, or None if one was already running.
+        """
+        if not self._background_lock.acquire(blocking=False):
+            return None
+
+        def run():
+            try:
+                self.refresh(cryptos)
+            except Exception as e:
+                print(f"Error refreshing risk scores: {e}")
+            finally:
+                self._background_lock.release()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def lookup(self, crypto, strategy_type="general"):
+        """
+        Return the stored risk of an asset for a strategy type ({"factors", "overall", "inputs_as_of"}),
+        or None if the asset has not been scored yet.
+
+        Never fetches: an asset due for an input check (at most once per refresh interval) is
+        refreshed in the background and picked up by a later lookup.
+        """
+        crypto = crypto.lower()
+        if time.time() - self._checked_at.get(crypto, 0) > self.refresh_interval:
+            self.refresh_in_background([crypto])
+        entry = self._scores.get(crypto)
+        if not entry:
+            return None
+        return entry["scores"].get(strategy_type) or entry["scores"]["general"]
+
+
+if __name__ == "__main__":
+    from community_store import get_community_store
+
+    get_liquidity_index().wait()  # Score with market data rather than the fallback map
+    store = get_community_store("community/community_strategies.json")
+    rescored = refresh_community_risk(store)
+    print(f"Rescored {rescored} community strategies.")
+
+    assets = list(LIQUIDITY_MAP) + [strategy["crypto"] for strategy in store.strategies]
+    recomputed = RiskPipeline().refresh(assets)
+    print(f"Recomputed risk scores for {len(recomputed)} assets: {', '.join(recomputed) or 'none changed'}.")
@@ -0,0 +1,180 @@
+import datetime
+import os
+import threading
+import time
+
+import numpy as np
+import requests
+
+from record_files import append_records
+from volatility import MS_PER_DAY
+
+SANTIMENT_URL = "https://api.santiment.net/graphql"
+DEFAULT_SANTIMENT_DIR = "data/santiment"
+INITIAL_DAYS = 90  # History requested the first time a (slug, metric) is used
+# One record per daily value: timestamp in milliseconds and the metric value
+SANTIMENT_DTYPE = np.dtype([("t", "<i8"), ("v", "<f8")])
+AGGREGATES = {"mean": np.mean, "median": np.median, "sum": np.sum, "min": np.min, "max": np.max}
+
+TIMESERIES_QUERY = """
+{
+    getMetric(metric: "%s") {
+        timeseriesData(
+            slug: "%s",
+            from: "%s",
+            to: "%s",
+            interval: "1d"
+        ) {
+            datetime
+            value
+        }
+    }
+}
+"""
+
+
+def _iso(timestamp_ms):
+    return datetime.datetime.fromtimestamp(timestamp_ms / 1000, tz=datetime.timezone.utc).isoformat()
+
+
+def _day_of(records):
+    return records["t"] // MS_PER_DAY
+
+
+def fetch_timeseries(slug, metric, from_ms, to_ms):
+    """
+    Fetch the daily values of a Santiment metric between two timestamps.
+
+    Returns:
+        list: [timestamp_ms, value] pairs.
+
+    Raises:
+        ValueError: If the API reports an error.
+    """
+    headers = {
+        "Authorization": f"Apikey {os.getenv('SANTIMENT_API_KEY')}",
+        "Content-Type": "application/json",
+    }
+    query = TIMESERIES_QUERY % (metric, slug, _iso(from_ms), _iso(to_ms))
+    response = requests.post(SANTIMENT_URL, json={"query": query}, headers=headers, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    if "errors" in data:
+        raise ValueError(f"Santiment API error: {data['errors'][0]['message']}")
+    if not data.get("data") or not data["data"].get("getMetric"):
+        raise ValueError("No data returned from Santiment API")
+    return [
+        [int(datetime.datetime.fromisoformat(point["datetime"].replace("Z", "+00:00")).timestamp() * 1000), point["value"]]
+        for point in data["data"]["getMetric"]["timeseriesData"]
+        if point["value"] is not None
+    ]
+
+
+class SantimentCache:
+    """
+    Local daily timeseries per (slug, metric), stored as append-only binary files like PriceStore.
+
+    refresh() only requests the days after the last stored one, and once a series holds
+    yesterday's value it makes no request at all. Only completed days are stored, so the latest
+    value is yesterday's full-day value rather than a partial count for today.
+    """
+
+    def __init__(self, root=DEFAULT_SANTIMENT_DIR, fetch=fetch_timeseries, initial_days=INITIAL_DAYS):
+        self.root = root
+        self.fetch = fetch
+        self.initial_days = initial_days
+        self._lock = threading.Lock()
+        self._series_locks = {}  # (slug, metric) -> lock serializing refreshes of that series
+        self._maps = {}  # (slug, metric) -> (file size, memmap)
+
+    def _series_lock(self, slug, metric):
+        with self._lock:
+            return self._series_locks.setdefault((slug, metric), threading.Lock())
+
+    def _path(self, slug, metric):
+        return os.path.join(self.root, f"{slug}.{metric}.bin")
+
+    def _records(self, slug, metric):
+        """Return the memory-mapped records of a series (empty if none are stored)."""
+        path = self._path(slug, metric)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=SANTIMENT_DTYPE)
+        cached = self._maps.get((slug, metric))
+        if cached and cached[0] == size:
+            return cached[1]
+        if size < SANTIMENT_DTYPE.itemsize:
+            return np.empty(0, dtype=SANTIMENT_DTYPE)
+        records = np.memmap(path, dtype=SANTIMENT_DTYPE, mode="r", shape=(size // SANTIMENT_DTYPE.itemsize,))
+        self._maps[(slug, metric)] = (size, records)
+        return records
+
+    def refresh(self, slug, metric, now_ms=None):
+        """
+        Append the daily values missing since the last stored day.
+
+        Returns:
+            int: The number of days appended.
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        today = now_ms // MS_PER_DAY
+        with self._series_lock(slug, metric):
+            records = self._records(slug, metric)
+            last_day = int(records["t"][-1] // MS_PER_DAY) if len(records) else None
+            if last_day is not None and last_day >= today - 1:
+                return 0  # Yesterday's value is already stored
+            from_day = today - self.initial_days if last_day is None else last_day + 1
+            points = np.asarray(self.fetch(slug, metric, from_day * MS_PER_DAY, now_ms), dtype=float).reshape(-1, 2)
+            points = points[np.argsort(points[:, 0], kind="stable")]
+            days = (points[:, 0] // MS_PER_DAY).astype(np.int64)
+            keep = (days >= from_day) & (days < today)
+            # One value per day (the last one if a day is repeated)
+            keep &= np.append(days[1:] != days[:-1], True) if len(days) else np.empty(0, dtype=bool)
+            new = np.empty(int(keep.sum()), dtype=SANTIMENT_DTYPE)
+            new["t"] = days[keep] * MS_PER_DAY
+            new["v"] = points[keep, 1]
+            # Another process may have appended the same days since the records were read
+            return len(append_records(self._path(slug, metric), new, key=_day_of))
+
+    def range(self, slug, metric, days=None, end_ms=None):
+        """
+        Stored daily values, oldest first.
+
+        Args:
+            days (int): Number of days up to end_ms (or the newest value); None for the full history.
+            end_ms (int): Timestamp of the last day to include; None for the newest.
+
+        Returns:
+            np.ndarray: Read-only SANTIMENT_DTYPE records with fields "t" (ms, start of day) and "v".
+        """
+        records = self._records(slug, metric)
+        if end_ms is not None:
+            records = records[:np.searchsorted(records["t"], end_ms, side="right")]
+        if days is None or not len(records):
+            return records
+        start = np.searchsorted(records["t"], records["t"][-1] - (days - 1) * MS_PER_DAY, side="left")
+        return records[start:]
+
+    def latest(self, slug, metric):
+        """Return (timestamp_ms, value) of the newest stored day, or None."""
+        records = self._records(slug, metric)
+        return (int(records["t"][-1]), float(records["v"][-1])) if len(records) else None
+
+    def aggregate(self, slug, metric, days, how="mean"):
+        """Aggregate ("mean", "median", "sum", "min" or "max") of the last `days` stored values, or None."""
+        values = self.range(slug, metric, days)["v"]
+        return float(AGGREGATES[how](values)) if len(values) else None
+
+
+_santiment_cache = None
+_santiment_cache_lock = threading.Lock()
+
+
+def get_santiment_cache():
+    """Return the process-wide SantimentCache."""
+    global _santiment_cache
+    with _santiment_cache_lock:
+        if _santiment_cache is None:
+            _santiment_cache = SantimentCache()
+        return _santiment_cache
@@ -1,16 +1,25 @@
-import re
-import requests
 import os
-from datetime import datetime, UTC, timedelta, timezone
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import streamlit as st
-from bs4 import BeautifulSoup
 import functools
 import praw
 from textblob import TextBlob
+
+from market_condition import INDICATOR_SCALES, load_market_condition_config
+from market_data import ALTCOIN_SEASON_URL, FEAR_GREED_URL, REQUEST_TIMEOUT, VIX_URL, get_market_data
+from health import SourceUnavailable, get_health_registry
+from sources import IndicatorSource, SourceRegistry, scaled
+from snapshot import get_snapshot_reader
+from santiment_cache import get_santiment_cache
+
 # Load environment variables from .env
 load_dotenv()
 
+REDDIT_SUBREDDIT = "cryptocurrency"  # Subreddit of the reddit indicator
+REDDIT_POST_LIMIT = 10  # Posts the reddit indicator averages over
+SANTIMENT_METRIC = "daily_active_addresses"  # Metric of the santiment indicator
+
 # Detect if running in Streamlit
 def is_streamlit():
     """Check if the code is running in a Streamlit environment."""
@@ -35,44 +44,69 @@ class Sentiment:
         - NewsAPI: For news-based sentiment analysis.
         """
         # API Endpoints
-        self.altcoin_season_url = "https://www.blockchaincenter.net/en/altcoin-season-index/"
-        self.santiment_url = "https://api.santiment.net/graphql"
-        self.santiment_api_key = os.getenv("SANTIMENT_API_KEY")  # Get API key from .env
-        self.fear_greed_url = "https://api.alternative.me/fng/"  # Crypto Fear & Greed Index
-        self.yahoo_url = "https://finance.yahoo.com/quote/%5EVIX/"
+        self.altcoin_season_url = ALTCOIN_SEASON_URL
+        self.fear_greed_url = FEAR_GREED_URL  # Crypto Fear & Greed Index
+        self.yahoo_url = VIX_URL
+        # Fear & Greed, VIX and Altcoin Season data, shared with the CLI agent (main.py)
+        self.market_data = get_market_data()
         # Initialize Reddit API client
         self.reddit = praw.Reddit(
             client_id=os.getenv("REDDIT_CLIENT_ID"),
             client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            user_agent=os.getenv("REDDIT_USER_AGENT")
+            user_agent=os.getenv("REDDIT_USER_AGENT"),
+            timeout=REQUEST_TIMEOUT
         )
+        # Scoring weights and thresholds (tuned by optimizer.py when a config file exists)
+        self.market_condition_weights, self.market_condition_thresholds = load_market_condition_config()
+        # Indicators scored by determine_market_condition, each refreshed on its own TTL
+        self.indicator_registry = SourceRegistry(self.indicator_sources())
+
+    def indicator_sources(self):
+        """
+        The indicators of the market condition score with their fetch, cadence, cost and weight.
+
+        Register another IndicatorSource on self.indicator_registry to add an indicator to the score.
+        """
+        weights = self.market_condition_weights
+        market_data = self.market_data
+        return [
+            IndicatorSource(
+                "fear_and_greed", market_data.fetch_fear_and_greed,
+                lambda record: int(record["value"]) / INDICATOR_SCALES["fear_and_greed"],
+                weights["fear_and_greed"], ttl=3600, cost=1,  # Updated daily, one small JSON request
+            ),
+            IndicatorSource(
+                "tradfi", market_data.fetch_vix, lambda quote: quote["value"] / INDICATOR_SCALES["tradfi"],
+                weights["tradfi"], ttl=900, cost=2,  # Moves intraday, one page scrape
+            ),
+            IndicatorSource(
+                "santiment", lambda slug: self._fetch_santiment_data(slug, SANTIMENT_METRIC),
+                scaled(INDICATOR_SCALES["santiment"]), weights["santiment"], ttl=3600, cost=5,  # API credits
+                per_asset=True, fallback_asset="ethereum",
+            ),
+            IndicatorSource(
+                "reddit", lambda: self._fetch_reddit_sentiment(REDDIT_SUBREDDIT, REDDIT_POST_LIMIT)["average_sentiment"],
+                scaled(INDICATOR_SCALES["reddit"]), weights["reddit"], ttl=3600, cost=10,  # A request per post
+            ),
+            # Shown next to the score but not part of it
+            IndicatorSource("altcoin_season", market_data.fetch_altcoin_season, scaled(100), 0.0, ttl=3600, cost=2),
+        ]
 
     @conditional_cache(ttl=3600)  # Replace @st.cache_data with @conditional_cache
     def get_fear_and_greed_index(_self):
         """Fetch the Fear & Greed Index from alternativec.me."""
         try:
-            url = _self.fear_greed_url
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # Raise an error for bad responses
-
-            # Parse the JSON response
-            data = response.json()
-            if "data" not in data or not data["data"]:
-                raise ValueError("No Fear & Greed Index data found in response")
-
             # Extract the latest Fear & Greed Index value
-            latest_data = data["data"][0]
-            value = int(latest_data["value"])
-            classification = latest_data["value_classification"]
-            timestamp = int(latest_data["timestamp"])  # Ensure timestamp is an integer
+            fear_and_greed = _self.market_data.fear_and_greed()
+            value = fear_and_greed["value"]
+            classification = fear_and_greed["classification"]
+            timestamp = fear_and_greed["timestamp"]
             readable_date = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%B %d, %Y, %H:%M:%S UTC')
             return {
                 "value": value,
                 "classification": classification,
-                "date_fetched": readable_date
+                "date_fetched": readable_date,
+                "stale": fear_and_greed["stale"]
             }
         except Exception as e:
             print(f"Failed to fetch Fear & Greed Index data: {e}")
@@ -82,25 +116,8 @@ class Sentiment:
     def get_tradfi_sentiment(_self):
         """Fetch and analyze TradFi sentiment (VIX)."""
         try:
-            yahoo_url = _self.yahoo_url
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-            }
-            response = requests.get(yahoo_url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract VIX value, change, and percent change from Yahoo Finance
-            vix_element = soup.find('fin-streamer', {'data-field': 'regularMarketPrice'})
-            if not vix_element:
-                raise ValueError("VIX value element not found in Yahoo Finance HTML")
-            
-            vix_value_str = vix_element.text
-            vix_value = float(vix_value_str.replace(',', ''))  # Remove commas and convert to float
-            
-            # Extract change and percent change
-            change = float(soup.find('fin-streamer', {'data-field': 'regularMarketChange'}).text)
-            change_percent = float(soup.find('fin-streamer', {'data-field': 'regularMarketChangePercent'}).text.strip('()%'))
+            vix = _self.market_data.vix()
+            vix_value, change, change_percent = vix["value"], vix["change"], vix["change_percent"]
             
             # Analyze VIX value
             analysis = _self._analyze_vix_value(vix_value)
@@ -110,7 +127,8 @@ class Sentiment:
                 'change': change,  # Add change
                 'change_percent': change_percent,  # Add percent change
                 'analysis': analysis,
-                'source': 'Yahoo Finance'
+                'source': 'Yahoo Finance',
+                'stale': vix["stale"]
             }
         except Exception as e:
             print(f"Yahoo Finance fallback failed: {e}")
@@ -138,134 +156,118 @@ class Sentiment:
             dict: A dictionary containing average sentiment and sample posts.
         """
         try:
-            # Fetch posts from the subreddit
-            subreddit = _self.reddit.subreddit(subreddit)
-            posts = subreddit.new(limit=limit)
-
-            # Analyze sentiment for each post
-            sentiment_scores = []
-            sample_posts = []
-
-            for post in posts:
-                # Analyze post title
-                title_blob = TextBlob(post.title)
-                title_sentiment = title_blob.sentiment.polarity
-
-                # Analyze post comments (top 5 comments)
-                post.comments.replace_more(limit=0)
-                comment_sentiments = []
-                for comment in post.comments[:5]:
-                    comment_blob = TextBlob(comment.body)
-                    comment_sentiments.append(comment_blob.sentiment.polarity)
-
-                # Average sentiment for the post
-                post_sentiment = (title_sentiment + sum(comment_sentiments)) / (1 + len(comment_sentiments))
-                sentiment_scores.append(post_sentiment)
-
-                # Store sample post data
-                sample_posts.append({
-                    "title": post.title,
-                    "score": post.score,
-                    "sentiment": post_sentiment
-                })
-
-            # Calculate average sentiment
-            average_sentiment = sum(sentiment_scores) / len(sentiment_scores)
-
-            return {
-                "average_sentiment": average_sentiment
-                #"sample_posts": sample_posts
-            }
-
+            # The reddit indicator's value (collected or fetched through its breaker) is only used when
+            # it covers the same posts
+            if subreddit == REDDIT_SUBREDDIT and limit == REDDIT_POST_LIMIT:
+                average_sentiment, stale = _self.market_data.collected(
+                    "reddit", lambda: _self._fetch_reddit_sentiment(subreddit, limit)["average_sentiment"]
+                )
+                return {"average_sentiment": average_sentiment, "stale": stale}
+            reading = get_health_registry().call(
+                f"reddit/{subreddit}/{limit}", _self._fetch_reddit_sentiment, subreddit, limit
+            )
+            return dict(reading.value, stale=reading.stale)
         except Exception as e:
             print(f"Failed to fetch Reddit sentiment: {e}")
             return None
 
+    def _fetch_reddit_sentiment(self, subreddit, limit):
+        """Fetch posts from a subreddit and average the sentiment of their titles and top comments."""
+        # Fetch posts from the subreddit
+        subreddit = self.reddit.subreddit(subreddit)
+        posts = subreddit.new(limit=limit)
+
+        # Analyze sentiment for each post
+        sentiment_scores = []
+        sample_posts = []
+
+        for post in posts:
+            # Analyze post title
+            title_blob = TextBlob(post.title)
+            title_sentiment = title_blob.sentiment.polarity
+
+            # Analyze post comments (top 5 comments)
+            post.comments.replace_more(limit=0)
+            comment_sentiments = []
+            for comment in post.comments[:5]:
+                comment_blob = TextBlob(comment.body)
+                comment_sentiments.append(comment_blob.sentiment.polarity)
+
+            # Average sentiment for the post
+            post_sentiment = (title_sentiment + sum(comment_sentiments)) / (1 + len(comment_sentiments))
+            sentiment_scores.append(post_sentiment)
+
+            # Store sample post data
+            sample_posts.append({
+                "title": post.title,
+                "score": post.score,
+                "sentiment": post_sentiment
+            })
+
+        # Calculate average sentiment
+        average_sentiment = sum(sentiment_scores) / len(sentiment_scores)
+
+        return {
+            "average_sentiment": average_sentiment
+            #"sample_posts": sample_posts
+        }
+
     @conditional_cache(ttl=3600)  # Replace @st.cache_data with @conditional_cache
     def get_santiment_data(_self, crypto_slug="ethereum", metric="daily_active_addresses"):
         """Fetch sentiment data from Santiment API."""
         try:
-            # Define date range (from 7 days ago to now)
-            to_date = datetime.now(UTC)
-            from_date = to_date - timedelta(days=7)
-
-            # GraphQL query
-            query = """
-            {
-                getMetric(metric: "%s") {
-                    timeseriesData(
-                        slug: "%s",
-                        from: "%s",
-                        to: "%s",
-                        interval: "1d"
-                    ) {
-                        datetime
-                        value
-                    }
-                }
-            }
-            """ % (metric, crypto_slug, from_date.isoformat(), to_date.isoformat())
-
-            # Headers with API key
-            headers = {
-                "Authorization": f"Apikey {_self.santiment_api_key}",
-                "Content-Type": "application/json",
-            }
-
-            # Make the API request
-            response = requests.post(_self.santiment_url, json={"query": query}, headers=headers)
-            response.raise_for_status()  # Raise an error for bad responses
-
-            # Parse the response
-            data = response.json()
-
-            # Handle error response
-            if "errors" in data:
-                print(f"Santiment API error: {data['errors'][0]['message']}")
-                return None
-
-            # Extract the latest sentiment value
-            if "data" not in data or not data["data"]:
-                raise ValueError("No data returned from Santiment API")
-
-            timeseries_data = data["data"]["getMetric"]["timeseriesData"]
-            if not timeseries_data:
-                raise ValueError("No timeseries data found")
-
-            latest_data = timeseries_data[0]
-            return latest_data["value"]
-
+            if metric == SANTIMENT_METRIC:
+                value, stale = _self.market_data.collected(
+                    "santiment", lambda: _self._fetch_santiment_data(crypto_slug, metric), asset=crypto_slug
+                )
+                if stale:
+                    print(f"Using stale Santiment data for {crypto_slug}")
+                return value
+            # Behind a circuit breaker per slug and metric; during an outage the last good value is used
+            reading = get_health_registry().call(
+                f"santiment/{crypto_slug}/{metric}", _self._fetch_santiment_data, crypto_slug, metric
+            )
+            if reading.stale:
+                print(f"Using stale Santiment data for {crypto_slug} ({reading.age:.0f}s old): {reading.error}")
+            return reading.value
         except Exception as e:
             print(f"Failed to fetch Santiment data: {e}")
             return None
-        
+
+    def _fetch_santiment_data(self, crypto_slug, metric):
+        """
+        Latest daily value of a Santiment metric.
+
+        Served from the local timeseries, which only requests the days after the last stored one.
+        """
+        cache = get_santiment_cache()
+        try:
+            cache.refresh(crypto_slug, metric)
+        except Exception as e:
+            # Serve the stored history if the refresh fails
+            if cache.latest(crypto_slug, metric) is None:
+                raise
+            print(f"Error refreshing Santiment data for {crypto_slug}, using stored values: {e}")
+        latest = cache.latest(crypto_slug, metric)
+        return None if latest is None else latest[1]
+
     # Fetch Altcoin Season data with caching
     @conditional_cache(ttl=3600)  # Replace @st.cache_data with @conditional_cache
     def get_altcoin_season_index(_self):
         """Fetch the Altcoin Season Index from the webpage."""
         try:
-            url = _self.altcoin_season_url
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Find the Altcoin Season Index text
-            index_text = soup.find("button", class_="nav-link timeselect active").text.strip()  # Update the selector
-            match = re.search(r"\((\d+)\)", index_text)
-            if match:
-                value = int(match.group(1))
-                season_message = "Altcoin Season" if value > 75 else "Bitcoin Season"
-                return {
-                    "value": value,
-                    "season": season_message
-                }
-            else:
-                st.warning("Altcoin Season Index value not found on the page.")
+            try:
+                altcoin_season = _self.market_data.altcoin_season()
+            except SourceUnavailable as e:
+                st.warning(f"Altcoin Season Index not available: {e}")
                 return None
+            value = altcoin_season["value"]
+            season_message = "Altcoin Season" if value > 75 else "Bitcoin Season"
+            return {
+                "value": value,
+                "season": season_message,
+                "stale": altcoin_season["stale"]
+            }
         except Exception as e:
             st.error(f"Error fetching Altcoin Season Index: {e}")
             return None
@@ -277,49 +279,20 @@ class Sentiment:
         Returns:
             str: The overall market condition (e.g., "bullish", "bearish", "neutral").
         """
-        # Fetch data from all sources
-        santiment_data = _self.get_santiment_data(crypto_slug=crypto_slug, metric="daily_active_addresses")
-        if santiment_data is None:
-            # Fallback to Ethereum if no data is found for the provided crypto_slug
-            print(f"No Santiment data found for {crypto_slug}, falling back to Ethereum...")
-            santiment_data = _self.get_santiment_data(crypto_slug="ethereum", metric="daily_active_addresses")
-
-        fear_and_greed = _self.get_fear_and_greed_index()
-        tradfi_sentiment = _self.get_tradfi_sentiment()
-        reddit_sentiment = _self.get_reddit_sentiment(subreddit="cryptocurrency", limit=10)
-
-        # Print fetched data for debugging
-        print("Santiment Data:", santiment_data)
-        print("Fear & Greed Index:", fear_and_greed)
-        print("TradFi Sentiment:", tradfi_sentiment)
-        print("Reddit Sentiment:", reddit_sentiment)
-
-        # Determine weights for each data source
-        weights = {
-            "santiment": 0.3,
-            "fear_and_greed": 0.3,
-            "tradfi": 0.1,
-            "reddit": 0.3
-        }
-
-        # Calculate weighted scores
-        santiment_score = santiment_data / 10000 if santiment_data else 0  # Normalize Santiment data
-        fear_and_greed_score = fear_and_greed["value"] / 100 if fear_and_greed else 0  # Normalize Fear & Greed Index
-        tradfi_score = tradfi_sentiment["value"] / 100 if tradfi_sentiment else 0  # Normalize TradFi Sentiment
-        reddit_score = reddit_sentiment["average_sentiment"] if reddit_sentiment else 0  # Use Reddit sentiment directly
-
-        # Calculate overall score
-        overall_score = (
-            santiment_score * weights["santiment"] +
-            fear_and_greed_score * weights["fear_and_greed"] +
-            tradfi_score * weights["tradfi"] +
-            reddit_score * weights["reddit"]
+        # A running collector (collector.py) has already scored the asset
+        collected = get_snapshot_reader().market_condition(crypto_slug)
+        if collected is not None:
+            return collected["condition"]
+
+        # Refresh the sources that are due (concurrently) and score the fresh values with the shared
+        # weights and thresholds (also used by the backtester). Sources without a recent value are left
+        # out and the weights renormalized over the rest.
+        score, condition, values = _self.indicator_registry.score(
+            crypto_slug, thresholds=_self.market_condition_thresholds
         )
 
-        # Determine market condition based on overall score
-        if overall_score > 0.6:
-            return "bullish"
-        elif overall_score < 0.4:
-            return "bearish"
-        else:
-            return "neutral"
+        # Print the values used for debugging
+        for name, value in values.items():
+            print(f"{name}: {value['raw']}{' (stale)' if value['stale'] else ''}")
+        print(f"Market condition score: {score:.3f} ({condition})")
+        return condition
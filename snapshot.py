@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+SNAPSHOT_FILE = "data/snapshot.json"
+SNAPSHOT_MAX_AGE = 900  # Seconds after which a snapshot is ignored (the collector is presumed down)
+
+
+def write_snapshot(snapshot, path=SNAPSHOT_FILE):
+    """Publish a snapshot atomically: readers see either the previous file or the new one, never a partial write."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class SnapshotReader:
+    """
+    Reads the snapshot published by collector.py.
+
+    The file is only parsed again when os.stat shows it was replaced, so a lookup costs a stat
+    call and a dict access. Lookups return None when there is no snapshot, it is older than
+    max_age or it lacks the value, and callers then fetch the value themselves.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE, max_age=SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._signature = None
+        self._snapshot = None
+
+    def snapshot(self):
+        """The current snapshot dict, or None if missing or too old."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        self._snapshot = json.load(file)
+                except (FileNotFoundError, ValueError):
+                    self._snapshot = None
+                self._signature = signature
+            snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot.get("generated_at", 0) > self.max_age:
+            return None
+        return snapshot
+
+    def indicator(self, name, asset=None):
+        """
+        A collected indicator value: {"raw", "fetched_at", "stale"}.
+
+        Args:
+            name (str): Indicator source name (see Sentiment.indicator_sources).
+            asset (str): Asset of per-asset indicators.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+        if asset is None:
+            return snapshot["indicators"].get(name)
+        return snapshot["assets"].get(asset, {}).get("indicators", {}).get(name)
+
+    def market_condition(self, asset):
+        """The collected market condition of an asset: {"score", "condition"}."""
+        snapshot = self.snapshot()
+        if snapshot is None or asset not in snapshot["assets"]:
+            return None
+        entry = snapshot["assets"][asset]
+        return {"score": entry["score"], "condition": entry["condition"]}
+
+    def price(self, coin_id):
+        """The collected USD price of an asset (CoinGecko id)."""
+        snapshot = self.snapshot()
+        return None if snapshot is None else snapshot["prices"].get(coin_id)
+
+
+_snapshot_reader = None
+_snapshot_reader_lock = threading.Lock()
+
+
+def get_snapshot_reader():
+    """Return the process-wide SnapshotReader."""
+    global _snapshot_reader
+    with _snapshot_reader_lock:
+        if _snapshot_reader is None:
+            _snapshot_reader = SnapshotReader()
+        return _snapshot_reader
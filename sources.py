@@ -0,0 +1,227 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from health import SourceUnavailable, get_health_registry
+from market_condition import REGIMES, classify_scores, weighted_scores
+
+DEFAULT_TTL = 3600
+STALE_FACTOR = 2  # Values older than STALE_FACTOR TTLs are left out of the score
+SCHEDULER_INTERVAL = 30  # Seconds between the scheduler's checks for due sources
+MAX_WORKERS = 4  # Sources fetched concurrently
+
+
+class IndicatorSource:
+    """
+    A market indicator: how to fetch it, how often, how to normalize it and how much it counts.
+
+    Args:
+        name (str): Indicator name, also the key of its weight in weight dicts.
+        fetch (callable): Returns the raw value, or None when there is no data. Per-asset sources
+            are called with the asset (e.g. a Santiment slug).
+        normalize (callable): Maps the raw value to the scale of the score (roughly 0-1).
+        weight (float): Default weight in the score.
+        ttl (int): Seconds a value stays fresh before the source is due again.
+        cost (float): Relative cost of a fetch (requests, API credits); cheaper sources are refreshed first.
+        per_asset (bool): The value depends on the asset being analyzed.
+        fallback_asset (str): Asset whose value is used when a per-asset source has none for the asset.
+    """
+
+    def __init__(self, name, fetch, normalize, weight, ttl=DEFAULT_TTL, cost=1.0, per_asset=False, fallback_asset=None):
+        self.name = name
+        self.fetch = fetch
+        self.normalize = normalize
+        self.weight = weight
+        self.ttl = ttl
+        self.cost = cost
+        self.per_asset = per_asset
+        self.fallback_asset = fallback_asset
+
+
+def scaled(scale):
+    """Normalization that divides the raw value by a fixed scale."""
+    return lambda value: float(value) / scale
+
+
+class SourceRegistry:
+    """
+    Indicator sources with their latest values, a scheduler and a scorer.
+
+    Every source is refreshed on its own TTL, through the circuit breaker of the health registry,
+    and due sources are fetched concurrently, cheapest first. The score combines whatever values
+    are fresh enough, renormalizing the weights over them (see market_condition.weighted_scores),
+    so adding an indicator is a register() call rather than an edit of the scoring code.
+    """
+
+    def __init__(self, sources=(), max_workers=MAX_WORKERS):
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._readings = {}  # (name, asset) -> (raw value, fetched at, stale)
+        self._refreshing = set()
+        self._assets = set()  # Assets per-asset sources have been asked for; the scheduler keeps them fresh
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="indicator-source")
+        self._stop = threading.Event()
+        self._thread = None
+        for source in sources:
+            self.register(source)
+
+    def register(self, source):
+        """Add a source, replacing any source of the same name."""
+        with self._lock:
+            self._sources[source.name] = source
+
+    def track(self, *assets):
+        """Keep per-asset sources fresh for these assets from now on."""
+        with self._lock:
+            self._assets.update(asset for asset in assets if asset is not None)
+
+    @property
+    def sources(self):
+        with self._lock:
+            return list(self._sources.values())
+
+    def _keys(self, source, asset):
+        if not source.per_asset:
+            return [(source.name, None)]
+        return [(source.name, asset)] + ([(source.name, source.fallback_asset)] if source.fallback_asset else [])
+
+    def _due(self):
+        """Claim the (source, asset) pairs whose value is missing or older than their TTL, cheapest first."""
+        now = time.time()
+        due = []
+        with self._lock:
+            for source in self._sources.values():
+                for asset in (sorted(self._assets) if source.per_asset else [None]):
+                    key = (source.name, asset)
+                    reading = self._readings.get(key)
+                    if key not in self._refreshing and (reading is None or now - reading[1] >= source.ttl):
+                        self._refreshing.add(key)
+                        due.append((source, asset))
+        return sorted(due, key=lambda pair: pair[0].cost)
+
+    def _fetch(self, source, asset):
+        key = (source.name, asset)
+        args = (asset,) if source.per_asset else ()
+        reading = get_health_registry().call("/".join(filter(None, key)), source.fetch, *args)
+        with self._lock:
+            self._readings[key] = (reading.value, reading.as_of, reading.stale)
+
+    def _refresh_one(self, source, asset):
+        try:
+            self._fetch(source, asset)
+            return True
+        except SourceUnavailable as e:
+            print(f"Indicator {source.name} unavailable for {asset or 'the market'}: {e}")
+            fallback = source.fallback_asset
+            if not source.per_asset or fallback is None or fallback == asset:
+                return False
+            # No value for the asset: make sure the fallback asset's value is there to be used instead
+            with self._lock:
+                reading = self._readings.get((source.name, fallback))
+            if reading is not None and time.time() - reading[1] < source.ttl:
+                return False
+            try:
+                self._fetch(source, fallback)
+                return True
+            except SourceUnavailable as e:
+                print(f"Indicator {source.name} unavailable for {fallback}: {e}")
+                return False
+        finally:
+            with self._lock:
+                self._refreshing.discard((source.name, asset))
+
+    def refresh_due(self, asset=None, wait=True):
+        """
+        Refresh every source that is due, concurrently.
+
+        Args:
+            asset (str): Also refresh per-asset sources for this asset (remembered for the scheduler).
+            wait (bool): Wait for the fetches to finish.
+
+        Returns:
+            int: The number of sources refreshed (started, when not waiting).
+        """
+        self.track(asset)
+        due = self._due()
+        futures = [self._executor.submit(self._refresh_one, source, target) for source, target in due]
+        if not wait:
+            return len(futures)
+        return sum(future.result() for future in futures)
+
+    def values(self, asset=None):
+        """
+        Fresh values of every source.
+
+        Returns:
+            dict: Source name -> {"raw", "normalized", "age", "stale", "asset"}, for sources with a
+                value at most STALE_FACTOR TTLs old. "asset" is the asset the value is of (the
+                fallback asset when the asset has none; None for market-wide sources).
+        """
+        now = time.time()
+        values = {}
+        for source in self.sources:
+            with self._lock:
+                readings = [(key[1], self._readings.get(key)) for key in self._keys(source, asset)]
+            found = next(
+                ((owner, r) for owner, r in readings if r is not None and now - r[1] < source.ttl * STALE_FACTOR), None
+            )
+            if found is None:
+                continue
+            value_asset, (raw, fetched_at, stale) = found
+            values[source.name] = {
+                "raw": raw,
+                "normalized": source.normalize(raw),
+                "age": now - fetched_at,
+                "stale": stale,
+                "asset": value_asset,
+            }
+        return values
+
+    def score(self, asset=None, weights=None, thresholds=None, refresh=True):
+        """
+        Score the market condition from the fresh source values.
+
+        Args:
+            asset (str): Asset for per-asset sources.
+            weights (dict): Weight overrides by source name; other sources use their declared weight.
+            thresholds (dict): "bullish" and "bearish" score thresholds.
+            refresh (bool): Refresh due sources first.
+
+        Returns:
+            tuple: (score, "bullish", "bearish" or "neutral", values used as returned by values()).
+        """
+        if refresh:
+            self.refresh_due(asset)
+        values = self.values(asset)
+        weights = weights or {}
+        sources = self.sources
+        features = np.array([[values[s.name]["normalized"] if s.name in values else np.nan for s in sources]])
+        weight_row = np.array([weights.get(s.name, s.weight) for s in sources], dtype=float)
+        score = float(weighted_scores(features, weight_row)[0]) if sources else float("nan")
+        return score, REGIMES[int(classify_scores(score, thresholds))], values
+
+    def start(self, interval=SCHEDULER_INTERVAL):
+        """Refresh due sources in a background thread every `interval` seconds."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh_due()
+                except Exception as e:
+                    print(f"Error refreshing indicator sources: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="indicator-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background scheduler."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
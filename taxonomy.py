@@ -0,0 +1,121 @@
+import re
+
+DEFAULT_SMART_CONTRACT_RISK = 0.5  # When a strategy names no known protocol or action
+COMPOSITION_RISK = 0.05  # Added per extra protocol a strategy chains together
+MIN_RISK = 0.1
+MAX_RISK = 1.0
+
+# Protocols by canonical name: aliases (including their receipt tokens), category and risk tier
+# from 0.1 (long-running, heavily audited) to 1.0 (new or unaudited)
+PROTOCOLS = {
+    "aave": {"aliases": ["aave", "aave v3"], "category": "lending", "tier": 0.25},
+    "compound": {"aliases": ["compound"], "category": "lending", "tier": 0.3},
+    "maker": {"aliases": ["maker", "makerdao", "sky protocol", "dai savings rate", "sdai"], "category": "lending", "tier": 0.3},
+    "spark": {"aliases": ["spark", "sparklend"], "category": "lending", "tier": 0.35},
+    "morpho": {"aliases": ["morpho"], "category": "lending", "tier": 0.4},
+    "kamino": {"aliases": ["kamino"], "category": "lending", "tier": 0.5},
+    "navi": {"aliases": ["navi", "navi protocol"], "category": "lending", "tier": 0.6},
+    "scallop": {"aliases": ["scallop"], "category": "lending", "tier": 0.6},
+    "suilend": {"aliases": ["suilend"], "category": "lending", "tier": 0.6},
+    "lido": {"aliases": ["lido", "steth", "wsteth"], "category": "liquid staking", "tier": 0.25},
+    "rocket pool": {"aliases": ["rocket pool", "rocketpool", "reth"], "category": "liquid staking", "tier": 0.3},
+    "jito": {"aliases": ["jito", "jitosol"], "category": "liquid staking", "tier": 0.35},
+    "marinade": {"aliases": ["marinade", "msol"], "category": "liquid staking", "tier": 0.35},
+    "eigenlayer": {"aliases": ["eigenlayer", "eigen layer"], "category": "restaking", "tier": 0.6},
+    "uniswap": {"aliases": ["uniswap", "uniswap v2", "uniswap v3"], "category": "dex", "tier": 0.3},
+    "curve": {"aliases": ["curve", "curve finance"], "category": "dex", "tier": 0.35},
+    "balancer": {"aliases": ["balancer"], "category": "dex", "tier": 0.45},
+    "sushiswap": {"aliases": ["sushiswap", "sushi"], "category": "dex", "tier": 0.45},
+    "pancakeswap": {"aliases": ["pancakeswap"], "category": "dex", "tier": 0.45},
+    "aerodrome": {"aliases": ["aerodrome"], "category": "dex", "tier": 0.45},
+    "orca": {"aliases": ["orca"], "category": "dex", "tier": 0.45},
+    "raydium": {"aliases": ["raydium"], "category": "dex", "tier": 0.5},
+    "cetus": {"aliases": ["cetus"], "category": "dex", "tier": 0.6},
+    "gmx": {"aliases": ["gmx", "glp"], "category": "derivatives", "tier": 0.55},
+    "pendle": {"aliases": ["pendle"], "category": "yield", "tier": 0.55},
+    "ethena": {"aliases": ["ethena", "usde", "susde"], "category": "synthetic dollar", "tier": 0.6},
+    "yearn": {"aliases": ["yearn", "yearn.finance"], "category": "yield", "tier": 0.45},
+    "convex": {"aliases": ["convex"], "category": "yield", "tier": 0.45},
+    "alphafi": {"aliases": ["alphafi"], "category": "yield", "tier": 0.7},
+}
+
+# Chains by canonical name: aliases and the risk added for the chain (bridges, sequencers, maturity)
+CHAINS = {
+    "ethereum": {"aliases": ["ethereum mainnet", "mainnet", "l1"], "adjustment": 0.0},
+    "base": {"aliases": ["on base", "base l2", "base chain"], "adjustment": 0.05},
+    "arbitrum": {"aliases": ["arbitrum"], "adjustment": 0.05},
+    "optimism": {"aliases": ["optimism"], "adjustment": 0.05},
+    "polygon": {"aliases": ["polygon"], "adjustment": 0.05},
+    "bnb chain": {"aliases": ["bnb chain", "bsc", "binance smart chain"], "adjustment": 0.05},
+    "avalanche": {"aliases": ["avalanche"], "adjustment": 0.05},
+    "solana": {"aliases": ["solana"], "adjustment": 0.05},
+    "sui": {"aliases": ["sui"], "adjustment": 0.1},
+}
+
+# Actions by canonical name: phrasings and their risk (the legacy keyword scores for lending,
+# liquidity pools and leveraging are kept)
+ACTIONS = {
+    "stake": {"aliases": ["stake", "staking", "staked", "validator", "validators"], "risk": 0.2},
+    "lend": {"aliases": ["lend", "lending", "supply", "supplying", "deposit", "depositing"], "risk": 0.3},
+    "provide liquidity": {
+        "aliases": ["liquidity pool", "liquidity pools", "provide liquidity", "providing liquidity", "lp", "amm"],
+        "risk": 0.5,
+    },
+    "farm": {"aliases": ["farm", "farming", "yield farming", "yield farm"], "risk": 0.5},
+    "borrow": {"aliases": ["borrow", "borrowing", "borrowed", "borrow against"], "risk": 0.55},
+    "restake": {"aliases": ["restake", "restaking", "restaked"], "risk": 0.6},
+    "bridge": {"aliases": ["bridge", "bridging", "bridged"], "risk": 0.6},
+    "leverage": {"aliases": ["leverage", "leveraging", "leveraged", "loop", "looping"], "risk": 0.7},
+}
+
+
+def _build_matcher():
+    """Compile every alias into one alternation regex and map each alias to (kind, name)."""
+    lookup = {}
+    for kind, entries in (("protocols", PROTOCOLS), ("chains", CHAINS), ("actions", ACTIONS)):
+        for name, entry in entries.items():
+            for alias in entry["aliases"]:
+                lookup.setdefault(alias.lower(), (kind, name))
+    # Longest aliases first so "uniswap v3" wins over "uniswap"; whitespace inside aliases is flexible
+    alternation = "|".join(
+        re.escape(alias).replace(r"\ ", r"\s+") for alias in sorted(lookup, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<![\w.])(?:{alternation})(?![\w])", re.IGNORECASE), lookup
+
+
+_PATTERN, _ALIASES = _build_matcher()
+
+
+def classify_strategy(text):
+    """
+    Extract the protocols, chains and actions of a strategy and score its smart contract risk.
+
+    The risk is the riskiest protocol tier or action, plus COMPOSITION_RISK per extra protocol
+    and the largest chain adjustment, clamped to MIN_RISK-MAX_RISK.
+
+    Returns:
+        dict: {"protocols": [...], "chains": [...], "actions": [...], "risk": float}, names in order of first mention.
+    """
+    found = {"protocols": {}, "chains": {}, "actions": {}}
+    for match in _PATTERN.finditer(text or ""):
+        kind, name = _ALIASES[" ".join(match.group(0).lower().split())]
+        found[kind].setdefault(name, None)
+    protocols, chains, actions = (list(found[kind]) for kind in ("protocols", "chains", "actions"))
+
+    components = [PROTOCOLS[name]["tier"] for name in protocols] + [ACTIONS[name]["risk"] for name in actions]
+    if not components:
+        risk = DEFAULT_SMART_CONTRACT_RISK
+    else:
+        risk = max(components) + COMPOSITION_RISK * max(len(protocols) - 1, 0)
+        risk += max((CHAINS[name]["adjustment"] for name in chains), default=0.0)
+    return {
+        "protocols": protocols,
+        "chains": chains,
+        "actions": actions,
+        "risk": round(min(max(risk, MIN_RISK), MAX_RISK), 2),
+    }
+
+
+def smart_contract_risk(text):
+    """Smart contract risk of a strategy text from 0.1 (low) to 1.0 (high)."""
+    return classify_strategy(text)["risk"]
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from backtest import Backtest, align_indicators, forward_returns
+from market_condition import score_market_condition
+from volatility import MS_PER_DAY
+
+
+# Test the shared scorer keeps the original weights, normalizations and thresholds
+def test_score_market_condition_matches_original_scoring():
+    score, condition = score_market_condition(5000, 80, 20, 0.5)
+    assert np.isclose(score, 0.5 * 0.3 + 0.8 * 0.3 + 0.2 * 0.1 + 0.5 * 0.3)
+    assert condition == "neutral"
+    assert score_market_condition(None, 10, None, None)[1] == "bearish"
+    assert score_market_condition(10000, 100, 30, 1.0)[1] == "bullish"
+
+
+# Test missing sources are left out and the weights renormalized instead of scoring them as 0
+def test_score_market_condition_renormalizes_missing_sources():
+    score, condition = score_market_condition(None, 80, None, 0.7)
+    assert np.isclose(score, (0.8 * 0.3 + 0.7 * 0.3) / 0.6)
+    assert condition == "bullish"
+    score, condition = score_market_condition(None, None, None, None)
+    assert np.isnan(score) and condition == "neutral"
+
+
+# Test indicators carry forward onto days they were not published (e.g. VIX on weekends)
+def test_align_indicators_as_of_join():
+    days = np.arange(19000, 19005)
+    values = align_indicators({"tradfi": [[19001 * MS_PER_DAY, 20.0], [19003 * MS_PER_DAY + 5, 25.0]]}, days)
+    assert np.isnan(values[0, 2])
+    assert list(values[1:, 2]) == [20.0, 20.0, 25.0, 25.0]
+    assert np.isnan(values[:, 0]).all()
+
+
+# Test forward returns and per-regime reporting on a hand-built history
+def test_backtest_reports_per_regime():
+    prices = np.array([100.0, 95.0, 90.0, 90.0, 120.0])
+    fear_and_greed = np.array([100.0, 0.0, 50.0, 100.0, 100.0])
+    indicators = np.column_stack([np.full(5, 10000.0), fear_and_greed, np.full(5, 30.0), np.full(5, 1.0)])
+    backtest = Backtest(np.arange(5), prices, indicators, horizons=(1,))
+
+    assert np.allclose(forward_returns(prices, 1)[:-1], np.log(prices[1:] / prices[:-1]))
+    assert list(backtest.signals()) == [1, 1, 1, 1, 1]
+
+    report = backtest.evaluate(thresholds={"bullish": 0.9, "bearish": 0.7})
+    assert report["regime_days"] == {"bullish": 3, "neutral": 1, "bearish": 1}
+    horizon = report["horizons"][1]
+    assert horizon["bullish"]["days"] == 2  # the last day has no forward return
+    assert horizon["bullish"]["hit_rate"] == 0.5
+    assert horizon["bearish"]["hit_rate"] == 1.0
+    assert horizon["neutral"]["hit_rate"] is None
+    assert np.isclose(horizon["hit_rate"], 2 / 3, atol=1e-6)
+
+
+# Test batch evaluation matches single evaluations and years of data stay fast
+def test_evaluate_many_matches_evaluate():
+    rng = np.random.default_rng(1)
+    days = 5 * 365
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, days)))
+    indicators = np.column_stack([
+        rng.uniform(0, 10000, days), rng.uniform(0, 100, days), rng.uniform(10, 40, days), rng.uniform(-1, 1, days),
+    ])
+    backtest = Backtest(np.arange(days), prices, indicators)
+
+    weights = rng.dirichlet(np.ones(4), size=50)
+    thresholds = np.column_stack([rng.uniform(0.5, 0.7, 50), rng.uniform(0.3, 0.5, 50)])
+    started = time.perf_counter()
+    batch = backtest.evaluate_many(weights, thresholds, 7)
+    assert time.perf_counter() - started < 1.0
+
+    names = ["santiment", "fear_and_greed", "tradfi", "reddit"]
+    single = backtest.evaluate(dict(zip(names, weights[3])), {"bullish": thresholds[3, 0], "bearish": thresholds[3, 1]})
+    assert np.isclose(batch["hit_rate"][3], single["horizons"][7]["hit_rate"], atol=1e-6)
@@ -0,0 +1,86 @@
+import json
+import time
+
+import pytest
+import requests
+
+from cassettes import Cassette, CassetteMiss
+from health import HealthRegistry
+from http_cache import ConditionalCache
+from market_data import COINGECKO_PRICE_URL, MarketData
+from snapshot import SnapshotReader
+
+
+def _fake_request(calls):
+    def request(session, method, url, params=None, **kwargs):
+        calls.append((method, url, params))
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Content-Encoding"] = "gzip"
+        response._content = json.dumps({"calls": len(calls)}).encode()
+        return response
+    return request
+
+
+# Test recorded responses are replayed without the network, in recorded order, query order ignored
+def test_record_then_replay(tmp_path, monkeypatch):
+    calls = []
+    fake_request = _fake_request(calls)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    path = str(tmp_path / "cassette.json")
+
+    with Cassette(path, mode="record"):
+        assert requests.get("https://example.com/a", params={"y": 2, "x": 1}).json() == {"calls": 1}
+        assert requests.get("https://example.com/a", params={"y": 2, "x": 1}).json() == {"calls": 2}
+        requests.post("https://example.com/b", json={"query": "now"})
+    assert len(calls) == 3
+
+    with Cassette(path) as cassette:
+        assert requests.get("https://example.com/a?x=1&y=2").json() == {"calls": 1}
+        assert requests.get("https://example.com/a", params={"x": 1, "y": 2}).json() == {"calls": 2}
+        assert requests.get("https://example.com/a", params={"x": 1, "y": 2}).json() == {"calls": 2}  # Last one repeats
+        # Matched by URL, not body
+        response = requests.post("https://example.com/b", json={"query": "later"})
+        assert response.json() == {"calls": 3}
+        assert "Content-Encoding" not in response.headers
+        with pytest.raises(CassetteMiss):
+            requests.get("https://example.com/missing")
+    assert len(calls) == 3
+    assert cassette.requests[0] == "GET https://example.com/a?x=1&y=2"
+    assert requests.Session.request is fake_request  # Unpatched on exit
+
+
+# Test replay adds the configured latency, per host when given
+def test_replay_latency(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    cassette = Cassette(path, mode="record")
+    cassette.add("GET", "https://slow.example.com/", body="slow")
+    cassette.add("GET", "https://fast.example.com/", body="fast")
+    cassette.save()
+
+    with Cassette(path, latency=0.05, latency_by_host={"fast.example.com": 0.0}):
+        started = time.perf_counter()
+        assert requests.get("https://slow.example.com/").text == "slow"
+        assert time.perf_counter() - started >= 0.05
+        started = time.perf_counter()
+        assert requests.get("https://fast.example.com/").text == "fast"
+        assert time.perf_counter() - started < 0.05
+
+
+# Test the shared market data layer runs offline from a cassette
+def test_market_data_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    cassette = Cassette(path, mode="record")
+    cassette.add("GET", COINGECKO_PRICE_URL, params={"ids": "bitcoin", "vs_currencies": "usd"},
+                 body=json.dumps({"bitcoin": {"usd": 65000.0}}), headers={"ETag": '"v1"'})
+    cassette.save()
+
+    market_data = MarketData(
+        http_cache=ConditionalCache(str(tmp_path / "http")),
+        health_registry=HealthRegistry(),
+        snapshot_reader=SnapshotReader(str(tmp_path / "snapshot.json")),
+    )
+    with Cassette(path) as replay:
+        assert market_data.price("bitcoin") == 65000.0
+    assert replay.requests == [f"GET {COINGECKO_PRICE_URL}?ids=bitcoin&vs_currencies=usd"]
@@ -0,0 +1,58 @@
+import os
+import time
+
+from collector import Collector
+from snapshot import SnapshotReader, write_snapshot
+from sources import IndicatorSource, SourceRegistry, scaled
+
+
+def _registry(calls):
+    def fng():
+        calls.append("fng")
+        return {"value": "80", "value_classification": "Extreme Greed", "timestamp": "1700000000"}
+
+    def addresses(slug):
+        calls.append(slug)
+        return {"ethereum": 9000.0}.get(slug)
+
+    return SourceRegistry([
+        IndicatorSource("collector-fng", fng, lambda record: int(record["value"]) / 100, 0.5),
+        IndicatorSource("collector-addresses", addresses, scaled(10000), 0.5, per_asset=True, fallback_asset="ethereum"),
+    ])
+
+
+# Test the collector publishes indicators, per-asset scores and prices that the reader serves
+def test_collector_publishes_snapshot(tmp_path):
+    calls = []
+    path = str(tmp_path / "snapshot.json")
+    collector = Collector(_registry(calls), ["ethereum", "dogecoin"], path=path, fetch_prices=lambda ids: {i: 1.5 for i in ids})
+    collector.publish()
+
+    reader = SnapshotReader(path)
+    assert reader.indicator("collector-fng")["raw"]["value"] == "80"
+    assert reader.indicator("collector-addresses", "ethereum")["raw"] == 9000.0
+    assert reader.indicator("collector-addresses", "dogecoin") is None  # Fallback values are not published as the asset's
+    condition = reader.market_condition("ethereum")
+    assert abs(condition["score"] - 0.85) < 1e-9 and condition["condition"] == "bullish"
+    assert reader.market_condition("dogecoin")["condition"] == "bullish"  # Scored with the fallback
+    assert reader.price("dogecoin") == 1.5
+
+    collector.publish()
+    assert calls.count("fng") == 1  # Sources are only fetched again after their TTL
+
+
+# Test the reader picks up replaced snapshots and ignores old ones
+def test_snapshot_reader_reloads_and_expires(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    reader = SnapshotReader(path, max_age=60)
+    assert reader.price("bitcoin") is None
+
+    snapshot = {"generated_at": time.time(), "indicators": {}, "assets": {}, "prices": {"bitcoin": 1.0}}
+    write_snapshot(snapshot, path)
+    assert reader.price("bitcoin") == 1.0
+    write_snapshot(dict(snapshot, prices={"bitcoin": 2.0}), path)
+    assert reader.price("bitcoin") == 2.0
+    assert os.listdir(tmp_path) == ["snapshot.json"]
+
+    write_snapshot(dict(snapshot, generated_at=time.time() - 61), path)
+    assert reader.price("bitcoin") is None
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from community_io import export_strategies, import_strategies, validate_strategy
+from community_store import get_community_store
+
+
+# Test NDJSON import validates, dedupes against the store and within the file
+def test_import_ndjson(tmp_path):
+    store_path = str(tmp_path / "community_strategies.json")
+    source = tmp_path / "seed.ndjson"
+    source.write_text("\n".join([
+        json.dumps({"crypto": "Bitcoin", "strategy": "Lend BTC on Aave", "market_condition": "bullish", "date_added": "2023-10-01 10:00:00"}),
+        json.dumps({"crypto": "bitcoin", "strategy": "lend btc on aave", "market_condition": "Bullish"}),
+        json.dumps({"crypto": "ethereum", "strategy": "Stake <script>", "market_condition": "bullish"}),
+        "{not json",
+        json.dumps({"crypto": "solana", "strategy": "Stake SOL", "market_condition": "sideways"}),
+        json.dumps({"crypto": "solana", "strategy": "Stake SOL", "market_condition": "neutral"}),
+    ]))
+
+    report = import_strategies(str(source), store_path=store_path, batch_size=2, score_risk=False)
+    assert report["read"] == 6
+    assert report["imported"] == 2
+    assert report["duplicates"] == 1
+    assert report["invalid"] == 3
+    assert len(json.loads(open(store_path).read())) == 2
+
+    # Importing the same file again only finds duplicates
+    again = import_strategies(str(source), store_path=store_path, score_risk=False)
+    assert again["imported"] == 0 and again["duplicates"] == 3
+
+
+# Test a CSV export can be imported back into an empty store
+def test_csv_round_trip(tmp_path):
+    store_path = str(tmp_path / "a.json")
+    get_community_store(store_path).add_many([
+        {"crypto": "sui", "strategy": "Stake SUI", "market_condition": "bullish", "date_added": "2023-10-01 10:00:00"},
+        {"crypto": "sui", "strategy": "Lend USDC, borrow SUI", "market_condition": "bearish", "date_added": "2023-10-02 10:00:00"},
+    ])
+    exported = export_strategies(str(tmp_path / "backup.csv"), store_path=store_path)
+    assert exported["exported"] == 2
+
+    copy_path = str(tmp_path / "b.json")
+    report = import_strategies(str(tmp_path / "backup.csv"), store_path=copy_path, score_risk=False)
+    assert report["imported"] == 2
+    assert get_community_store(copy_path).strategies == get_community_store(store_path).strategies
+
+
+def test_validate_strategy_fills_date():
+    record, error = validate_strategy({"crypto": "BTC", "strategy": "Hold", "market_condition": "neutral"})
+    assert error is None and record["date_added"]
+    assert validate_strategy({"crypto": "BTC", "strategy": "Hold", "market_condition": "neutral", "date_added": "yesterday"})[0] is None
+
+
+# Test imported strategies are risk-scored at ingest
+def test_import_scores_risk(tmp_path):
+    source = tmp_path / "seed.ndjson"
+    source.write_text("\n".join(
+        json.dumps({"crypto": "ethereum", "strategy": f"Lending ETH {i}", "market_condition": "bullish"}) for i in range(3)
+    ))
+    def volatility_lookup(crypto):
+        return 0.4, "2024-01-01 00:00:00"
+
+    store_path = str(tmp_path / "community_strategies.json")
+    import_strategies(str(source), store_path=store_path, volatility_lookup=volatility_lookup)
+    strategies = get_community_store(store_path).strategies
+    assert all(s["risk"]["inputs_as_of"] == "2024-01-01 00:00:00" for s in strategies)
+
+
+# Test a malformed carried-over risk is dropped and re-scored rather than stored
+def test_import_rescores_malformed_risk(tmp_path):
+    valid = {"factors": {"volatility": 0.1}, "overall": 2.5, "inputs_as_of": "2023-12-01 00:00:00"}
+    source = tmp_path / "seed.ndjson"
+    source.write_text("\n".join(json.dumps(record) for record in [
+        {"crypto": "ethereum", "strategy": "Lend ETH", "market_condition": "bullish", "risk": {"x": 1}},
+        {"crypto": "ethereum", "strategy": "Stake ETH", "market_condition": "bullish", "risk": dict(valid, overall="high")},
+        {"crypto": "ethereum", "strategy": "Hold ETH", "market_condition": "bullish", "risk": valid},
+    ]))
+    store_path = str(tmp_path / "community_strategies.json")
+    import_strategies(str(source), store_path=store_path, volatility_lookup=lambda crypto: (0.4, "2024-01-01 00:00:00"))
+
+    risks = {s["strategy"]: s["risk"] for s in get_community_store(store_path).strategies}
+    assert risks["Lend ETH"]["inputs_as_of"] == risks["Stake ETH"]["inputs_as_of"] == "2024-01-01 00:00:00"
+    assert risks["Hold ETH"] == valid
+    assert len(get_community_store(store_path).index.rank_by_risk("ethereum", "bullish")) == 3
+
+
+# Test a file failing mid-way still leaves the store flushed with the batches already added
+def test_import_failure_flushes_store(tmp_path):
+    source = tmp_path / "seed.ndjson"
+    lines = (json.dumps({"crypto": "ethereum", "strategy": f"Lend ETH {i}", "market_condition": "bullish"}) for i in range(500))
+    source.write_bytes("\n".join(lines).encode() + b"\n\xff")
+    store_path = str(tmp_path / "community_strategies.json")
+    with pytest.raises(UnicodeDecodeError):
+        import_strategies(str(source), store_path=store_path, batch_size=1, score_risk=False)
+
+    store = get_community_store(store_path)
+    assert not store._dirty
+    with open(store_path) as file:
+        assert len(json.load(file)) == len(store.strategies) > 0
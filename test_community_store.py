@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+import community_store
+from community_store import CommunityIndex, CommunityStore, get_community_store
+
+
+def _strategy(crypto, market_condition, date_added, text="Stake and earn rewards."):
+    return {"crypto": crypto, "strategy": text, "market_condition": market_condition, "date_added": date_added}
+
+
+# Test newest-k ordering and bucket isolation
+def test_top_k_returns_newest_first():
+    index = CommunityIndex([
+        _strategy("bitcoin", "bullish", "2023-10-01 10:00:00", "a"),
+        _strategy("bitcoin", "bullish", "2023-10-03 10:00:00", "c"),
+        _strategy("Bitcoin", "bullish", "2023-10-02 10:00:00", "b"),
+        _strategy("ethereum", "bullish", "2023-10-04 10:00:00", "eth"),
+    ])
+    page, cursor = index.top_k("bitcoin", "bullish", k=5)
+    assert [s["strategy"] for s in page] == ["c", "b", "a"]
+    assert cursor is None
+    assert index.count("BITCOIN", "Bullish") == 3
+    assert len(index) == 4
+
+
+# Test cursor pagination is stable when newer strategies are added between pages
+def test_cursor_pagination():
+    index = CommunityIndex([_strategy("solana", "neutral", f"2023-10-{day:02d} 10:00:00", str(day)) for day in range(1, 8)])
+    first, cursor = index.top_k("solana", "neutral", k=3)
+    assert [s["strategy"] for s in first] == ["7", "6", "5"]
+
+    index.add(_strategy("solana", "neutral", "2023-10-20 10:00:00", "new"))
+    second, cursor = index.top_k("solana", "neutral", k=3, cursor=cursor)
+    assert [s["strategy"] for s in second] == ["4", "3", "2"]
+    third, cursor = index.top_k("solana", "neutral", k=3, cursor=cursor)
+    assert [s["strategy"] for s in third] == ["1"]
+    assert cursor is None
+
+
+# Test out-of-order inserts and unknown buckets
+def test_add_out_of_order_and_missing_bucket():
+    index = CommunityIndex()
+    index.add(_strategy("sui", "bearish", "2023-10-05 10:00:00", "late"))
+    index.add(_strategy("sui", "bearish", "2023-10-01 10:00:00", "early"))
+    page, _ = index.top_k("sui", "bearish", k=1)
+    assert page[0]["strategy"] == "late"
+    assert index.top_k("sui", "bullish") == ([], None)
+
+
+# Test the shared snapshot is reused until the file changes
+def test_store_reloads_only_on_change(tmp_path):
+    path = tmp_path / "community_strategies.json"
+    path.write_text(json.dumps([_strategy("bitcoin", "bullish", "2023-10-01 10:00:00", "a")]))
+    store = CommunityStore(str(path))
+
+    first = store.strategies
+    generation = store.generation
+    assert store.strategies is first
+    assert store.generation == generation
+
+    # An external edit (new inode/mtime/size) invalidates the snapshot
+    path.write_text(json.dumps([
+        _strategy("bitcoin", "bullish", "2023-10-01 10:00:00", "a"),
+        _strategy("bitcoin", "bullish", "2023-10-02 10:00:00", "b"),
+    ]))
+    assert len(store.strategies) == 2
+    assert store.generation > generation
+    assert store.index.top_k("bitcoin", "bullish", k=1)[0][0]["strategy"] == "b"
+
+
+# Test writes through the store update the snapshot, dedupe and persist atomically
+def test_store_add_and_duplicates(tmp_path):
+    path = tmp_path / "community" / "community_strategies.json"
+    store = CommunityStore(str(path))
+    assert store.strategies == []
+
+    assert store.add(_strategy("sui", "neutral", "2023-10-01 10:00:00", "Stake SUI"))
+    assert not store.add(_strategy("SUI", "Neutral", "2023-10-02 10:00:00", "stake sui"))
+    assert store.is_duplicate("sui", "STAKE SUI", "neutral")
+    assert not store.is_duplicate("sui", "Stake SUI", "bullish")
+    assert json.loads(path.read_text()) == store.strategies
+
+    snapshot = store.strategies
+    assert store.strategies is snapshot  # our own write does not trigger a reload
+    assert get_community_store(str(path)) is get_community_store(str(path))
+
+
+# Test a failed write leaves the snapshot, duplicate check and dirty flag as they were
+def test_store_add_rolls_back_failed_write(tmp_path, monkeypatch):
+    path = tmp_path / "community_strategies.json"
+    store = CommunityStore(str(path))
+    assert store.add(_strategy("sui", "neutral", "2023-10-01 10:00:00", "Stake SUI"))
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(community_store.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        store.add(_strategy("sui", "neutral", "2023-10-02 10:00:00", "Lend SUI"))
+    monkeypatch.undo()
+
+    assert len(store.strategies) == 1
+    assert store.index.count("sui", "neutral") == 1
+    assert not store.is_duplicate("sui", "Lend SUI", "neutral")
+    assert store.add(_strategy("sui", "neutral", "2023-10-02 10:00:00", "Lend SUI"))
+    assert len(json.loads(path.read_text())) == 2
+    assert list(tmp_path.iterdir()) == [path]
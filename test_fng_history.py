@@ -0,0 +1,79 @@
+import numpy as np
+
+from fng_history import SECONDS_PER_DAY, FearGreedHistory
+
+TODAY = 20000  # Day number of 2024-10-04
+
+
+def _fetcher(values, calls, today=TODAY):
+    """Serve the last `limit` days of values ending today, newest first like alternative.me."""
+    def fetch(limit):
+        calls.append(limit)
+        days = range(today, today - len(values), -1)
+        points = list(zip(days, reversed(values)))
+        return points if limit == 0 else points[:limit]
+    return fetch
+
+
+# Test the first refresh loads the full history and later ones only append the missing days
+def test_bulk_load_then_append(tmp_path):
+    calls = []
+    values = list(range(10, 70))
+    history = FearGreedHistory(path=str(tmp_path / "fng.bin"), fetch=_fetcher(values, calls))
+    assert history.refresh(now=TODAY * SECONDS_PER_DAY) == 60
+    assert history.refresh(now=TODAY * SECONDS_PER_DAY + 3600) == 0
+    assert calls == [0]
+
+    values.extend([75, 80])
+    history.fetch = _fetcher(values, calls, today=TODAY + 2)
+    assert history.refresh(now=(TODAY + 2) * SECONDS_PER_DAY) == 2
+    assert calls[1] == 2
+    assert (tmp_path / "fng.bin").stat().st_size == 62 * 5
+
+    reopened = FearGreedHistory(path=str(tmp_path / "fng.bin"))
+    assert reopened.latest() == {"date": "2024-10-06", "value": 80, "classification": "Extreme Greed"}
+    assert np.all(np.diff(reopened.series()["day"]) == 1)
+
+
+# Test a torn trailing record is dropped and days another process appended meanwhile are not repeated
+def test_append_is_aligned_and_deduplicated(tmp_path):
+    values = list(range(10, 70))
+    path = str(tmp_path / "fng.bin")
+    other = FearGreedHistory(path=path, fetch=_fetcher(values, [], today=TODAY + 2))
+
+    def racing_fetch(limit):
+        other.refresh(now=(TODAY + 2) * SECONDS_PER_DAY)  # Appends the same days first
+        return _fetcher(values, [], today=TODAY + 2)(limit)
+
+    history = FearGreedHistory(path=path, fetch=_fetcher(values[:-2], []))
+    assert history.refresh(now=TODAY * SECONDS_PER_DAY) == 58
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02")  # An interrupted append
+
+    history.fetch = racing_fetch
+    assert history.refresh(now=(TODAY + 2) * SECONDS_PER_DAY) == 0
+    reopened = FearGreedHistory(path=path)
+    assert len(reopened.series()) == 60
+    assert np.all(np.diff(reopened.series()["day"]) == 1)
+    assert (tmp_path / "fng.bin").stat().st_size == 60 * 5
+
+
+# Test range, moving-average and percentile queries against the stored series
+def test_queries(tmp_path):
+    values = list(range(1, 101))
+    history = FearGreedHistory(path=str(tmp_path / "fng.bin"), fetch=_fetcher(values, []))
+    history.refresh(now=TODAY * SECONDS_PER_DAY)
+
+    window = history.range("2024-10-02", TODAY)
+    assert [point["value"] for point in window] == [98, 99, 100]
+    assert window[0]["classification"] == "Extreme Greed"
+
+    days, averages = history.moving_average(7, start=TODAY - 1)
+    assert list(days) == [TODAY - 1, TODAY]
+    assert np.allclose(averages, [96.0, 97.0])
+    assert np.isnan(history.moving_average(7)[1][5])
+
+    assert history.percentile() == 99.5
+    assert history.percentile(50) == 49.5
+    assert history.percentile(95, lookback_days=10) == 45.0
+    assert history.as_indicator_series()[-1] == [TODAY * SECONDS_PER_DAY * 1000, 100]
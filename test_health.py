@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from health import CircuitBreaker, HealthRegistry, SourceUnavailable
+
+
+# Test the breaker opens after repeated failures, serves the last good value as stale and skips the source
+def test_breaker_opens_and_serves_last_good():
+    calls = []
+
+    def fetch(fail):
+        calls.append(fail)
+        if fail:
+            raise ConnectionError("timed out")
+        return 42
+
+    breaker = CircuitBreaker("yahoo", failure_threshold=2, cooldown=60)
+    reading = breaker.call(fetch, False)
+    assert (reading.value, reading.stale) == (42, False)
+
+    for _ in range(2):
+        reading = breaker.call(fetch, True)
+        assert (reading.value, reading.stale) == (42, True)
+        assert "timed out" in reading.error
+    assert breaker.state == "open"
+
+    started = time.perf_counter()
+    reading = breaker.call(fetch, True)
+    assert time.perf_counter() - started < 0.01
+    assert reading.stale and len(calls) == 3  # Skipped while open
+
+
+# Test a half-open trial closes the breaker on success and None counts as a failure
+def test_breaker_half_open_recovery():
+    breaker = CircuitBreaker("santiment", failure_threshold=1, cooldown=60)
+    with pytest.raises(SourceUnavailable):
+        breaker.call(lambda: None)
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 61
+    assert breaker.state == "half-open"
+    reading = breaker.call(lambda: 7)
+    assert (reading.value, reading.stale, breaker.state) == (7, False, "closed")
+
+
+# Test last good values older than max_staleness are not served
+def test_breaker_max_staleness():
+    registry = HealthRegistry(failure_threshold=5, max_staleness=10)
+    registry.call("reddit", lambda: 0.2)
+    registry.breaker("reddit")._last_good = (0.2, time.time() - 11)
+    with pytest.raises(SourceUnavailable):
+        registry.call("reddit", lambda: None)
+    assert registry.status()["reddit"]["failures"] == 1
@@ -0,0 +1,99 @@
+import json
+
+from http_cache import ConditionalCache
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+
+class _FakeSession:
+    """Serves a body with an ETag and answers 304 when the client already has it."""
+
+    def __init__(self, body, etag='"v1"'):
+        self.body, self.etag = body, etag
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if headers.get("If-None-Match") == self.etag:
+            return _Response(304)
+        return _Response(200, self.body, {"ETag": self.etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+# Test fresh hits skip the network, 304s reuse the stored body, and savings are counted per source
+def test_conditional_get(tmp_path):
+    session = _FakeSession('{"data": [{"value": "40"}]}')
+    cache = ConditionalCache(str(tmp_path), session=session)
+
+    first = cache.get("https://api.example/fng/", source="fng")
+    assert not first.from_cache and first.json()["data"][0]["value"] == "40"
+    assert cache.get("https://api.example/fng/", source="fng").from_cache  # within freshness
+    assert len(session.requests) == 1
+
+    revalidated = cache.get("https://api.example/fng/", source="fng", freshness=0)
+    assert revalidated.not_modified and revalidated.text == first.text
+    assert session.requests[-1]["If-None-Match"] == '"v1"'
+    assert session.requests[-1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    session.body, session.etag = '{"data": [{"value": "55"}]}', '"v2"'
+    assert cache.get("https://api.example/fng/", source="fng", freshness=0).json()["data"][0]["value"] == "55"
+
+    stats = cache.stats()["fng"]
+    assert stats == {"requests": 3, "not_modified": 1, "fresh_hits": 1,
+                     "bytes_downloaded": len(first.text) * 2, "bytes_saved": len(first.text)}
+    # Validators and savings survive a restart
+    restarted = ConditionalCache(str(tmp_path), session=session)
+    assert restarted.get("https://api.example/fng/", source="fng", freshness=0).not_modified
+    assert restarted.stats()["fng"]["not_modified"] == 2
+
+
+# Test parsed results are reused until the body changes
+def test_get_parsed_reuses_results(tmp_path):
+    session = _FakeSession('{"value": 1}')
+    cache = ConditionalCache(str(tmp_path), session=session)
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return json.loads(text)
+
+    assert cache.get_parsed("https://x.example/", parse, freshness=0) == {"value": 1}
+    assert cache.get_parsed("https://x.example/", parse, freshness=0) == {"value": 1}
+    assert len(calls) == 1 and len(session.requests) == 2
+
+    session.body, session.etag = '{"value": 2}', '"v2"'
+    assert cache.get_parsed("https://x.example/", parse, freshness=0) == {"value": 2}
+    assert len(calls) == 2
+
+
+# Test error responses are returned but not cached
+def test_errors_are_not_cached(tmp_path):
+    class _FailingSession(_FakeSession):
+        def get(self, url, params=None, headers=None, timeout=None):
+            self.requests.append(headers)
+            return _Response(503, "unavailable")
+
+    session = _FailingSession("")
+    cache = ConditionalCache(str(tmp_path), session=session)
+    assert cache.get("https://x.example/").status_code == 503
+    assert cache.get("https://x.example/").status_code == 503
+    assert len(session.requests) == 2
+
+
+# Test caches in different processes add to the shared stats file rather than overwriting it
+def test_stats_are_merged_across_processes(tmp_path):
+    first = ConditionalCache(str(tmp_path), session=_FakeSession('{"value": 1}'))
+    second = ConditionalCache(str(tmp_path), session=_FakeSession('{"value": 1}'))
+    first.get("https://x.example/a", source="x")
+    second.get("https://x.example/b", source="x")
+    first.get("https://x.example/a", source="x", freshness=0)
+
+    saved = json.loads((tmp_path / "stats.json").read_text())["x"]
+    assert saved["requests"] == 3 and saved["not_modified"] == 1
+    assert first.stats()["x"]["requests"] == 3
+    assert ConditionalCache(str(tmp_path)).stats() == {"x": saved}
@@ -0,0 +1,62 @@
+import numpy as np
+
+from indicators import IndicatorStore, StreamingIndicators
+from price_store import PriceStore
+from volatility import MS_PER_DAY, compute_volatility
+
+
+def _prices(days=120, seed=5):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.04, days)))
+
+
+# Test the streaming values match batch computations over the same closes
+def test_streaming_matches_batch():
+    prices = _prices()
+    indicators = StreamingIndicators(window=30, momentum_window=10)
+    for day, price in enumerate(prices):
+        assert indicators.update(day * MS_PER_DAY, float(price))
+
+    returns = np.diff(np.log(prices))
+    assert np.isclose(indicators.mean, returns[-30:].mean())
+    assert np.isclose(indicators.variance, returns[-30:].var(ddof=1))
+    assert np.isclose(indicators.volatility, compute_volatility(prices, windows=(30,))["realized_30d"][0])
+    assert np.isclose(indicators.ewma_volatility, compute_volatility(prices)["ewma"][0])
+    assert np.isclose(indicators.zscore, (returns[-1] - returns[-30:].mean()) / returns[-30:].std(ddof=1))
+    assert np.isclose(indicators.momentum, prices[-1] / prices[-11] - 1)
+    assert not indicators.update(0, 1.0)  # replays of older closes are ignored
+
+
+# Test a persisted state continues exactly like one that was never saved
+def test_state_round_trip():
+    prices = _prices(80)
+    uninterrupted, restored = StreamingIndicators(), StreamingIndicators()
+    for day, price in enumerate(prices[:50]):
+        uninterrupted.update(day, float(price))
+        restored.update(day, float(price))
+    restored = StreamingIndicators.from_dict(restored.to_dict())
+    for day, price in enumerate(prices[50:], 50):
+        uninterrupted.update(day, float(price))
+        restored.update(day, float(price))
+    assert restored.snapshot() == uninterrupted.snapshot()
+
+
+# Test the indicator store follows price store refreshes and persists its states
+def test_indicator_store_follows_refreshes(tmp_path):
+    prices = _prices(40)
+    now_ms = 19100 * MS_PER_DAY
+
+    def fetch_range(coin_id, from_ms, to_ms):
+        return [[(19100 - 40 + day) * MS_PER_DAY, price] for day, price in enumerate(prices) if (19100 - 40 + day) * MS_PER_DAY >= from_ms]
+
+    store = PriceStore(str(tmp_path / "prices"), fetch_range=fetch_range)
+    path = str(tmp_path / "indicators.json")
+    indicator_store = IndicatorStore(path, price_store=store)
+    store.refresh("bitcoin", now_ms=now_ms)
+    snapshot = indicator_store.get("bitcoin")
+    assert snapshot["price"] == prices[-1]
+    assert snapshot["momentum"] is not None
+
+    # A new process loads the saved state and has nothing to catch up on
+    assert IndicatorStore(path, price_store=store).get("bitcoin") == snapshot
+    assert IndicatorStore(str(tmp_path / "other.json"), price_store=store).get("bitcoin") == snapshot
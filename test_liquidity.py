@@ -0,0 +1,53 @@
+import threading
+
+import numpy as np
+
+from liquidity import MARKETS_PER_PAGE, LiquidityIndex, liquidity_scores
+
+
+def _market(coin_id, volume, market_cap):
+    return {"id": coin_id, "total_volume": volume, "market_cap": market_cap}
+
+
+# Test scores rank by volume and market cap across the universe and skip assets without data
+def test_liquidity_scores():
+    scores = liquidity_scores([3e10, 1e9, 1e6, 0], [1e12, 1e10, 1e8, 1e9])
+    assert scores[0] > scores[1] > scores[2]
+    assert 0.1 <= scores[2] and scores[0] <= 1.0
+    assert np.isnan(scores[3])
+
+
+# Test the index pages until a short page, caches for the TTL and keeps scores after a failure
+def test_liquidity_index_pages_and_caches():
+    calls = []
+    universe = [_market(f"coin-{i}", 1e9 / (i + 1), 1e11 / (i + 1)) for i in range(MARKETS_PER_PAGE + 10)]
+
+    def fetch_page(page):
+        calls.append(page)
+        if len(calls) > 2:
+            raise ConnectionError("rate limited")
+        return universe[(page - 1) * MARKETS_PER_PAGE:page * MARKETS_PER_PAGE]
+
+    index = LiquidityIndex(fetch_page=fetch_page, pages=4, ttl=3600)
+    assert index.get("coin-0") > index.get("coin-200")
+    assert index.get("unknown") is None
+    assert calls == [1, 2] and len(index) == MARKETS_PER_PAGE + 10
+
+    index.ttl = 0
+    assert index.get("coin-0") is not None  # the failed refresh keeps the previous scores
+    assert calls == [1, 2, 1]
+
+
+# Test a background index answers without waiting for the fetch, then serves the fetched scores
+def test_liquidity_index_background_refresh():
+    release = threading.Event()
+
+    def fetch_page(page):
+        release.wait(5)
+        return [_market("coin-0", 1e9, 1e11)]
+
+    index = LiquidityIndex(fetch_page=fetch_page, pages=1, background=True)
+    assert index.get("coin-0") is None  # Not fetched yet; callers fall back
+    release.set()
+    index.wait()
+    assert index.get("coin-0") is not None
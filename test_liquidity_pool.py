@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from liquidity_pool import (
+    capital_efficiency,
+    impermanent_loss,
+    lp_returns,
+    position_value,
+    strategy_impermanent_loss,
+    strategy_price_range,
+)
+
+
+# Test the full-range curve against the textbook constant-product formula
+def test_constant_product_impermanent_loss():
+    ratios = np.array([0.25, 0.5, 1.0, 2.0, 4.0])
+    assert np.allclose(impermanent_loss(ratios), 2 * np.sqrt(ratios) / (1 + ratios) - 1)
+    assert np.isclose(impermanent_loss(4.0), -0.2)
+
+
+# Test a concentrated position: amplified loss in range, all one token outside it
+def test_concentrated_position():
+    value, hold = position_value(np.array([1.0, 1.1, 0.5, 3.0]), lower=0.8, upper=1.25)
+    assert np.isclose(value[0], 1.0) and np.isclose(hold[0], 1.0)
+    assert impermanent_loss(1.1, 0.8, 1.25) < impermanent_loss(1.1)
+    # Below the range the position is all tokens, so its value scales with the price
+    assert np.isclose(value[2] / position_value(0.8, 0.8, 1.25)[0], 0.5 / 0.8)
+    # Above the range it is all stablecoins and stops growing
+    assert np.isclose(value[3], position_value(1.25, 0.8, 1.25)[0])
+    assert capital_efficiency() == 1
+    assert capital_efficiency(0.8, 1.25) > 8
+    with pytest.raises(ValueError):
+        position_value(1.0, lower=1.1, upper=1.5)
+
+
+# Test the grid shapes, fee accrual and breakeven fee APR
+def test_lp_returns_grid():
+    grid = lp_returns(price_ratios=(0.5, 1.0, 2.0), horizons_days=(30, 365), fee_apr=0.1)
+    assert grid["net_vs_hold"].shape == (3, 2)
+    assert np.isclose(grid["fee_return"][1, 1], 0.1)
+    assert np.isclose(grid["net_vs_hold"][1, 1], 0.1)
+    # At the breakeven fee APR the position matches holding
+    breakeven = lp_returns(price_ratios=(2.0,), horizons_days=(365,), fee_apr=grid["breakeven_fee_apr"][2, 1])
+    assert np.isclose(breakeven["net_vs_hold"][0, 0], 0)
+
+    concentrated = lp_returns(price_ratios=(2.0,), horizons_days=(365,), lower=0.8, upper=1.25)
+    assert concentrated["fee_return"][0, 0] == 0  # out of range earns no fees
+    assert np.isinf(concentrated["breakeven_fee_apr"][0, 0])
+
+
+# Test only liquidity strategies get an impermanent loss table
+def test_strategy_impermanent_loss():
+    assert strategy_impermanent_loss("Stake your ETH in Lido") is None
+    full = strategy_impermanent_loss("Provide liquidity in Raydium or Orca pools")
+    concentrated = strategy_impermanent_loss("USDC/ETH concentrated pool in Aerodrome; provide liquidity")
+    assert len(full) == 9 and full != concentrated
+    assert strategy_price_range("Provide liquidity in Raydium or Orca pools") is None
+    assert strategy_price_range("USDC/ETH concentrated pool in Aerodrome; provide liquidity") == (0.8, 1.25)
+    assert set(full[0]) == {"Price Move", "Impermanent Loss", "Net vs Hold (30d)", "Net vs Hold (90d)", "Net vs Hold (365d)"}
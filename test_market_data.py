@@ -0,0 +1,63 @@
+import json
+import time
+
+from health import HealthRegistry
+from http_cache import ConditionalCache
+from market_data import COINGECKO_PRICE_URL, FEAR_GREED_URL, MarketData
+from snapshot import SnapshotReader, write_snapshot
+
+FNG_BODY = json.dumps({"data": [{"value": "72", "value_classification": "Greed", "timestamp": "1700000000"}]})
+
+
+class _Response:
+    def __init__(self, text):
+        self.status_code = 200
+        self.text = text
+        self.content = text.encode()
+        self.headers = {}
+
+
+class _FakeSession:
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(url)
+        return _Response(self.bodies[url])
+
+
+def _market_data(tmp_path, session):
+    return MarketData(
+        http_cache=ConditionalCache(str(tmp_path / "http"), session=session),
+        health_registry=HealthRegistry(),
+        snapshot_reader=SnapshotReader(str(tmp_path / "snapshot.json")),
+    )
+
+
+# Test repeated reads are served from the shared HTTP cache without new requests
+def test_repeated_reads_use_the_cache(tmp_path):
+    session = _FakeSession({FEAR_GREED_URL: FNG_BODY, COINGECKO_PRICE_URL: json.dumps({"bitcoin": {"usd": 65000.0}})})
+    market_data = _market_data(tmp_path, session)
+
+    for _ in range(3):
+        assert market_data.fear_and_greed() == {"value": 72, "classification": "Greed", "timestamp": 1700000000, "stale": False}
+        assert market_data.price("bitcoin") == 65000.0
+    assert session.requests == [FEAR_GREED_URL, COINGECKO_PRICE_URL]
+    assert market_data.price("not-a-coin") is None
+
+
+# Test a collector snapshot is preferred over fetching
+def test_snapshot_is_preferred(tmp_path):
+    session = _FakeSession({})
+    market_data = _market_data(tmp_path, session)
+    write_snapshot({
+        "generated_at": time.time(),
+        "indicators": {"tradfi": {"raw": {"value": 18.5, "change": -0.2, "change_percent": -1.1}, "fetched_at": time.time(), "stale": True}},
+        "assets": {},
+        "prices": {"ethereum": 3000.0},
+    }, str(tmp_path / "snapshot.json"))
+
+    assert market_data.vix() == {"value": 18.5, "change": -0.2, "change_percent": -1.1, "stale": True}
+    assert market_data.price("ethereum") == 3000.0
+    assert session.requests == []
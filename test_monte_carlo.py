@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+
+from monte_carlo import simulate_price_paths, simulate_strategy, strategy_values
+
+
+# Test the simulated prices have the requested volatility and no drift in expectation
+def test_price_paths_statistics():
+    prices = simulate_price_paths(0.6, days=365, paths=20000, rng=np.random.default_rng(0))
+    assert prices.shape == (20000, 366)
+    assert (prices[:, 0] == 1).all()
+    log_returns = np.diff(np.log(prices), axis=1)
+    assert np.isclose(log_returns.std() * np.sqrt(365), 0.6, rtol=0.01)
+    assert np.isclose(prices[:, -1].mean(), 1.0, atol=0.02)
+
+
+# Test the strategy mechanics on hand-built paths
+def test_strategy_values():
+    prices = np.array([[1.0, 1.0, 4.0], [1.0, 0.5, 1.0]])
+    values, liquidated = strategy_values(prices, {"fee_apr": 0.0})
+    assert np.allclose(values, [2.0, 1.0])  # sqrt of the price ratio: impermanent loss on the first path
+    assert not liquidated.any()
+
+    mechanics = {"apy": 0.0, "leverage": 2.0, "borrow_apr": 0.0, "liquidation_threshold": 0.8, "liquidation_penalty": 0.1}
+    values, liquidated = strategy_values(prices, mechanics)
+    assert list(liquidated) == [False, True]  # debt 1.0 >= 0.8 * collateral 1.0 on the second path
+    assert np.isclose(values[0], 2 * 4.0 - 1.0)
+    assert values[1] == 0.0  # the penalty leaves less collateral than debt
+
+
+# Test leverage raises the liquidation probability and tail risk, and results do not depend on workers
+def test_simulate_strategy():
+    started = time.perf_counter()
+    leveraged = simulate_strategy(0.8, "leveraging", seed=1)
+    assert time.perf_counter() - started < 5
+    staking = simulate_strategy(0.8, "general", seed=1)
+    assert leveraged["liquidation_probability"] > 0
+    assert staking["liquidation_probability"] == 0
+    assert leveraged["var"] > staking["var"]
+    assert staking["expected_yield"] > 0
+
+    assert simulate_strategy(0.5, "lending", paths=4000, seed=2, workers=2, chunk_paths=1000) == \
+        simulate_strategy(0.5, "lending", paths=4000, seed=2, workers=1, chunk_paths=1000)
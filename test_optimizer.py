@@ -0,0 +1,53 @@
+import numpy as np
+
+from backtest import Backtest
+from market_condition import load_market_condition_config
+from optimizer import grid_configurations, optimize, pareto_front, random_configurations, save_config
+
+
+def _backtest(days=730, seed=2):
+    rng = np.random.default_rng(seed)
+    fear_and_greed = rng.uniform(0, 100, days)
+    # Prices drift up after greedy days so the Fear & Greed weight carries signal
+    returns = rng.normal(0, 0.02, days) + (fear_and_greed - 50) / 2000
+    prices = 100 * np.exp(np.concatenate([[0], np.cumsum(returns[:-1])]))
+    indicators = np.column_stack([
+        rng.uniform(0, 10000, days), fear_and_greed, rng.uniform(10, 40, days), rng.uniform(-1, 1, days),
+    ])
+    return Backtest(np.arange(days), prices, indicators, horizons=(1,))
+
+
+# Test generated configurations are valid weight sets with ordered thresholds
+def test_configurations_are_valid():
+    for weights, thresholds in (random_configurations(200, seed=0), grid_configurations(0.25)):
+        assert np.allclose(weights.sum(axis=1), 1)
+        assert (weights >= 0).all()
+        assert (thresholds[:, 0] > thresholds[:, 1]).all()
+        assert len(weights) == len(thresholds)
+
+
+# Test the Pareto front against a brute-force dominance check
+def test_pareto_front_matches_brute_force():
+    rng = np.random.default_rng(3)
+    hit_rate, signal_return = rng.random(300), rng.random(300)
+    expected = {
+        i for i in range(300)
+        if not ((hit_rate >= hit_rate[i]) & (signal_return >= signal_return[i]) &
+                ((hit_rate > hit_rate[i]) | (signal_return > signal_return[i]))).any()
+    }
+    assert set(pareto_front(hit_rate, signal_return)) == expected
+
+
+# Test the process pool returns the same front as in-process evaluation, and the saved config loads
+def test_optimize_and_save(tmp_path):
+    backtest = _backtest()
+    weights, thresholds = random_configurations(3000, seed=4)
+    front = optimize(backtest, weights, thresholds, horizon=1, workers=1, chunk_size=500)
+    assert front == optimize(backtest, weights, thresholds, horizon=1, workers=2, chunk_size=500)
+    assert all(config["coverage"] >= 0.1 for config in front)
+
+    path = tmp_path / "market_condition.json"
+    config = save_config(front, str(path), select="hit_rate")
+    assert config["hit_rate"] == max(c["hit_rate"] for c in front)
+    assert load_market_condition_config(str(path)) == (config["weights"], config["thresholds"])
+    assert load_market_condition_config(str(tmp_path / "missing.json"))[1] == {"bullish": 0.6, "bearish": 0.4}
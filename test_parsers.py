@@ -0,0 +1,40 @@
+import pytest
+
+from parsers import ALTCOIN_SEASON_DIV_STYLE, extract_altcoin_season_index, extract_vix
+
+VIX_PAGE = """
+<html><body>
+<fin-streamer class="livePrice" data-symbol="^VIX" data-field="regularMarketPrice"><span>1,018.42</span></fin-streamer>
+<fin-streamer data-field="regularMarketChange" data-symbol="^VIX">+0.35</fin-streamer>
+<fin-streamer data-field='regularMarketChangePercent'>(-1.87%)</fin-streamer>
+<fin-streamer data-field="regularMarketPrice">99.0</fin-streamer>
+</body></html>
+"""
+
+
+# Test the first element of each field is read, with nested tags, commas and percent signs
+def test_extract_vix():
+    page = VIX_PAGE.replace("1,018.42", "18.42")
+    assert extract_vix(page) == {"value": 18.42, "change": 0.35, "change_percent": -1.87}
+    with pytest.raises(ValueError):
+        extract_vix(VIX_PAGE)  # 1018.42 is not a plausible VIX
+    with pytest.raises(ValueError):
+        extract_vix("<html><fin-streamer data-field=\"regularMarketPrice\">18</fin-streamer></html>")
+
+
+# Test markup the patterns do not cover is still read through the SoupStrainer path
+def test_extract_vix_falls_back_to_strainer():
+    page = VIX_PAGE.replace("1,018.42", "18.42").replace("<fin-streamer data-field='regularMarketChangePercent'>",
+                                                        "<fin-streamer data-field=regularMarketChangePercent>")
+    assert extract_vix(page)["change_percent"] == -1.87
+
+
+# Test the active button is read first and the index value div is the fallback
+def test_extract_altcoin_season_index():
+    buttons = '<button class="nav-link timeselect">90 Days (40)</button><button class="nav-link timeselect active">Altcoin Season (51)</button>'
+    assert extract_altcoin_season_index(f"<div>{buttons}</div>") == 51
+    assert extract_altcoin_season_index(f'<div style="{ALTCOIN_SEASON_DIV_STYLE}"> 77 </div>') == 77
+    # Other attributes before the class are allowed
+    assert extract_altcoin_season_index('<button id="x" class="nav-link timeselect active">Season (12)</button>') == 12
+    with pytest.raises(ValueError):
+        extract_altcoin_season_index("<div>no index here</div>")
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from portfolio import PortfolioRiskModel
+
+
+def _prices(seed=1, days=120):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, [0.04, 0.05, 0.0005], size=(days, 3))
+    returns[:, 1] += 0.8 * returns[:, 0]  # correlated volatile assets, one near-stable asset
+    return 100 * np.exp(np.cumsum(returns, axis=0))
+
+
+# Test portfolio volatility and risk contributions against the textbook formulas
+def test_evaluate_matches_covariance_formulas():
+    prices = _prices()
+    model = PortfolioRiskModel(["ethereum", "solana", "usd-coin"], prices)
+    result = model.evaluate([50, 30, 20])
+
+    weights = np.array([0.5, 0.3, 0.2])
+    covariance = np.cov(np.diff(np.log(prices), axis=0), rowvar=False) * 365
+    assert np.isclose(result["volatility"], np.sqrt(weights @ covariance @ weights))
+    contributions = [holding["risk_contribution"] for holding in result["holdings"]]
+    assert np.isclose(sum(contributions), result["volatility"])
+    assert result["holdings"][2]["risk_contribution_pct"] < 0.05
+    assert 0 <= result["risk_score"] <= 10
+
+
+# Test shifting weight into the stable asset lowers the risk
+def test_stable_weight_lowers_risk():
+    model = PortfolioRiskModel(["ethereum", "solana", "usd-coin"], _prices())
+    risky = model.evaluate([50, 50, 0], ["Leveraging ETH on Aave", "Leveraging SOL on Solend", None])
+    hedged = model.evaluate([25, 25, 50], ["Leveraging ETH on Aave", "Leveraging SOL on Solend", "Lending USDC on Aave"])
+    assert hedged["volatility"] < risky["volatility"]
+    assert hedged["risk_score"] < risky["risk_score"]
+
+
+def test_invalid_inputs():
+    model = PortfolioRiskModel(["a", "b", "c"], _prices())
+    with pytest.raises(ValueError):
+        model.evaluate([1, 1])
+    with pytest.raises(ValueError):
+        PortfolioRiskModel(["a"], np.array([[1.0]]))
+
+
+class _FakePriceStore:
+    """Serves fixed closes; assets without closes raise like a failed refresh with nothing stored."""
+
+    def __init__(self, closes):
+        self.closes = closes
+
+    def fetch_history(self, coin_id, days):
+        if coin_id not in self.closes:
+            raise ConnectionError("rate limited")
+        prices = self.closes[coin_id]
+        return np.column_stack((1700000000000 + np.arange(len(prices)) * 86400000, prices))
+
+
+# Test assets whose history cannot be loaded or is too short are skipped rather than failing the model
+def test_from_price_store_skips_assets_without_history():
+    prices = _prices()
+    store = _FakePriceStore({"bitcoin": prices[:, 0], "ethereum": prices[:, 1], "sui": prices[:1, 2]})
+    model = PortfolioRiskModel.from_price_store(["bitcoin", "ethereum", "sui", "unlisted"], store=store)
+    assert model.assets == ["bitcoin", "ethereum"]
+    assert sorted(model.skipped) == ["sui", "unlisted"]
+    assert "rate limited" in model.skipped["unlisted"]
+
+    with pytest.raises(ValueError):
+        PortfolioRiskModel.from_price_store(["unlisted"], store=store)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from price_store import PRICE_DTYPE, PriceStore, daily_closes
+from volatility import MS_PER_DAY, VolatilityEngine
+
+TODAY = 19100
+
+
+def _hourly(start_day, end_day, price=lambda hour: 100.0 + hour):
+    return [[day * MS_PER_DAY + hour * 3600 * 1000, price(day * 24 + hour)] for day in range(start_day, end_day) for hour in range(24)]
+
+
+# Test intraday points are reduced to one close per completed day
+def test_daily_closes():
+    records = daily_closes(_hourly(TODAY - 2, TODAY + 1), before_day=TODAY)
+    assert list(records["t"] // MS_PER_DAY) == [TODAY - 2, TODAY - 1]
+    assert records["p"][-1] == 100.0 + (TODAY - 1) * 24 + 23
+
+
+# Test refresh appends only the missing range and history serves lookbacks from the memmap
+def test_incremental_refresh(tmp_path):
+    requests = []
+
+    def fetch_range(coin_id, from_ms, to_ms):
+        requests.append((from_ms, to_ms))
+        return [point for point in _hourly(TODAY - 400, TODAY + 1) if from_ms <= point[0] <= to_ms]
+
+    store = PriceStore(str(tmp_path), fetch_range=fetch_range, max_history_days=30)
+    now = (TODAY - 5) * MS_PER_DAY + 3600 * 1000
+    assert store.refresh("bitcoin", now_ms=now) == 30
+    assert store.refresh("bitcoin", now_ms=now) == 0  # up to date: no request
+    assert len(requests) == 1
+
+    later = TODAY * MS_PER_DAY + 3600 * 1000
+    assert store.refresh("bitcoin", now_ms=later) == 5
+    assert requests[-1][0] == store.history("bitcoin")["t"][-6] + 1
+
+    history = store.history("bitcoin")
+    assert len(history) == 35
+    assert np.all(np.diff(history["t"]) == MS_PER_DAY)
+    assert len(store.history("bitcoin", days=7)) == 8
+    assert len(store.history("unknown")) == 0
+
+
+# Test a torn trailing record is dropped and closes another process appended meanwhile are not repeated
+def test_append_is_aligned_and_deduplicated(tmp_path):
+    fetch_range = lambda coin_id, from_ms, to_ms: _hourly(TODAY - 10, TODAY)
+    other = PriceStore(str(tmp_path), fetch_range=fetch_range, max_history_days=10)
+
+    def racing_fetch_range(coin_id, from_ms, to_ms):
+        other.refresh(coin_id, now_ms=TODAY * MS_PER_DAY)  # Appends the same days first
+        return fetch_range(coin_id, from_ms, to_ms)
+
+    store = PriceStore(str(tmp_path), fetch_range=fetch_range, max_history_days=10)
+    assert store.refresh("bitcoin", now_ms=(TODAY - 3) * MS_PER_DAY) == 7
+    with open(tmp_path / "bitcoin.prices", "ab") as file:
+        file.write(b"\x01\x02\x03")  # An interrupted append
+
+    store.fetch_range = racing_fetch_range
+    assert store.refresh("bitcoin", now_ms=TODAY * MS_PER_DAY) == 0
+    assert (tmp_path / "bitcoin.prices").stat().st_size == 10 * PRICE_DTYPE.itemsize
+    history = PriceStore(str(tmp_path)).history("bitcoin")
+    assert np.all(np.diff(history["t"]) == MS_PER_DAY)
+
+
+# Test the volatility engine can read its histories from the store
+def test_engine_reads_from_store(tmp_path):
+    store = PriceStore(str(tmp_path), fetch_range=lambda coin_id, from_ms, to_ms: _hourly(TODAY - 40, TODAY))
+    store.refresh("ethereum", now_ms=TODAY * MS_PER_DAY)
+    store.fetch_range = None  # any further request would fail
+    metrics = VolatilityEngine(store.fetch_history).volatility(["ethereum"], days=30)
+    assert metrics["ethereum"]["realized_30d"] is not None
@@ -0,0 +1,117 @@
+import numpy as np
+
+from community_store import CommunityStore
+from risk import RiskPipeline, attach_risk, classify_strategy_type, refresh_community_risk, score_strategy
+
+
+def _strategy(text, date_added="2023-10-01 10:00:00"):
+    return {"crypto": "ethereum", "strategy": text, "market_condition": "bullish", "date_added": date_added}
+
+
+# Test the overall score follows the factor weights on a 0-10 scale
+def test_score_strategy():
+    risk = score_strategy("ethereum", "Lending ETH on Aave", volatility=0.6, inputs_as_of="2024-01-01 00:00:00", liquidity=0.8)
+    assert risk["factors"] == {"volatility": 0.6, "liquidity": 0.8, "smart_contract": 0.3}
+    assert risk["overall"] == round((0.5 * 0.6 + 0.3 * 0.2 + 0.2 * 0.3) * 10, 2)
+    assert risk["inputs_as_of"] == "2024-01-01 00:00:00"
+
+
+# Test ranking by stored risk is served from the index
+def test_rank_by_risk(tmp_path):
+    store = CommunityStore(str(tmp_path / "community_strategies.json"))
+    lookup = lambda crypto: (0.5, "2024-01-01 00:00:00")
+    store.add_many([
+        attach_risk(_strategy("Leveraging ETH on Aave", "2023-10-01 10:00:00"), lookup),
+        attach_risk(_strategy("Lending ETH on Compound", "2023-10-02 10:00:00"), lookup),
+        _strategy("Unscored strategy", "2023-10-03 10:00:00"),
+    ])
+    ranked = store.index.rank_by_risk("ethereum", "bullish", k=5)
+    assert [s["strategy"] for s in ranked] == ["Lending ETH on Compound", "Leveraging ETH on Aave"]
+    assert store.index.rank_by_risk("ethereum", "bullish", k=1, highest_first=True)[0]["strategy"] == "Leveraging ETH on Aave"
+
+
+# Test the batch refresh only rescores strategies with older inputs
+def test_refresh_community_risk(tmp_path):
+    store = CommunityStore(str(tmp_path / "community_strategies.json"))
+    old_lookup = lambda crypto: (0.2, "2024-01-01 00:00:00")
+    store.add_many([attach_risk(_strategy("Stake ETH"), old_lookup), _strategy("Lend ETH", "2023-10-02 10:00:00")])
+
+    calls = []
+
+    def new_lookup(crypto):
+        calls.append(crypto)
+        return 0.9, "2024-02-01 00:00:00"
+
+    assert refresh_community_risk(store, new_lookup) == 2
+    assert calls == ["ethereum"]
+    assert all(s["risk"]["inputs_as_of"] == "2024-02-01 00:00:00" for s in store.strategies)
+    assert refresh_community_risk(store, new_lookup) == 0
+
+
+class _FakePriceStore:
+    """Serves fixed closes; bump() simulates a new daily close."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.last = {crypto: 1700000000000 for crypto in prices}
+
+    def refresh(self, crypto):
+        return 0
+
+    def last_timestamp(self, crypto):
+        return self.last.get(crypto)
+
+    def history(self, crypto, days=None):
+        records = np.zeros(len(self.prices.get(crypto, [])), dtype=[("t", "<i8"), ("p", "<f8")])
+        records["p"] = self.prices.get(crypto, [])
+        return records
+
+    def bump(self, crypto):
+        self.last[crypto] += 86400 * 1000
+
+
+# Test the pipeline scores every strategy type and only recomputes assets whose inputs changed
+def test_risk_pipeline(tmp_path):
+    store = _FakePriceStore({"bitcoin": [100, 102, 99, 103, 101], "sui": [1.0, 1.3, 0.9, 1.4, 1.0]})
+    pipeline = RiskPipeline(str(tmp_path / "risk_scores.json"), price_store=store)
+
+    assert sorted(pipeline.refresh(["bitcoin", "sui"])) == ["bitcoin", "sui"]
+    assert pipeline.refresh(["bitcoin", "sui"]) == []
+    store.bump("sui")
+    assert pipeline.refresh(["bitcoin", "sui"]) == ["sui"]
+
+    leveraging = pipeline.lookup("sui", "leveraging")
+    lending = pipeline.lookup("sui", "lending")
+    assert leveraging["overall"] > lending["overall"]
+    assert pipeline.lookup("sui", "leveraging")["overall"] > pipeline.lookup("bitcoin", "leveraging")["overall"]
+
+    # Scores survive a restart without recomputation
+    reloaded = RiskPipeline(str(tmp_path / "risk_scores.json"), price_store=store)
+    assert reloaded.refresh(["bitcoin", "sui"]) == []
+    assert reloaded.lookup("bitcoin", "general") == pipeline.lookup("bitcoin", "general")
+
+
+def test_classify_strategy_type():
+    assert classify_strategy_type("Lending USDC, then leveraging ETH") == "leveraging"
+    assert classify_strategy_type("Provide USDC in a liquidity pool") == "liquidity pool"
+    assert classify_strategy_type("Stake ETH in Lido") == "general"
+    assert classify_strategy_type("Stake ETH in Lido, leverage on Aave") == "leveraging"
+    assert classify_strategy_type("Borrow USDC against ETH") == "leveraging"
+    assert classify_strategy_type("Supply USDC on Compound") == "lending"
+    assert classify_strategy_type("Be an LP on Uniswap") == "liquidity pool"
+
+
+# Test lookup never refreshes inline and a failed save keeps the scores in memory
+def test_risk_pipeline_lookup_refreshes_in_background(tmp_path):
+    store = _FakePriceStore({"bitcoin": [100, 102, 99, 103, 101]})
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    pipeline = RiskPipeline(str(blocker / "risk_scores.json"), price_store=store)
+
+    pipeline._background_lock.acquire()  # A background refresh is already running
+    assert pipeline.lookup("bitcoin") is None
+    pipeline._background_lock.release()
+
+    thread = pipeline.refresh_in_background(["bitcoin"])
+    thread.join()
+    assert pipeline.lookup("bitcoin", "lending")["overall"] > 0
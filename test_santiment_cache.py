@@ -0,0 +1,66 @@
+import numpy as np
+
+from santiment_cache import SantimentCache
+from volatility import MS_PER_DAY
+
+TODAY = 20000
+
+
+# Test refresh requests only the days after the last stored one and drops the incomplete day
+def test_incremental_refresh(tmp_path):
+    requests = []
+
+    def fetch(slug, metric, from_ms, to_ms):
+        requests.append((slug, metric, from_ms // MS_PER_DAY))
+        return [[day * MS_PER_DAY, float(day - TODAY)] for day in range(from_ms // MS_PER_DAY, to_ms // MS_PER_DAY + 1)]
+
+    cache = SantimentCache(str(tmp_path), fetch=fetch, initial_days=30)
+    now = TODAY * MS_PER_DAY + 3600 * 1000
+    assert cache.refresh("ethereum", "daily_active_addresses", now_ms=now) == 30
+    assert cache.refresh("ethereum", "daily_active_addresses", now_ms=now) == 0  # up to date: no request
+    assert len(requests) == 1
+
+    later = now + 3 * MS_PER_DAY
+    assert cache.refresh("ethereum", "daily_active_addresses", now_ms=later) == 3
+    assert requests[-1] == ("ethereum", "daily_active_addresses", TODAY)
+    assert np.all(np.diff(cache.range("ethereum", "daily_active_addresses")["t"]) == MS_PER_DAY)
+
+
+# Test latest returns the newest day (not the oldest of the window) and range/aggregate lookbacks
+def test_queries(tmp_path):
+    def fetch(slug, metric, from_ms, to_ms):
+        days = range(from_ms // MS_PER_DAY, to_ms // MS_PER_DAY + 1)
+        return [[day * MS_PER_DAY + 60000, float(day - TODAY + 10)] for day in reversed(days)]
+
+    cache = SantimentCache(str(tmp_path), fetch=fetch, initial_days=10)
+    cache.refresh("bitcoin", "daily_active_addresses", now_ms=TODAY * MS_PER_DAY)
+    assert cache.latest("bitcoin", "daily_active_addresses") == ((TODAY - 1) * MS_PER_DAY, 9.0)
+    assert list(cache.range("bitcoin", "daily_active_addresses", days=3)["v"]) == [7.0, 8.0, 9.0]
+    assert list(cache.range("bitcoin", "daily_active_addresses", days=2, end_ms=(TODAY - 3) * MS_PER_DAY)["v"]) == [6.0, 7.0]
+    assert cache.aggregate("bitcoin", "daily_active_addresses", 4) == 7.5
+    assert cache.aggregate("bitcoin", "daily_active_addresses", 10, how="min") == 0.0
+    assert cache.latest("sui", "daily_active_addresses") is None
+
+
+# Test a torn trailing record is dropped and days another process appended meanwhile are not repeated
+def test_append_is_aligned_and_deduplicated(tmp_path):
+    def fetch(slug, metric, from_ms, to_ms):
+        return [[day * MS_PER_DAY, float(day)] for day in range(from_ms // MS_PER_DAY, to_ms // MS_PER_DAY)]
+
+    other = SantimentCache(str(tmp_path), fetch=fetch, initial_days=10)
+
+    def racing_fetch(slug, metric, from_ms, to_ms):
+        other.refresh(slug, metric, now_ms=TODAY * MS_PER_DAY)  # Appends the same days first
+        return fetch(slug, metric, from_ms, to_ms)
+
+    cache = SantimentCache(str(tmp_path), fetch=fetch, initial_days=10)
+    assert cache.refresh("bitcoin", "daily_active_addresses", now_ms=(TODAY - 3) * MS_PER_DAY) == 10
+    with open(tmp_path / "bitcoin.daily_active_addresses.bin", "ab") as file:
+        file.write(b"\x01\x02\x03")  # An interrupted append
+
+    cache.fetch = racing_fetch
+    assert cache.refresh("bitcoin", "daily_active_addresses", now_ms=TODAY * MS_PER_DAY) == 0
+    records = SantimentCache(str(tmp_path)).range("bitcoin", "daily_active_addresses")
+    assert len(records) == 13
+    assert np.all(np.diff(records["t"]) == MS_PER_DAY)
+    assert (tmp_path / "bitcoin.daily_active_addresses.bin").stat().st_size == records.nbytes
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import numpy as np
+
+from sources import IndicatorSource, SourceRegistry, scaled
+
+
+# Test each source is fetched once per TTL and the score renormalizes over the available values
+def test_registry_respects_ttl_and_scores_available_values():
+    calls = []
+
+    def fetch(value):
+        def run():
+            calls.append(value)
+            return value
+        return run
+
+    registry = SourceRegistry([
+        IndicatorSource("registry-fng", fetch(80), scaled(100), 0.3, ttl=3600, cost=1),
+        IndicatorSource("registry-reddit", fetch(0.5), scaled(1), 0.3, ttl=3600, cost=10),
+        IndicatorSource("registry-down", lambda: None, scaled(1), 0.4, ttl=3600, cost=2),
+    ])
+    score, condition, values = registry.score()
+    assert np.isclose(score, 0.65) and condition == "bullish"
+    assert set(values) == {"registry-fng", "registry-reddit"}
+
+    registry.score()
+    assert sorted(calls) == [0.5, 80]  # Still fresh, not fetched again
+
+    registry.register(IndicatorSource("registry-extra", fetch(0.0), scaled(1), 0.4, ttl=3600))
+    score, condition, _ = registry.score(weights={"registry-reddit": 0.0})
+    assert np.isclose(score, 0.8 * 0.3 / 0.7) and condition == "bearish"
+
+
+# Test due sources are fetched concurrently rather than one after another
+def test_registry_fetches_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def slow():
+        barrier.wait()
+        return 1.0
+
+    registry = SourceRegistry([IndicatorSource(f"registry-slow-{i}", slow, scaled(1), 1.0) for i in range(3)])
+    started = time.perf_counter()
+    assert registry.refresh_due() == 3
+    assert time.perf_counter() - started < 2
+
+
+# Test per-asset sources use the fallback asset when the asset has no data
+def test_registry_per_asset_fallback():
+    def fetch(slug):
+        return {"ethereum": 5000.0}.get(slug)
+
+    registry = SourceRegistry([
+        IndicatorSource("registry-addresses", fetch, scaled(10000), 1.0, per_asset=True, fallback_asset="ethereum"),
+    ])
+    score, _, values = registry.score("unknown-coin")
+    assert values["registry-addresses"]["raw"] == 5000.0
+    assert np.isclose(score, 0.5)
@@ -0,0 +1,34 @@
+import time
+
+from taxonomy import classify_strategy, smart_contract_risk
+
+
+# Test protocols, chains and actions are extracted in order of mention, including receipt tokens
+def test_classify_strategy():
+    result = classify_strategy("Stake ETH in Lido, then borrow against stETH on Aave and provide liquidity in an Aerodrome pool on Base L2")
+    assert result["protocols"] == ["lido", "aave", "aerodrome"]
+    assert result["chains"] == ["base"]
+    assert result["actions"] == ["stake", "borrow", "provide liquidity"]
+    assert result["risk"] == round(0.55 + 2 * 0.05 + 0.05, 2)
+
+    assert classify_strategy("Provide liquidity in Uniswap  V3")["protocols"] == ["uniswap"]
+    assert classify_strategy("Sushiswap pools")["protocols"] == ["sushiswap"]  # no partial match of "sushi"
+
+
+# Test known strategies are no longer all scored 0.5, while the legacy keywords keep their scores
+def test_smart_contract_risk():
+    assert smart_contract_risk("Stake ETH in Lido") == 0.25
+    assert smart_contract_risk("Lending ETH on Aave") == 0.3
+    assert smart_contract_risk("liquidity pool") == 0.5
+    assert smart_contract_risk("leveraging") == 0.7
+    assert smart_contract_risk("Hold and wait") == 0.5
+    assert smart_contract_risk("Provide liquidity in AlphaFi's stSUI-USDC pair on Sui") == 0.8
+
+
+# Test the compiled matcher scores thousands of strategies per second
+def test_classify_throughput():
+    texts = [f"Strategy {i}: supply USDC on Compound, loop stETH on Aave and farm on Curve" for i in range(5000)]
+    started = time.perf_counter()
+    risks = [smart_contract_risk(text) for text in texts]
+    assert time.perf_counter() - started < 2
+    assert set(risks) == {0.85}  # looping (0.7) across Compound, Lido, Aave and Curve
@@ -0,0 +1,51 @@
+import numpy as np
+
+from volatility import MS_PER_DAY, VolatilityEngine, align_histories, compute_volatility
+
+
+def _history(prices, start_day=19000):
+    return [[(start_day + day) * MS_PER_DAY, price] for day, price in enumerate(prices)]
+
+
+# Test histories are aligned on a shared daily grid with forward-filled gaps
+def test_align_histories():
+    assets, days, prices = align_histories({
+        "bitcoin": _history([100.0, 101.0, 102.0]),
+        "sui": [[(19001 * MS_PER_DAY), 1.0], [(19001 * MS_PER_DAY) + 5000, 1.5]],  # two points on one day
+    })
+    assert assets == ["bitcoin", "sui"]
+    assert list(days) == [19000, 19001, 19002]
+    assert np.isnan(prices[0, 1])
+    assert list(prices[1:, 1]) == [1.5, 1.5]
+
+
+# Test the vectorized metrics against a direct per-asset computation
+def test_compute_volatility_matches_reference():
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, size=(60, 3)), axis=0))
+    metrics = compute_volatility(prices, windows=(7, 30))
+
+    log_returns = np.diff(np.log(prices[:, 1]))
+    assert np.isclose(metrics["realized_30d"][1], np.std(log_returns[-30:], ddof=1) * np.sqrt(365))
+    simple = np.diff(prices[:, 2]) / prices[:-1, 2]
+    assert np.isclose(metrics["daily"][2], np.std(simple))
+    drawdown = np.min(prices[:, 0] / np.maximum.accumulate(prices[:, 0]) - 1)
+    assert np.isclose(metrics["max_drawdown"][0], drawdown)
+    assert np.all(metrics["ewma"] > 0)
+
+
+# Test the engine ranks assets without network access and skips failed fetches
+def test_engine_ranking():
+    histories = {
+        "calm": _history([100.0, 100.5, 100.2, 100.4, 100.3, 100.6, 100.5, 100.7]),
+        "wild": _history([100.0, 130.0, 90.0, 140.0, 80.0, 120.0, 70.0, 110.0]),
+    }
+
+    def fetch_history(coin_id, days):
+        if coin_id not in histories:
+            raise ValueError("unknown coin")
+        return histories[coin_id]
+
+    rows = VolatilityEngine(fetch_history).ranking(["calm", "wild", "missing"], windows=(7,))
+    assert [row["asset"] for row in rows] == ["wild", "calm"]
+    assert rows[0]["max_drawdown"] < rows[1]["max_drawdown"]
@@ -0,0 +1,161 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+MS_PER_DAY = 86400 * 1000
+PERIODS_PER_YEAR = 365  # Crypto trades every day
+DEFAULT_WINDOWS = (7, 30)
+DEFAULT_EWMA_LAMBDA = 0.94  # RiskMetrics decay for daily data
+DEFAULT_HISTORY_DAYS = 90
+MAX_FETCH_WORKERS = 4  # Keep concurrent CoinGecko requests low to stay under the free-tier rate limit
+
+
+def fetch_market_chart(coin_id, days=DEFAULT_HISTORY_DAYS):
+    """Fetch daily [timestamp_ms, price] pairs for a coin from CoinGecko."""
+    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+    params = {"vs_currency": "usd", "days": days, "interval": "daily"}
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()["prices"]
+
+
+def align_histories(histories):
+    """
+    Align price histories of several assets on a shared daily grid.
+
+    Args:
+        histories (dict): Asset id -> sequence of [timestamp_ms, price] pairs.
+
+    Returns:
+        tuple: (asset ids, day numbers since the epoch, prices array of shape (days, assets)).
+            Days before an asset's first price are NaN; later gaps are forward-filled.
+    """
+    assets = list(histories)
+    series = []
+    for asset in assets:
+        points = np.asarray(histories[asset], dtype=float).reshape(-1, 2)
+        series.append((points[:, 0] // MS_PER_DAY).astype(np.int64))
+    days = np.unique(np.concatenate(series)) if series else np.empty(0, dtype=np.int64)
+
+    prices = np.full((len(days), len(assets)), np.nan)
+    for column, asset in enumerate(assets):
+        points = np.asarray(histories[asset], dtype=float).reshape(-1, 2)
+        # Several points on the same day (e.g. the live price) keep the last one
+        prices[np.searchsorted(days, series[column]), column] = points[:, 1]
+
+    return assets, days, forward_fill(prices)
+
+
+def forward_fill(prices):
+    """Forward-fill NaN gaps down each column of a 2-D array (leading NaNs stay NaN)."""
+    mask = np.isnan(prices)
+    if not mask.any():
+        return prices
+    rows = np.where(~mask, np.arange(prices.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = prices[rows, np.arange(prices.shape[1])]
+    # Columns whose first observation comes later still have NaN before it
+    filled[np.cumsum(~mask, axis=0) == 0] = np.nan
+    return filled
+
+
+def compute_volatility(prices, windows=DEFAULT_WINDOWS, periods_per_year=PERIODS_PER_YEAR, ewma_lambda=DEFAULT_EWMA_LAMBDA):
+    """
+    Compute volatility metrics for every column of a price array in one vectorized pass.
+
+    Args:
+        prices (np.ndarray): Prices of shape (periods, assets), oldest first. NaN marks missing data.
+        windows (tuple): Lookbacks (in periods) for realized volatility.
+        periods_per_year (int): Used to annualize volatilities.
+        ewma_lambda (float): Decay factor of the EWMA volatility.
+
+    Returns:
+        dict: Metric name -> array of shape (assets,):
+            - "realized_{w}d": annualized standard deviation of log returns over the last w periods
+            - "ewma": annualized EWMA volatility over the whole history
+            - "daily": standard deviation of daily simple returns (unannualized, as calculate_volatility)
+            - "max_drawdown": largest peak-to-trough decline, as a negative fraction
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    annualize = np.sqrt(periods_per_year)
+    metrics = {}
+
+    # Assets with too little history yield NaN rather than warnings
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        log_returns = np.diff(np.log(prices), axis=0)
+        simple_returns = np.diff(prices, axis=0) / prices[:-1]
+        valid = ~np.isnan(log_returns)
+
+        for window in windows:
+            recent = log_returns[-window:]
+            counts = (~np.isnan(recent)).sum(axis=0)
+            std = np.nanstd(recent, axis=0, ddof=1) if len(recent) > 1 else np.full(prices.shape[1], np.nan)
+            metrics[f"realized_{window}d"] = np.where(counts > 1, std * annualize, np.nan)
+
+        # EWMA variance: weights (1 - lambda) * lambda^age, renormalized over the available returns
+        ages = np.arange(len(log_returns) - 1, -1, -1)[:, None]
+        weights = np.where(valid, (1 - ewma_lambda) * ewma_lambda ** ages, 0.0)
+        weighted = np.nansum(weights * np.nan_to_num(log_returns) ** 2, axis=0)
+        metrics["ewma"] = np.where(weights.sum(axis=0) > 0, np.sqrt(weighted / weights.sum(axis=0)) * annualize, np.nan)
+
+        metrics["daily"] = np.where(valid.sum(axis=0) > 0, np.nanstd(simple_returns, axis=0), np.nan)
+
+        running_max = np.fmax.accumulate(prices, axis=0)
+        metrics["max_drawdown"] = np.nanmin(prices / running_max - 1, axis=0)
+
+    return metrics
+
+
+class VolatilityEngine:
+    """
+    Volatility for many assets at once.
+
+    Price histories are fetched concurrently, aligned into one (days, assets) array and all
+    metrics are computed in a single vectorized pass (see compute_volatility).
+    """
+
+    def __init__(self, fetch_history=fetch_market_chart, max_workers=MAX_FETCH_WORKERS):
+        self.fetch_history = fetch_history
+        self.max_workers = max_workers
+
+    def fetch_histories(self, coin_ids, days=DEFAULT_HISTORY_DAYS):
+        """Fetch price histories; assets that fail to load are skipped."""
+        def fetch(coin_id):
+            try:
+                return coin_id, self.fetch_history(coin_id, days)
+            except Exception as e:
+                print(f"Error fetching price history for {coin_id}: {e}")
+                return coin_id, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(fetch, dict.fromkeys(coin_ids))
+        return {coin_id: history for coin_id, history in results if history is not None and len(history)}
+
+    def volatility(self, coin_ids, days=DEFAULT_HISTORY_DAYS, windows=DEFAULT_WINDOWS):
+        """
+        Compute volatility metrics for several assets.
+
+        Returns:
+            dict: Coin id -> {metric name: value}; metrics that cannot be computed are None.
+        """
+        histories = self.fetch_histories(coin_ids, days)
+        if not histories:
+            return {}
+        assets, _, prices = align_histories(histories)
+        metrics = compute_volatility(prices, windows=windows)
+        return {
+            asset: {name: (None if np.isnan(values[column]) else float(values[column])) for name, values in metrics.items()}
+            for column, asset in enumerate(assets)
+        }
+
+    def ranking(self, coin_ids, days=DEFAULT_HISTORY_DAYS, windows=DEFAULT_WINDOWS, sort_by=None):
+        """Return one row per asset, most volatile first (by the longest realized window by default)."""
+        sort_by = sort_by or f"realized_{max(windows)}d"
+        rows = [{"asset": asset, **metrics} for asset, metrics in self.volatility(coin_ids, days, windows).items()]
+        rows.sort(key=lambda row: -1 if row[sort_by] is None else row[sort_by], reverse=True)
+        return rows